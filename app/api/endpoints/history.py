@@ -1,24 +1,34 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, undefer, joinedload
 from typing import List, Optional
 from app.db.database import get_db
+from app.db.counters import get_row_count
 from app.db.models import SummaryHistory
 from app.services.history_service import HistoryService
+from app.services.retention_service import RetentionService
+from app.services.usage_stats_service import UsageStatsService, GROUP_COLUMNS
+from app.services.history_export_service import HistoryExportService, EXPORT_FORMATS
+from app.utils.pagination import keyset_page
 import json
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 
 router = APIRouter()
 
 @router.get("/")
 async def get_history(
+    response: Response,
     limit: int = Query(20, ge=1, le=100),
-    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = None,
     type: Optional[str] = None,
     date: Optional[str] = None,
+    include_total: bool = False,
     db: Session = Depends(get_db)
 ):
     """
     Returns a list of summary history items with optional filtering by type and date.
+    The next page cursor is returned in the X-Next-Cursor header and, when requested,
+    the approximate total (unfiltered only) in X-Total-Count.
     """
     query = db.query(SummaryHistory)
     
@@ -52,12 +62,20 @@ async def get_history(
             # 날짜 형식이 잘못된 경우
             raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD.")
     
-    # 최신순으로 정렬
-    query = query.order_by(SummaryHistory.created_at.desc())
-    
-    # 페이지네이션 적용
-    total_count = query.count()
-    history_items = query.offset(offset).limit(limit).all()
+    # 최신순 커서 페이지네이션
+    try:
+        history_items, next_cursor = keyset_page(
+            query, SummaryHistory.created_at, SummaryHistory.id, limit, cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    if include_total and not date and (not type or type == "all"):
+        total_count = get_row_count(db, "summary_history")
+        if total_count is not None:
+            response.headers["X-Total-Count"] = str(total_count)
     
     # 결과 반환
     return [item.to_dict() for item in history_items]
@@ -65,12 +83,15 @@ async def get_history(
 @router.get("/list")
 async def get_history_list(
     limit: int = Query(20, ge=1, le=100),
-    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = None,
     summary_type: Optional[str] = None,
+    include_total: bool = True,
     db: Session = Depends(get_db)
 ):
     """
     Returns a list of summary history items.
+    Pass `next_cursor` from the previous response as `cursor` to get the next page.
+    `total` is an approximate count kept by the database, or null if not requested.
     """
     query = db.query(SummaryHistory)
     
@@ -78,16 +99,20 @@ async def get_history_list(
     if summary_type:
         query = query.filter(SummaryHistory.summary_type == summary_type)
     
-    # Sort by newest first
-    query = query.order_by(SummaryHistory.created_at.desc())
-    
-    # Apply pagination
-    total_count = query.count()
-    history_items = query.offset(offset).limit(limit).all()
+    # Newest first, keyset pagination
+    try:
+        history_items, next_cursor = keyset_page(
+            query, SummaryHistory.created_at, SummaryHistory.id, limit, cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    total_count = get_row_count(db, "summary_history", summary_type) if include_total else None
     
     return {
         "total": total_count,
-        "items": [item.to_dict() for item in history_items]
+        "items": [item.to_dict() for item in history_items],
+        "next_cursor": next_cursor
     }
 
 @router.get("/search")
@@ -108,6 +133,65 @@ async def search_history(
         "items": results
     }
 
+@router.get("/export")
+async def export_history(
+    format: str = Query("ndjson"),
+    summary_type: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    model: Optional[str] = None,
+    include_original: bool = False,
+    gzip: bool = False
+):
+    """
+    Streams summary history as NDJSON or CSV, optionally gzip-compressed.
+    Rows are read in batches, so memory use does not grow with the export size.
+    """
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported format. Use one of: {', '.join(EXPORT_FORMATS)}")
+
+    chunks = HistoryExportService().export(
+        format=format,
+        gzip=gzip,
+        summary_type=summary_type,
+        start_date=start_date,
+        end_date=end_date,
+        model=model,
+        include_original=include_original
+    )
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    file_name = f"summary_history_{datetime.utcnow().strftime('%Y%m%d%H%M%S')}.{format}"
+    if gzip:
+        media_type = "application/gzip"
+        file_name += ".gz"
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{file_name}"'}
+    )
+
+@router.get("/stats")
+async def get_history_stats(
+    user_id: Optional[int] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    summary_type: Optional[str] = None,
+    model: Optional[str] = None,
+    group_by: List[str] = Query([]),
+    db: Session = Depends(get_db)
+):
+    """
+    Returns summary counts and token totals from the pre-aggregated usage table,
+    optionally grouped by day, summary_type, model and/or user.
+    """
+    invalid = [name for name in group_by if name not in GROUP_COLUMNS]
+    if invalid:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid group_by: {', '.join(invalid)}. Use any of: {', '.join(GROUP_COLUMNS)}"
+        )
+    return UsageStatsService(db).get_stats(user_id, start_date, end_date, summary_type, model, group_by)
+
 @router.post("/check-duplicate")
 async def check_duplicate_summary(
     text: Optional[str] = None,
@@ -140,16 +224,61 @@ async def check_duplicate_summary(
             "item": None
         }
 
+@router.get("/archive/months")
+def list_history_archives():
+    """
+    Lists the monthly archive files of history items removed by the retention policy.
+    """
+    return RetentionService().list_archives()
+
+@router.get("/archive")
+def read_history_archive(
+    month: Optional[str] = None,
+    summary_type: Optional[str] = None,
+    history_id: Optional[int] = None,
+    query: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100)
+):
+    """
+    Reads archived history items (removed from the main table by the retention policy).
+    Pass `month` (YYYY-MM) to read only one archive file.
+    Archive files are decompressed in FastAPI's thread pool, not on the event loop.
+    """
+    try:
+        items = RetentionService().read_archive(month, summary_type, history_id, query, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {
+        "total": len(items),
+        "items": items
+    }
+
+@router.delete("/clear")
+def clear_history(
+    summary_type: Optional[str] = None
+):
+    """
+    Clears all history or history of a specific type.
+    Rows are deleted in small batches so other requests are not blocked.
+    This is a plain function so FastAPI runs the batched deletes in its thread pool, off the event loop.
+    """
+    count = RetentionService().clear(summary_type)
+    
+    return {"message": f"{count} history items have been deleted."}
+
 @router.get("/{history_id}")
 async def get_history_detail(history_id: int, db: Session = Depends(get_db)):
     """
-    Returns detailed information for a specific history item.
+    Returns detailed information for a specific history item, including the full original text.
     """
-    history_item = db.query(SummaryHistory).filter(SummaryHistory.id == history_id).first()
+    history_item = db.query(SummaryHistory).options(
+        undefer(SummaryHistory.inline_original_text),
+        joinedload(SummaryHistory.original_blob)
+    ).filter(SummaryHistory.id == history_id).first()
     if not history_item:
         raise HTTPException(status_code=404, detail="History item not found.")
     
-    return history_item.to_dict()
+    return history_item.to_dict(full_text=True)
 
 @router.delete("/{history_id}")
 async def delete_history_item(history_id: int, db: Session = Depends(get_db)):
@@ -164,22 +293,3 @@ async def delete_history_item(history_id: int, db: Session = Depends(get_db)):
     db.commit()
     
     return {"message": "History item has been deleted."}
-
-@router.delete("/clear")
-async def clear_history(
-    summary_type: Optional[str] = None, 
-    db: Session = Depends(get_db)
-):
-    """
-    Clears all history or history of a specific type.
-    """
-    query = db.query(SummaryHistory)
-    
-    if summary_type:
-        query = query.filter(SummaryHistory.summary_type == summary_type)
-    
-    count = query.count()
-    query.delete()
-    db.commit()
-    
-    return {"message": f"{count} history items have been deleted."} 
\ No newline at end of file
@@ -4,8 +4,10 @@ from sqlalchemy import and_, or_
 from typing import List, Optional
 from datetime import datetime, timedelta
 from app.db.session import get_db
+from app.db.counters import get_row_count
 from app.models.models import Video, Channel, Tag, SearchHistory, User
 from app.utils.auth import oauth2_scheme
+from app.utils.pagination import keyset_page
 
 router = APIRouter()
 
@@ -21,8 +23,9 @@ async def search_videos(
     tags: Optional[List[str]] = None,
     sort_by: str = "published_at",
     sort_order: str = "desc",
-    page: int = 1,
-    page_size: int = 20,
+    cursor: Optional[str] = None,
+    page_size: int = Query(20, ge=1, le=100),
+    include_total: bool = False,
     db: Session = Depends(get_db),
     current_user: User = Depends(oauth2_scheme)
 ):
@@ -56,19 +59,18 @@ async def search_videos(
     if tags:
         video_query = video_query.join(Video.tags).filter(Tag.name.in_(tags))
     
-    # 정렬
-    if sort_by == "published_at":
-        video_query = video_query.order_by(
-            Video.published_at.desc() if sort_order == "desc" else Video.published_at.asc()
+    # 정렬 + 커서 페이지네이션 ((정렬 컬럼, id) 기준)
+    sort_column = Video.title if sort_by == "title" else Video.published_at
+    try:
+        videos, next_cursor = keyset_page(
+            video_query, sort_column, Video.id, page_size, cursor, descending=(sort_order == "desc")
         )
-    elif sort_by == "title":
-        video_query = video_query.order_by(
-            Video.title.desc() if sort_order == "desc" else Video.title.asc()
-        )
-    
-    # 페이지네이션
-    total = video_query.count()
-    videos = video_query.offset((page - 1) * page_size).limit(page_size).all()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # 전체 개수는 필터가 없을 때만 카운터에서 가져옴 (근사값)
+    filtered = any([query, category, channel_id, start_date, end_date, tags])
+    total = get_row_count(db, "videos") if include_total and not filtered else None
     
     # 검색 히스토리 저장
     search_history = SearchHistory(
@@ -87,8 +89,8 @@ async def search_videos(
     
     return {
         "total": total,
-        "page": page,
         "page_size": page_size,
+        "next_cursor": next_cursor,
         "results": videos
     }
 
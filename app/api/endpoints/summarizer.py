@@ -1,10 +1,15 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form, BackgroundTasks, Depends
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, BackgroundTasks, Depends, Request
 from pydantic import BaseModel
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from app.services.summarizer_service import SummarizerService
 from app.services.youtube_service import YouTubeService
 from app.services.document_service import DocumentService
 from app.services.history_service import HistoryService
+from app.services.history_writer import history_writer
+from app.services.subscription_service import SubscriptionService
+from app.services.summary_work_scheduler import summary_work_scheduler, PRIORITY_INTERACTIVE, PRIORITY_BATCH
+from app.utils.auth import get_optional_user
+from app.models.models import User
 from app.db.database import get_db
 from sqlalchemy.orm import Session
 from app.core.config import settings
@@ -61,8 +66,27 @@ class BatchSummarizeResponse(BaseModel):
     document_summaries: List[DocumentSummarizeResponse] = []
     overall_summary: Optional[str] = None
 
+def _work_owner(user: Optional[User], http_request: Request) -> Tuple[str, int]:
+    """요약 작업 스케줄러에서 공정하게 나눌 사용자 키와 구독 등급 가중치"""
+    if user is not None:
+        return f"user:{user.id}", SubscriptionService.get_scheduling_weight(user)
+    host = http_request.client.host if http_request.client else "unknown"
+    return f"anonymous:{host}", SubscriptionService.get_scheduling_weight(None)
+
+def _user_id(user: Optional[User]) -> Optional[int]:
+    return user.id if user is not None else None
+
 @router.post("/summarize", response_model=SummarizeResponse)
-async def summarize_text(request: SummarizeRequest, db: Session = Depends(get_db)):
+async def summarize_text(
+    request: SummarizeRequest,
+    http_request: Request,
+    db: Session = Depends(get_db),
+    current_user: Optional[User] = Depends(get_optional_user)
+):
+    # 사용 한도 확인 (미리 집계된 사용량으로 확인)
+    if current_user is not None:
+        SubscriptionService.check_summary_limit(current_user, db)
+    
     try:
         # 모델 확인 및 유효성 검사
         model = request.model or settings.DEFAULT_MODEL
@@ -70,7 +94,10 @@ async def summarize_text(request: SummarizeRequest, db: Session = Depends(get_db
             logger.warning(f"Requested model {model} is not valid. Using default model instead.")
             model = settings.DEFAULT_MODEL
             
-        summarization_result = summarizer_service.summarize_text(
+        owner, weight = _work_owner(current_user, http_request)
+        summarization_result = await summary_work_scheduler.run(
+            PRIORITY_INTERACTIVE, owner, summarizer_service.summarize_text,
+            weight=weight,
             text=request.text,
             style=request.style,
             max_length=request.max_length,
@@ -83,23 +110,34 @@ async def summarize_text(request: SummarizeRequest, db: Session = Depends(get_db
             raise HTTPException(status_code=500, detail=summarization_result["error"])
         
         # 키 문구 추출 (옵션)
-        key_phrases = summarizer_service.extract_key_phrases(request.text, model=model)
+        key_phrases = await summary_work_scheduler.run(
+            PRIORITY_INTERACTIVE, owner, summarizer_service.extract_key_phrases,
+            request.text, weight=weight, model=model
+        )
         summarization_result["key_phrases"] = key_phrases
         
         # 품질 평가 (옵션)
-        quality_score = summarizer_service.evaluate_summary_quality(
-            request.text, summarization_result["summary"], model=model
+        quality_score = await summary_work_scheduler.run(
+            PRIORITY_INTERACTIVE, owner, summarizer_service.evaluate_summary_quality,
+            request.text, summarization_result["summary"], weight=weight, model=model
         )
         summarization_result["quality_score"] = quality_score
         
-        # 히스토리에 저장
-        history_service = HistoryService(db)
-        history_service.save_text_summary(
+        # 히스토리에 저장 (백그라운드에서 모아서 커밋)
+        await history_writer.save_text_summary(
             original_text=request.text,
             summary_text=summarization_result["summary"],
             key_phrases=key_phrases,
             model_used=model,
-            quality_score=quality_score.get("overall") if quality_score else None
+            quality_score=quality_score.get("overall") if quality_score else None,
+            user_id=_user_id(current_user),
+            tokens_used=(summarization_result.get("metadata") or {}).get("tokens_used"),
+            params={
+                "style": request.style,
+                "max_length": request.max_length,
+                "language": request.language,
+                "format": request.format
+            }
         )
         
         return summarization_result
@@ -108,7 +146,16 @@ async def summarize_text(request: SummarizeRequest, db: Session = Depends(get_db
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/summarize/youtube", response_model=Dict[str, Any])
-async def summarize_youtube(request: YouTubeSummarizeRequest, db: Session = Depends(get_db)):
+async def summarize_youtube(
+    request: YouTubeSummarizeRequest,
+    http_request: Request,
+    db: Session = Depends(get_db),
+    current_user: Optional[User] = Depends(get_optional_user)
+):
+    # 사용 한도 확인 (미리 집계된 사용량으로 확인)
+    if current_user is not None:
+        SubscriptionService.check_summary_limit(current_user, db)
+    
     try:
         # 모델 확인 및 유효성 검사
         model = request.model or settings.DEFAULT_MODEL
@@ -116,7 +163,17 @@ async def summarize_youtube(request: YouTubeSummarizeRequest, db: Session = Depe
             logger.warning(f"Requested model {model} is not valid. Using default model instead.")
             model = settings.DEFAULT_MODEL
             
-        video_result = youtube_service.summarize_video(
+        # 미리 생성했거나 이전에 만든 같은 조건의 요약이 있으면 바로 반환
+        history_service = HistoryService(db)
+        video_id = youtube_service.extract_video_id(request.url)
+        cached = history_service.find_cached_youtube_summary(video_id, request.language, model)
+        if cached:
+            return HistoryService.youtube_result_from_history(cached)
+            
+        owner, weight = _work_owner(current_user, http_request)
+        video_result = await summary_work_scheduler.run(
+            PRIORITY_INTERACTIVE, owner, youtube_service.summarize_video,
+            weight=weight,
             video_url=request.url,
             language_code=request.language,
             model=model
@@ -125,16 +182,19 @@ async def summarize_youtube(request: YouTubeSummarizeRequest, db: Session = Depe
         if "error" in video_result:
             raise HTTPException(status_code=500, detail=video_result["error"])
         
-        # 히스토리에 저장
+        # 히스토리에 저장 (백그라운드에서 모아서 커밋)
         if "summary" in video_result:
-            history_service = HistoryService(db)
-            history_service.save_youtube_summary(
+            await history_writer.save_youtube_summary(
                 video_url=request.url,
                 video_title=video_result.get("title", "No Title"),
                 channel_name=video_result.get("channel", "No Channel Info"),
                 original_transcript=video_result.get("transcript", ""),
                 summary_text=video_result["summary"],
-                model_used=model
+                key_phrases=video_result.get("keywords"),
+                model_used=model,
+                extra_info=HistoryService.youtube_source_info(video_result, request.language),
+                user_id=_user_id(current_user),
+                tokens_used=video_result.get("tokens_used")
             )
             
         return video_result
@@ -142,16 +202,31 @@ async def summarize_youtube(request: YouTubeSummarizeRequest, db: Session = Depe
         logger.error(f"Error in YouTube summarization: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/summarize/queue-stats")
+async def read_summary_queue_stats():
+    """
+    요약 작업 스케줄러의 우선순위 클래스별 대기 작업 수와 대기 시간을 반환합니다.
+    """
+    stats = summary_work_scheduler.get_stats()
+    stats["history_writer"] = history_writer.get_stats()
+    return stats
+
 @router.post("/summarize/document")
 async def summarize_document(
+    http_request: Request,
     file: UploadFile = File(...),
     style: str = Form("simple"),
     max_length: int = Form(200),
     language: str = Form("en"),
     format: str = Form("text"),
     model: Optional[str] = Form(None),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    current_user: Optional[User] = Depends(get_optional_user)
 ):
+    # 사용 한도 확인 (미리 집계된 사용량으로 확인)
+    if current_user is not None:
+        SubscriptionService.check_summary_limit(current_user, db)
+    
     try:
         # 모델 확인 및 유효성 검사
         use_model = model or settings.DEFAULT_MODEL
@@ -175,7 +250,10 @@ async def summarize_document(
                 raise HTTPException(status_code=400, detail=f"Could not extract text from file: {file.filename}")
             
             # 요약 수행
-            summary_result = summarizer_service.summarize_text(
+            owner, weight = _work_owner(current_user, http_request)
+            summary_result = await summary_work_scheduler.run(
+                PRIORITY_INTERACTIVE, owner, summarizer_service.summarize_text,
+                weight=weight,
                 text=text,
                 style=style,
                 max_length=max_length,
@@ -197,14 +275,16 @@ async def summarize_document(
                 "summary": summary_result["summary"]
             }
             
-            # 히스토리에 저장
-            history_service = HistoryService(db)
-            history_service.save_document_summary(
+            # 히스토리에 저장 (백그라운드에서 모아서 커밋)
+            await history_writer.save_document_summary(
                 file_name=file.filename,
                 file_type=file_extension,
                 original_text=text,
                 summary_text=summary_result["summary"],
-                model_used=use_model
+                model_used=use_model,
+                user_id=_user_id(current_user),
+                tokens_used=(summary_result.get("metadata") or {}).get("tokens_used"),
+                params={"style": style, "max_length": max_length, "language": language, "format": format}
             )
             
             return result
@@ -217,10 +297,20 @@ async def summarize_document(
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/batch-summarize", response_model=BatchSummarizeResponse)
-async def batch_summarize(request: BatchSummarizeRequest, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
+async def batch_summarize(
+    request: BatchSummarizeRequest,
+    background_tasks: BackgroundTasks,
+    http_request: Request,
+    db: Session = Depends(get_db),
+    current_user: Optional[User] = Depends(get_optional_user)
+):
     """
     여러 텍스트, 유튜브 링크, 문서 파일을 일괄 요약하는 API
     """
+    # 사용 한도 확인 (미리 집계된 사용량으로 확인)
+    if current_user is not None:
+        SubscriptionService.check_summary_limit(current_user, db)
+    
     try:
         # 모델 확인 및 유효성 검사
         model = request.model or settings.DEFAULT_MODEL
@@ -234,8 +324,8 @@ async def batch_summarize(request: BatchSummarizeRequest, background_tasks: Back
             document_summaries=[]
         )
         
-        # 히스토리 서비스 초기화
-        history_service = HistoryService(db)
+        # 일괄 요청은 대화형 요청보다 낮은 우선순위로 처리
+        owner, weight = _work_owner(current_user, http_request)
         
         # 텍스트 요약 처리
         for text_req in request.texts:
@@ -246,7 +336,9 @@ async def batch_summarize(request: BatchSummarizeRequest, background_tasks: Back
                     logger.warning(f"요청된 모델 {text_model}이 유효하지 않습니다. 기본 모델로 대체합니다.")
                     text_model = model
                     
-                result = summarizer_service.summarize_text(
+                result = await summary_work_scheduler.run(
+                    PRIORITY_BATCH, owner, summarizer_service.summarize_text,
+                    weight=weight,
                     text=text_req.text,
                     style=text_req.style or request.style,
                     max_length=text_req.max_length or request.max_length,
@@ -256,15 +348,26 @@ async def batch_summarize(request: BatchSummarizeRequest, background_tasks: Back
                 )
                 
                 # 키 문구 추출 (옵션)
-                key_phrases = summarizer_service.extract_key_phrases(text_req.text, model=text_model)
+                key_phrases = await summary_work_scheduler.run(
+                    PRIORITY_BATCH, owner, summarizer_service.extract_key_phrases,
+                    text_req.text, weight=weight, model=text_model
+                )
                 result["key_phrases"] = key_phrases
                 
                 # 히스토리에 저장
-                history_service.save_text_summary(
+                await history_writer.save_text_summary(
                     original_text=text_req.text,
                     summary_text=result["summary"],
                     key_phrases=key_phrases,
-                    model_used=text_model
+                    model_used=text_model,
+                    user_id=_user_id(current_user),
+                    tokens_used=(result.get("metadata") or {}).get("tokens_used"),
+                    params={
+                        "style": text_req.style or request.style,
+                        "max_length": text_req.max_length or request.max_length,
+                        "language": text_req.language or request.language,
+                        "format": text_req.format or request.format
+                    }
                 )
                 
                 response.text_summaries.append(result)
@@ -275,7 +378,9 @@ async def batch_summarize(request: BatchSummarizeRequest, background_tasks: Back
         # 유튜브 링크 요약 처리
         for url in request.youtube_urls:
             try:
-                video_result = youtube_service.summarize_video(
+                video_result = await summary_work_scheduler.run(
+                    PRIORITY_BATCH, owner, youtube_service.summarize_video,
+                    weight=weight,
                     video_url=url,
                     language_code=request.language,
                     model=model
@@ -283,13 +388,17 @@ async def batch_summarize(request: BatchSummarizeRequest, background_tasks: Back
                 
                 # 히스토리에 저장
                 if "summary" in video_result:
-                    history_service.save_youtube_summary(
+                    await history_writer.save_youtube_summary(
                         video_url=url,
                         video_title=video_result.get("title", "No Title"),
                         channel_name=video_result.get("channel", "No Channel Info"),
                         original_transcript=video_result.get("transcript", ""),
                         summary_text=video_result["summary"],
-                        model_used=model
+                        key_phrases=video_result.get("keywords"),
+                        model_used=model,
+                        extra_info=HistoryService.youtube_source_info(video_result, request.language),
+                        user_id=_user_id(current_user),
+                        tokens_used=video_result.get("tokens_used")
                     )
                 
                 response.youtube_summaries.append(video_result)
@@ -0,0 +1,70 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.orm import Session
+from typing import Dict, List, Optional
+from app.db.database import get_db
+from app.services.websub_service import WebSubService
+from app.services.job_queue import job_queue, PRIORITY_HIGH
+from app.services.worker_service import JOB_INGEST_VIDEOS
+import logging
+
+router = APIRouter()
+websub_service = WebSubService()
+logger = logging.getLogger(__name__)
+
+
+@router.get("/callback", response_class=PlainTextResponse)
+def verify_subscription(
+    mode: str = Query(..., alias="hub.mode"),
+    topic: str = Query(..., alias="hub.topic"),
+    challenge: str = Query("", alias="hub.challenge"),
+    lease_seconds: Optional[int] = Query(None, alias="hub.lease_seconds"),
+    db: Session = Depends(get_db)
+):
+    """
+    허브의 구독 확인(intent verification) 요청에 응답합니다.
+    """
+    result = websub_service.verify_intent(mode, topic, challenge, lease_seconds, db)
+    if result is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Unknown subscription")
+    return result
+
+
+@router.post("/callback", status_code=status.HTTP_204_NO_CONTENT)
+async def receive_notification(
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """
+    새 업로드 Atom 알림을 받아 서명을 확인하고 새 비디오 처리 작업을 작업 큐에 등록합니다.
+    서명이 잘못된 알림도 허브 재전송을 막기 위해 2xx로 응답하고 무시합니다.
+    """
+    body = await request.body()
+    signature = request.headers.get("X-Hub-Signature")
+
+    videos_by_channel: Dict[str, List[str]] = {}
+    for channel_id, video_id in websub_service.parse_notification(body):
+        if not websub_service.verify_signature(body, signature, websub_service.topic_for(channel_id)):
+            logger.warning(f"WebSub 알림 서명이 올바르지 않습니다: {channel_id}")
+            return Response(status_code=status.HTTP_204_NO_CONTENT)
+        videos_by_channel.setdefault(channel_id, []).append(video_id)
+
+    # 본문은 비동기로 읽고, DB 작업은 이벤트 루프를 막지 않도록 스레드 풀에서 실행
+    await run_in_threadpool(_enqueue_notifications, videos_by_channel, db)
+
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+def _enqueue_notifications(videos_by_channel: Dict[str, List[str]], db: Session) -> None:
+    """채널별 새 비디오 처리 작업을 등록하고 알림 시간을 기록합니다."""
+    for channel_id, video_ids in videos_by_channel.items():
+        logger.info(f"WebSub 알림 수신: 채널={channel_id}, 비디오={video_ids}")
+        job_queue.enqueue(
+            db,
+            JOB_INGEST_VIDEOS,
+            {"channel_id": channel_id, "video_ids": video_ids},
+            priority=PRIORITY_HIGH
+        )
+        websub_service.mark_notified(channel_id, db)
+    db.commit()
@@ -1,5 +1,5 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Response
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Response
 from sqlalchemy.orm import Session
 import logging
 
@@ -15,6 +15,8 @@ from app.models.youtube import (
     YoutubeKeywordUpdate
 )
 from app.services.youtube_service import YouTubeService
+from app.services.etag_cache import etag_cache
+from app.services.job_queue import job_queue
 from app.db import crud
 
 router = APIRouter()
@@ -296,9 +298,13 @@ def delete_keyword(keyword_id: int, db: Session = Depends(get_db)):
 
 # 검색 관련 엔드포인트
 @router.get("/search/by-channel/{channel_id}", response_model=List[dict])
-def search_videos_by_channel(channel_id: str, db: Session = Depends(get_db)):
+def search_videos_by_channel(
+    channel_id: str,
+    max_results: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db)
+):
     try:
-        logger.info(f"채널 비디오 검색 요청: channel_id={channel_id}")
+        logger.info(f"채널 비디오 검색 요청: channel_id={channel_id}, max_results={max_results}")
         
         # YouTube API 서비스 생성
         youtube_service = YouTubeService()
@@ -327,7 +333,7 @@ def search_videos_by_channel(channel_id: str, db: Session = Depends(get_db)):
             logger.info(f"DB에 등록되지 않은 채널이지만 직접 YouTube API로 검색 시도: {channel_id}")
             
             # YouTube API 호출하여 비디오 가져오기
-            videos = youtube_service.get_channel_videos(channel_id)
+            videos = youtube_service.get_channel_videos(channel_id, max_results=max_results)
             if not videos:
                 logger.warning(f"채널 비디오를 찾을 수 없음: {channel_id}")
                 raise HTTPException(
@@ -343,7 +349,7 @@ def search_videos_by_channel(channel_id: str, db: Session = Depends(get_db)):
         
         # YouTube API 호출
         logger.info(f"YouTube API 채널 비디오 검색 시작: 채널 ID={db_channel.channel_id}")
-        videos = youtube_service.get_channel_videos(db_channel.channel_id)
+        videos = youtube_service.get_channel_videos(db_channel.channel_id, max_results=max_results)
         logger.info(f"YouTube API 채널 비디오 검색 결과: {len(videos)}개 비디오 발견")
         
         return videos
@@ -388,4 +394,34 @@ def search_videos_by_keyword(keyword: str, db: Session = Depends(get_db)):
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"서버 오류: {str(e)}"
-        ) 
\ No newline at end of file
+        ) 
+# 채널 확인 통계 엔드포인트
+@router.get("/polling/etag-stats")
+def read_etag_stats(channel_id: Optional[str] = None):
+    """
+    채널별 ETag 조건부 요청의 적중(304)/미적중 통계를 반환합니다.
+    """
+    return etag_cache.get_stats(channel_id)
+
+@router.get("/polling/coalescer-stats")
+def read_coalescer_stats():
+    """
+    채널 간 병합된 videos.list 요청 통계를 반환합니다.
+    """
+    return YouTubeService.get_details_coalescer_stats()
+
+@router.get("/polling/lag")
+def read_polling_lag(limit: int = Query(100, ge=1, le=1000), db: Session = Depends(get_db)):
+    """
+    채널별 확인 지연 지표를 반환합니다.
+    """
+    # 채널 확인 모듈은 필요할 때만 불러옴
+    from app.services.channel_poller import ChannelPoller
+    return ChannelPoller.collect_lag_metrics(db, limit=limit)
+
+@router.get("/jobs/stats")
+def read_job_stats():
+    """
+    작업 큐의 작업 유형·상태별 작업 수를 반환합니다.
+    """
+    return job_queue.get_stats()
@@ -48,12 +48,72 @@ class Settings(BaseSettings):
     ENTERPRISE_MONTHLY_PRICE: float = 29.99
     
     # 데이터베이스 설정
-    DB_PATH: str = "./data/app.db"
+    DB_PATH: str = "./data/app.db"  # SQLite 파일 경로 (상대 경로는 프로젝트 루트 기준)
+    DATABASE_URL: str = ""  # 비어 있으면 DB_PATH의 SQLite 사용. 현재 SQLite URL만 지원 (예: sqlite:////var/lib/summery/app.db)
+    DB_POOL_SIZE: int = 10  # 연결 풀 크기 (요청 스레드, 요약 작업자, 백그라운드 스레드가 함께 사용)
+    DB_MAX_OVERFLOW: int = 20  # 풀이 가득 찼을 때 추가로 만들 수 있는 연결 수
+    DB_POOL_TIMEOUT: int = 30  # 연결을 기다리는 최대 시간(초)
+    SQLITE_BUSY_TIMEOUT_MS: int = 15000  # 다른 연결이 쓰는 중일 때 잠금을 기다리는 시간
+    SQLITE_CACHE_SIZE_KB: int = 64 * 1024  # 연결당 페이지 캐시 크기
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024  # 메모리 매핑해 읽을 최대 크기
     
     # 모델 설정
     DEFAULT_MODEL: str = "gpt-4o-mini"
     AVAILABLE_MODELS: List[str] = ["gpt-4o-mini"]
     
+    # 자막 저장소 설정
+    TRANSCRIPT_MISSING_TTL_HOURS: int = 24 * 7  # '자막 없음' 결과를 다시 확인하기까지의 시간
+    
+    # 채널 확인 설정
+    CHANNEL_POLL_MAX_VIDEOS: int = 200  # 채널 확인 한 번에 가져올 최대 비디오 수
+    VIDEO_DETAILS_COALESCE_WINDOW_MS: int = 50  # videos.list 요청을 모으는 대기 시간
+    
+    # 스케줄러 설정
+    SCHEDULER_ENABLED: bool = False  # 앱 시작 시 채널 확인 스케줄러 실행 여부
+    CHANNEL_RECONCILE_INTERVAL_HOURS: int = 72  # WebSub 사용 시 전체 채널 재확인 주기
+    LEADER_LEASE_SECONDS: int = 15  # 리더가 이 시간 동안 갱신하지 않으면 다른 프로세스가 이어받음
+    LEADER_HEARTBEAT_SECONDS: int = 5  # 리더 임대 갱신 주기
+    POLLER_MAX_WORKERS: int = 8  # 동시에 확인할 최대 채널 수
+    POLLER_TICK_SECONDS: int = 30  # 확인 시간이 된 채널을 찾는 주기
+    POLLER_MIN_INTERVAL_MINUTES: int = 15  # 업로드가 잦은 채널의 최소 확인 주기
+    POLLER_MAX_INTERVAL_HOURS: int = 7 * 24  # 휴면 채널의 최대 확인 주기
+    POLLER_DEFAULT_INTERVAL_HOURS: int = 6  # 업로드 기록이 부족한 채널의 확인 주기
+    POLLER_JITTER_RATIO: float = 0.1  # 확인 시간에 더하는 무작위 편차 비율
+    
+    # 요약 작업 스케줄러 설정
+    SUMMARY_MAX_WORKERS: int = 8  # 동시에 실행할 최대 LLM 요약 작업 수
+    SUMMARY_RESERVED_INTERACTIVE_WORKERS: int = 2  # 대화형 요청 전용으로 남겨둘 작업자 수
+    
+    # 히스토리 저장 설정 (요청 안에서 커밋하지 않고 모아서 한 번에 커밋)
+    HISTORY_WRITE_BEHIND: bool = True
+    HISTORY_WRITE_BATCH_SIZE: int = 100  # 한 번에 커밋할 최대 건수
+    HISTORY_WRITE_INTERVAL_MS: int = 200  # 첫 건이 들어온 뒤 커밋까지 최대 대기 시간
+    HISTORY_WRITE_QUEUE_SIZE: int = 1000  # 대기열 최대 크기, 가득 차면 요청이 기다림
+    HISTORY_WRITE_BLOCK_SECONDS: float = 5.0  # 대기열이 가득 찼을 때 기다리는 시간, 지나면 바로 저장
+    
+    # 히스토리 보존 설정 - 보존 기간이 지난 히스토리는 월별 압축 파일로 옮긴 뒤 삭제
+    HISTORY_RETENTION_DAYS: Dict[str, int] = {}  # 요약 종류별 보존 기간(일), 예: {"text": 90, "youtube": 365}. 없는 종류는 계속 보존
+    HISTORY_ARCHIVE_DIR: str = "./data/archive"
+    HISTORY_RETENTION_BATCH_SIZE: int = 500  # 한 트랜잭션에서 옮기고 삭제할 행 수
+    HISTORY_RETENTION_INTERVAL_HOURS: int = 24  # 스케줄러의 보존 정책 실행 주기
+    
+    # 작업 큐 설정
+    JOB_LEASE_SECONDS: int = 300  # 작업 임대 시간, 지나면 다른 작업자가 다시 가져감
+    JOB_MAX_ATTEMPTS: int = 5  # 최대 시도 횟수, 넘으면 'dead' 상태로 남김
+    JOB_RETRY_BASE_SECONDS: int = 30  # 재시도 대기 시간의 기준 값 (시도마다 두 배)
+    JOB_RETRY_MAX_SECONDS: int = 3600
+    WORKER_CONCURRENCY: int = 2  # 작업자 프로세스당 동시 처리 작업 수
+    WORKER_POLL_SECONDS: float = 2.0  # 처리할 작업이 없을 때 다시 확인하는 주기
+    PREWARM_YOUTUBE_SUMMARIES: bool = True  # 새 비디오의 자막 요약을 미리 생성해 두기
+    PREWARM_SUMMARY_LANGUAGE: str = "en"  # 미리 생성할 요약 언어 (/summarize/youtube 기본값과 같게)
+    
+    # WebSub(PubSubHubbub) 설정 - 콜백 URL이 비어 있으면 사용하지 않음
+    WEBSUB_CALLBACK_URL: str = ""  # 예: https://example.com/api/v1/websub/callback
+    WEBSUB_HUB_URL: str = "https://pubsubhubbub.appspot.com/subscribe"
+    WEBSUB_SECRET: str = ""  # 알림 서명(HMAC) 검증용 비밀 값. 비어 있으면 구독하지 않고 알림도 모두 거부
+    WEBSUB_LEASE_SECONDS: int = 5 * 24 * 60 * 60
+    WEBSUB_RENEW_BEFORE_HOURS: int = 24  # 만료 몇 시간 전에 구독을 갱신할지
+    
     # 기본 요약 설정
     DEFAULT_MAX_LENGTH: int = 200
     DEFAULT_LANGUAGE: str = "ko"
@@ -83,6 +143,17 @@ class Settings(BaseSettings):
             return ""
         return keys[self._youtube_api_key_index % len(keys)]
     
+    @property
+    def SQLALCHEMY_DATABASE_URI(self) -> str:
+        """데이터베이스 URL. DATABASE_URL이 없으면 프로젝트 루트 기준 DB_PATH의 SQLite 파일을 사용합니다."""
+        if self.DATABASE_URL:
+            return self.DATABASE_URL
+        db_path = self.DB_PATH
+        if not os.path.isabs(db_path):
+            project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+            db_path = os.path.normpath(os.path.join(project_root, db_path))
+        return f"sqlite:///{db_path}"
+    
     def next_youtube_api_key(self) -> str:
         """다음 YouTube API 키로 전환하고 그 키를 반환"""
         keys = self.youtube_api_keys_list
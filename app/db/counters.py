@@ -0,0 +1,100 @@
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from typing import Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+ROW_COUNTS_TABLE = "row_counts"
+
+# 행 수를 관리할 테이블 -> 그룹별로도 셀 컬럼 (없으면 None)
+COUNTED_TABLES: Dict[str, Optional[str]] = {
+    "summary_history": "summary_type",
+    "videos": None,
+}
+
+
+def _group_name(table: str, expression: str) -> str:
+    return f"'{table}:' || COALESCE({expression}, '')"
+
+
+def _upsert(name_sql: str, delta: int) -> str:
+    return (
+        f"INSERT INTO {ROW_COUNTS_TABLE}(name, row_count) VALUES ({name_sql}, {delta}) "
+        f"ON CONFLICT(name) DO UPDATE SET row_count = row_count + ({delta});"
+    )
+
+
+def _trigger_statements(table: str, group_column: Optional[str]) -> List[str]:
+    on_insert = [_upsert(f"'{table}'", 1)]
+    on_delete = [_upsert(f"'{table}'", -1)]
+    statements = []
+    if group_column:
+        on_insert.append(_upsert(_group_name(table, f"new.{group_column}"), 1))
+        on_delete.append(_upsert(_group_name(table, f"old.{group_column}"), -1))
+        statements.append(
+            f"""CREATE TRIGGER IF NOT EXISTS {table}_count_au AFTER UPDATE OF {group_column} ON {table}
+                WHEN old.{group_column} IS NOT new.{group_column} BEGIN
+                {_upsert(_group_name(table, f"old.{group_column}"), -1)}
+                {_upsert(_group_name(table, f"new.{group_column}"), 1)}
+            END"""
+        )
+    statements.append(
+        f"CREATE TRIGGER IF NOT EXISTS {table}_count_ai AFTER INSERT ON {table} BEGIN {' '.join(on_insert)} END"
+    )
+    statements.append(
+        f"CREATE TRIGGER IF NOT EXISTS {table}_count_ad AFTER DELETE ON {table} BEGIN {' '.join(on_delete)} END"
+    )
+    return statements
+
+
+def ensure_counters(engine: Engine) -> None:
+    """
+    행 수 카운터 테이블과 트리거를 만듭니다. 처음 만드는 테이블은 현재 행 수로 초기화합니다.
+    트리거 생성과 초기화는 한 트랜잭션에서 하므로 그 사이에 추가된 행도 빠지지 않습니다.
+    """
+    existing_tables = set(inspect(engine).get_table_names())
+    with engine.begin() as conn:
+        conn.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {ROW_COUNTS_TABLE} (name TEXT PRIMARY KEY, row_count INTEGER NOT NULL DEFAULT 0)"
+        ))
+        for table, group_column in COUNTED_TABLES.items():
+            if table not in existing_tables:
+                continue
+            for statement in _trigger_statements(table, group_column):
+                conn.execute(text(statement))
+
+            seeded = conn.execute(
+                text(f"SELECT 1 FROM {ROW_COUNTS_TABLE} WHERE name = :name"), {"name": table}
+            ).scalar()
+            if seeded:
+                continue
+            conn.execute(text(
+                f"INSERT INTO {ROW_COUNTS_TABLE}(name, row_count) SELECT '{table}', COUNT(*) FROM {table}"
+            ))
+            if group_column:
+                conn.execute(text(
+                    f"INSERT INTO {ROW_COUNTS_TABLE}(name, row_count) "
+                    f"SELECT {_group_name(table, group_column)}, COUNT(*) FROM {table} GROUP BY {group_column}"
+                ))
+            logger.info(f"행 수 카운터 초기화: {table}")
+
+
+def get_row_count(db: Session, table: str, group: Optional[str] = None) -> Optional[int]:
+    """
+    트리거가 관리하는 행 수를 반환합니다. COUNT(*)처럼 테이블을 훑지 않습니다.
+    카운터가 없으면 None을 반환합니다.
+    """
+    name = f"{table}:{group}" if group is not None else table
+    try:
+        count = db.execute(
+            text(f"SELECT row_count FROM {ROW_COUNTS_TABLE} WHERE name = :name"), {"name": name}
+        ).scalar()
+    except Exception as e:
+        logger.error(f"행 수 조회 중 오류: {str(e)}")
+        return None
+    if count is None:
+        # 테이블 카운터가 있으면 해당 그룹의 행이 없는 것
+        return 0 if group is not None and get_row_count(db, table) is not None else None
+    return max(0, count)
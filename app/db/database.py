@@ -1,26 +1,79 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from typing import Optional
+from app.core.config import settings
 import os
 import logging
 
 logger = logging.getLogger(__name__)
 
-# 데이터베이스 파일 경로 설정
-DB_DIRECTORY = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "data")
-os.makedirs(DB_DIRECTORY, exist_ok=True)
-DB_FILE = os.path.join(DB_DIRECTORY, "app.db")
+# 데이터베이스 URL (설정의 DATABASE_URL 또는 DB_PATH의 SQLite 파일)
+SQLALCHEMY_DATABASE_URL = settings.SQLALCHEMY_DATABASE_URI
 
-# 로그 추가
-logger.info(f"데이터베이스 파일 경로: {DB_FILE}")
 
-# SQLite 데이터베이스 URL 생성
-SQLALCHEMY_DATABASE_URL = f"sqlite:///{DB_FILE}"
+def _set_sqlite_pragma(dbapi_connection, connection_record):
+    """
+    SQLite 연결마다 적용할 설정.
+    WAL 모드에서는 읽기가 쓰기를 기다리지 않고, 쓰기 잠금은 busy_timeout 동안 기다린 뒤에야 실패합니다.
+    WAL에서 synchronous=NORMAL은 커밋마다 fsync하지 않아도 데이터베이스가 손상되지 않습니다.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    cursor.execute(f"PRAGMA cache_size=-{int(settings.SQLITE_CACHE_SIZE_KB)}")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+    # 압축 저장된 원문을 SQL(원문 LIKE 검색, 내보내기, 보관)에서 읽기 위한 함수
+    from app.db.text_blobs import register_sql_functions
+    register_sql_functions(dbapi_connection)
+
+
+def create_db_engine(url: Optional[str] = None) -> Engine:
+    """
+    설정에 맞춘 데이터베이스 엔진을 만듭니다. 앱, 작업자, 스크립트 모두 이 함수로 만든 엔진을 사용합니다.
+    스레드 간에 연결을 공유할 수 있게 하고 연결마다 WAL 등 PRAGMA를 적용합니다.
+    전문 검색(FTS5), 트리거로 유지하는 카운터/사용량 집계, 작업 큐 upsert, 증분 VACUUM 등이
+    SQLite 전용이므로 다른 데이터베이스 URL은 거부합니다.
+    """
+    url = url or SQLALCHEMY_DATABASE_URL
+    database_url = make_url(url)
+
+    if database_url.get_backend_name() != "sqlite":
+        raise ValueError(
+            f"지원하지 않는 데이터베이스입니다: {database_url.get_backend_name()} (현재 SQLite만 지원합니다)"
+        )
+
+    connect_args = {
+        "check_same_thread": False,
+        # 드라이버 수준의 잠금 대기 시간 (PRAGMA busy_timeout과 같게)
+        "timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000.0
+    }
+    if database_url.database in (None, "", ":memory:"):
+        # 메모리 데이터베이스는 연결 하나를 모든 스레드가 공유해야 같은 데이터를 봄
+        sqlite_engine = create_engine(url, connect_args=connect_args, poolclass=StaticPool)
+    else:
+        os.makedirs(os.path.dirname(os.path.abspath(database_url.database)), exist_ok=True)
+        sqlite_engine = create_engine(
+            url,
+            connect_args=connect_args,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT
+        )
+    event.listen(sqlite_engine, "connect", _set_sqlite_pragma)
+    return sqlite_engine
+
+
+# 로그 추가
+logger.info(f"데이터베이스 URL: {make_url(SQLALCHEMY_DATABASE_URL).render_as_string(hide_password=True)}")
 
 # 데이터베이스 엔진 생성
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
+engine = create_db_engine()
 
 # 세션 팩토리 생성
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -43,7 +96,23 @@ def init_db():
         # 모델 임포트
         from app.models.models import User, Channel, Keyword, Tag, Video, SearchHistory, SummaryHistory
         Base.metadata.create_all(bind=engine)
+
+        # 기존 테이블에 새 컬럼 반영
+        from app.db.migrations import apply_column_migrations
+        apply_column_migrations(engine)
+
+        # 히스토리 전문 검색 인덱스
+        from app.db.fts import ensure_fts
+        ensure_fts(engine)
+
+        # 목록 API 전체 개수용 행 수 카운터
+        from app.db.counters import ensure_counters
+        ensure_counters(engine)
+
+        # 사용자별 사용량 집계
+        from app.db.usage_rollups import ensure_usage_rollups
+        ensure_usage_rollups(engine)
         logger.info("데이터베이스 테이블 생성 완료")
     except Exception as e:
         logger.error(f"데이터베이스 초기화 중 오류: {e}")
-        raise e 
\ No newline at end of file
+        raise e
@@ -0,0 +1,204 @@
+from sqlalchemy import bindparam, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from app.db.text_blobs import decompress_text
+from typing import List, Optional
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = "summary_history_fts"
+FTS_SOURCE_VIEW = "summary_history_fts_source"
+# 압축 저장된 원문(text_blobs) 검색 인덱스. 행 번호는 text_blobs.fts_id
+# (text_blobs는 문자열 기본 키라 rowid가 VACUUM 때 바뀔 수 있으므로 rowid를 쓰지 않음)
+BLOB_FTS_TABLE = "text_blobs_fts"
+
+# 검색 컬럼 순서 (bm25 가중치와 snippet 컬럼 번호가 이 순서를 따름)
+FTS_COLUMNS = ["title", "summary_text", "original_text", "key_phrases"]
+BM25_WEIGHTS = (10.0, 5.0, 1.0, 3.0)
+
+# trigram 토크나이저는 한국어처럼 공백으로 단어를 나누기 어려운 언어도 부분 문자열로 검색할 수 있음
+# (SQLite 3.34 이상), 지원하지 않으면 unicode61 + 접두어 인덱스 사용
+TOKENIZER_TRIGRAM = "trigram"
+TOKENIZER_UNICODE61 = "unicode61 remove_diacritics 2"
+
+# 제목은 source_info JSON에서 가져옴 (유튜브 제목 또는 문서 파일명)
+_TITLE_SQL = "COALESCE(json_extract({row}.source_info, '$.video_title'), json_extract({row}.source_info, '$.file_name'), '')"
+
+# 트리거와 뷰는 SQL만으로 값을 만들어야 함 (앱이 등록하는 함수에 의존하면 sqlite3 CLI 등 다른 연결에서
+# summary_history를 수정할 때 "no such function" 오류가 남). 압축된 원문은 미리보기만 여기에 색인하고
+# 전체 원문은 BLOB_FTS_TABLE에 앱 코드(index_blob/unindex_blobs)가 색인함
+_ORIGINAL_SQL = "COALESCE({row}.original_text, {row}.preview)"
+
+# 이 컬럼이 바뀔 때만 다시 색인 (quality_score 등 다른 컬럼 수정은 인덱스와 무관)
+_INDEXED_SOURCE_COLUMNS = "summary_text, key_phrases, source_info, original_text, preview, original_blob_hash"
+
+_tokenizer: Optional[str] = None
+_checked = False
+
+
+def _trigger_values(row: str) -> str:
+    return ", ".join([
+        _TITLE_SQL.format(row=row),
+        f"{row}.summary_text",
+        _ORIGINAL_SQL.format(row=row),
+        f"{row}.key_phrases",
+    ])
+
+
+def _create_statements(tokenizer: str) -> List[str]:
+    columns = ", ".join(FTS_COLUMNS)
+    prefix = ", prefix='2 3'" if tokenizer != TOKENIZER_TRIGRAM else ""
+    return [
+        f"""CREATE VIEW IF NOT EXISTS {FTS_SOURCE_VIEW} AS
+            SELECT h.id AS id, {_TITLE_SQL.format(row='h')} AS title,
+                   h.summary_text AS summary_text, {_ORIGINAL_SQL.format(row='h')} AS original_text,
+                   h.key_phrases AS key_phrases
+            FROM summary_history h""",
+        f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+            {columns}, content='{FTS_SOURCE_VIEW}', content_rowid='id', tokenize='{tokenizer}'
+            {prefix})""",
+        # 원문 자체는 text_blobs에 압축되어 있으므로 내용을 저장하지 않는(contentless) 인덱스
+        f"""CREATE VIRTUAL TABLE IF NOT EXISTS {BLOB_FTS_TABLE} USING fts5(
+            original_text, content='', tokenize='{tokenizer}'
+            {prefix})""",
+        f"""CREATE TRIGGER IF NOT EXISTS summary_history_fts_ai AFTER INSERT ON summary_history BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, {columns}) VALUES (new.id, {_trigger_values('new')});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS summary_history_fts_ad AFTER DELETE ON summary_history BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {columns}) VALUES ('delete', old.id, {_trigger_values('old')});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS summary_history_fts_au
+            AFTER UPDATE OF {_INDEXED_SOURCE_COLUMNS} ON summary_history BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {columns}) VALUES ('delete', old.id, {_trigger_values('old')});
+            INSERT INTO {FTS_TABLE}(rowid, {columns}) VALUES (new.id, {_trigger_values('new')});
+        END""",
+    ]
+
+
+def drop_fts(engine: Engine) -> None:
+    """검색 인덱스와 트리거를 삭제합니다. (다시 만들 때 사용)"""
+    global _tokenizer
+    with engine.begin() as conn:
+        for trigger in ("summary_history_fts_ai", "summary_history_fts_ad", "summary_history_fts_au"):
+            conn.execute(text(f"DROP TRIGGER IF EXISTS {trigger}"))
+        conn.execute(text(f"DROP TABLE IF EXISTS {FTS_TABLE}"))
+        conn.execute(text(f"DROP TABLE IF EXISTS {BLOB_FTS_TABLE}"))
+        conn.execute(text(f"DROP VIEW IF EXISTS {FTS_SOURCE_VIEW}"))
+    _tokenizer = None
+
+
+def ensure_fts(engine: Engine) -> Optional[str]:
+    """
+    요약 히스토리 전문 검색 인덱스(FTS5)를 만들고 사용 중인 토크나이저를 반환합니다.
+    새로 만든 경우 기존 히스토리 전체를 색인합니다. FTS5를 사용할 수 없으면 None을 반환합니다.
+    """
+    global _tokenizer, _checked
+    _checked = True
+    with engine.begin() as conn:
+        existing = conn.execute(
+            text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": FTS_TABLE}
+        ).scalar()
+        view_sql = conn.execute(
+            text("SELECT sql FROM sqlite_master WHERE type = 'view' AND name = :name"),
+            {"name": FTS_SOURCE_VIEW}
+        ).scalar()
+        blob_index = _table_exists(conn, BLOB_FTS_TABLE)
+    if existing:
+        tokenizer = TOKENIZER_TRIGRAM if "trigram" in existing else TOKENIZER_UNICODE61
+        if blob_index and view_sql == _create_statements(tokenizer)[0].replace(" IF NOT EXISTS", "", 1):
+            _tokenizer = tokenizer
+            return _tokenizer
+        # 색인할 컬럼 정의가 바뀌었으면 다시 만듦
+        logger.info("히스토리 검색 인덱스 정의가 바뀌어 다시 생성합니다.")
+        drop_fts(engine)
+
+    for tokenizer in (TOKENIZER_TRIGRAM, TOKENIZER_UNICODE61):
+        try:
+            with engine.begin() as conn:
+                for statement in _create_statements(tokenizer):
+                    conn.execute(text(statement))
+                conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+                _index_all_blobs(conn)
+            _tokenizer = tokenizer
+            logger.info(f"히스토리 검색 인덱스 생성 완료 (토크나이저: {tokenizer})")
+            return _tokenizer
+        except Exception as e:
+            logger.warning(f"검색 인덱스 생성 실패 (토크나이저: {tokenizer}): {str(e)}")
+            drop_fts(engine)
+    logger.error("FTS5를 사용할 수 없어 히스토리 검색은 LIKE 검색을 사용합니다.")
+    return None
+
+
+def _table_exists(conn, name: str) -> bool:
+    return conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE name = :name"), {"name": name}
+    ).scalar() is not None
+
+
+def _index_all_blobs(conn) -> None:
+    """기존 압축 원문을 모두 색인합니다. (인덱스를 새로 만들 때)"""
+    rows = conn.execute(text("SELECT fts_id, codec, data FROM text_blobs WHERE fts_id IS NOT NULL"))
+    for row in rows.fetchall():
+        conn.execute(
+            text(f"INSERT INTO {BLOB_FTS_TABLE}(rowid, original_text) VALUES (:fts_id, :content)"),
+            {"fts_id": row.fts_id, "content": decompress_text(row.codec, row.data)}
+        )
+
+
+def index_blob(db: Session, key: str, content: str) -> None:
+    """새로 저장한 압축 원문을 색인합니다. 검색 인덱스가 없으면 아무것도 하지 않습니다."""
+    if not _table_exists(db, BLOB_FTS_TABLE):
+        return
+    db.execute(
+        text(f"INSERT INTO {BLOB_FTS_TABLE}(rowid, original_text) "
+             f"SELECT fts_id, :content FROM text_blobs WHERE hash = :hash"),
+        {"content": content, "hash": key}
+    )
+
+
+def unindex_blobs(db: Session, keys: List[str]) -> None:
+    """
+    삭제할 압축 원문을 인덱스에서 뺍니다. contentless 인덱스는 색인했던 텍스트가 있어야 지울 수 있으므로
+    blob을 삭제하기 전에 호출해야 합니다.
+    """
+    if not keys or not _table_exists(db, BLOB_FTS_TABLE):
+        return
+    rows = db.execute(
+        text("SELECT fts_id, codec, data FROM text_blobs WHERE hash IN :keys AND fts_id IS NOT NULL")
+        .bindparams(bindparam("keys", expanding=True)),
+        {"keys": keys}
+    ).fetchall()
+    for row in rows:
+        db.execute(
+            text(f"INSERT INTO {BLOB_FTS_TABLE}({BLOB_FTS_TABLE}, rowid, original_text) "
+                 f"VALUES ('delete', :fts_id, :content)"),
+            {"fts_id": row.fts_id, "content": decompress_text(row.codec, row.data)}
+        )
+
+
+def get_tokenizer(engine: Optional[Engine] = None) -> Optional[str]:
+    """사용 중인 토크나이저. 이 프로세스에서 아직 확인하지 않았으면 engine으로 확인합니다."""
+    if not _checked and engine is not None:
+        ensure_fts(engine)
+    return _tokenizer
+
+
+def build_match_query(query: str) -> Optional[str]:
+    """
+    사용자 검색어를 FTS5 MATCH 식으로 바꿉니다. 각 단어는 따옴표로 감싸 연산자로 해석되지 않게 하고,
+    unicode61에서는 접두어 검색(*)을 붙입니다. 검색할 수 없는 검색어이면 None을 반환합니다.
+    """
+    terms = [term for term in re.split(r"\s+", query.strip()) if term]
+    if not terms or _tokenizer is None:
+        return None
+    # trigram은 3자 미만의 단어를 찾을 수 없음
+    if _tokenizer == TOKENIZER_TRIGRAM and any(len(term) < 3 for term in terms):
+        return None
+
+    quoted = ['"' + term.replace('"', '""') + '"' for term in terms]
+    if _tokenizer != TOKENIZER_TRIGRAM:
+        quoted = [term + "*" for term in quoted]
+    return " AND ".join(quoted)
@@ -0,0 +1,86 @@
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+from typing import Any, Dict
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 기존 테이블에 나중에 추가된 컬럼 (create_all은 기존 테이블을 변경하지 않음)
+# 테이블 이름 -> {컬럼 이름: 컬럼 DDL}
+COLUMN_MIGRATIONS: Dict[str, Dict[str, str]] = {
+    "channels": {
+        "last_polled_at": "DATETIME",
+        "next_check_at": "DATETIME",
+        "poll_interval_seconds": "INTEGER",
+        "last_poll_lag_seconds": "FLOAT",
+    },
+    "summary_history": {
+        "content_hash": "VARCHAR(64)",
+        "source_key": "VARCHAR(255)",
+        "params_hash": "VARCHAR(64)",
+        "preview": "VARCHAR(203)",
+        "original_blob_hash": "VARCHAR(64) REFERENCES text_blobs(hash)",
+        "user_id": "INTEGER",
+        "tokens_used": "INTEGER",
+    },
+    "text_blobs": {
+        "fts_id": "INTEGER",
+    },
+    "videos": {
+        "minhash": "BLOB",
+        "transcript_minhash": "BLOB",
+        "duplicate_of_id": "INTEGER REFERENCES videos(id)",
+    },
+}
+
+# 컬럼을 새로 추가했을 때 기존 행을 채우는 SQL: (테이블 이름, 컬럼 이름) -> SQL 또는 SQL 목록
+COLUMN_BACKFILLS: Dict[tuple, Any] = {
+    ("summary_history", "preview"): (
+        "UPDATE summary_history SET preview = CASE WHEN length(original_text) > 200 "
+        "THEN substr(original_text, 1, 200) || '...' ELSE original_text END "
+        "WHERE original_text IS NOT NULL"
+    ),
+    # rowid 기준으로 만든 원문 검색 인덱스는 VACUUM 후 어긋났을 수 있으므로 지우고 ensure_fts에서 다시 만듦
+    ("text_blobs", "fts_id"): [
+        "UPDATE text_blobs SET fts_id = rowid",
+        "DROP TABLE IF EXISTS text_blobs_fts",
+    ],
+}
+
+# 컬럼 추가 후 생성할 인덱스: 인덱스 이름 -> (테이블 이름, 컬럼 목록)
+INDEX_MIGRATIONS: Dict[str, tuple] = {
+    "ix_channels_next_check_at": ("channels", "next_check_at"),
+    "ix_videos_duplicate_of_id": ("videos", "duplicate_of_id"),
+    "ix_summary_history_dedup": ("summary_history", "summary_type, content_hash, params_hash"),
+    "ix_summary_history_source": ("summary_history", "summary_type, source_key, params_hash"),
+    "ix_summary_history_original_blob_hash": ("summary_history", "original_blob_hash"),
+    "ix_text_blobs_fts_id": ("text_blobs", "fts_id"),
+    "ix_summary_history_user_id": ("summary_history", "user_id"),
+    "ix_summary_history_created": ("summary_history", "created_at, id"),
+    "ix_summary_history_type_created": ("summary_history", "summary_type, created_at, id"),
+    "ix_videos_published": ("videos", "published_at, id"),
+}
+
+
+def apply_column_migrations(engine: Engine) -> None:
+    """존재하는 테이블에 빠진 컬럼과 인덱스를 추가합니다."""
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+
+    with engine.begin() as conn:
+        for table_name, columns in COLUMN_MIGRATIONS.items():
+            if table_name not in existing_tables:
+                continue
+            existing_columns = {column["name"] for column in inspector.get_columns(table_name)}
+            for column_name, ddl in columns.items():
+                if column_name not in existing_columns:
+                    logger.info(f"컬럼 추가: {table_name}.{column_name}")
+                    conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {column_name} {ddl}"))
+                    backfill = COLUMN_BACKFILLS.get((table_name, column_name))
+                    for statement in ([backfill] if isinstance(backfill, str) else backfill or []):
+                        conn.execute(text(statement))
+
+        for index_name, (table_name, columns) in INDEX_MIGRATIONS.items():
+            if table_name not in existing_tables:
+                continue
+            conn.execute(text(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table_name} ({columns})"))
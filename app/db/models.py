@@ -1,7 +1,10 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, JSON, LargeBinary, UniqueConstraint, Index
+from sqlalchemy import func, select
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import relationship, deferred
 from datetime import datetime
 from app.db.database import Base
+from app.db.text_blobs import PREVIEW_LENGTH, make_preview, decompress_text
 
 class YoutubeChannel(Base):
     __tablename__ = "youtube_channels"
@@ -31,28 +34,113 @@ class Video(Base):
     published_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+class TranscriptCache(Base):
+    __tablename__ = "transcript_cache"
+    __table_args__ = (
+        UniqueConstraint("video_id", "language", "kind", name="uq_transcript_cache_key"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    video_id = Column(String(32), index=True)
+    language = Column(String(20))  # 요청된 언어 코드
+    kind = Column(String(10))  # 'manual', 'auto', 'none'(자막 없음)
+    track_language = Column(String(20), nullable=True)  # 실제 가져온 자막 트랙의 언어
+    segment_count = Column(Integer, default=0)
+    segments = Column(LargeBinary, nullable=True)  # 압축된 배열 형식의 자막 세그먼트
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class TextBlob(Base):
+    __tablename__ = "text_blobs"
+    
+    hash = Column(String(64), primary_key=True)  # 원문의 SHA-256 (같은 원문은 한 행을 공유)
+    codec = Column(String(10))  # 압축 형식 ('zlib')
+    size = Column(Integer)  # 압축 전 문자 수
+    data = Column(LargeBinary)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    # 원문 검색 인덱스의 키 (문자열 기본 키 테이블의 rowid는 VACUUM 때 바뀔 수 있음)
+    fts_id = Column(Integer, index=True)
+
 class SummaryHistory(Base):
     __tablename__ = "summary_history"
+    __table_args__ = (
+        Index("ix_summary_history_dedup", "summary_type", "content_hash", "params_hash"),
+        Index("ix_summary_history_source", "summary_type", "source_key", "params_hash"),
+        # 커서 페이지네이션 (created_at, id) 정렬용
+        Index("ix_summary_history_created", "created_at", "id"),
+        Index("ix_summary_history_type_created", "summary_type", "created_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     summary_type = Column(String(50))  # 'text', 'youtube', 'document' 등
-    original_text = Column(Text, nullable=True)
+    # 짧은 원문은 행에 그대로, 긴 원문은 text_blobs에 압축해 저장 (original_text 속성으로 접근)
+    # 둘 다 목록 조회에서 읽지 않도록 지연 로딩
+    inline_original_text = deferred(Column("original_text", Text, nullable=True))
+    original_blob_hash = Column(String(64), ForeignKey("text_blobs.hash"), nullable=True, index=True)
+    original_blob = relationship("TextBlob", lazy="select")
+    preview = Column(String(PREVIEW_LENGTH + 3), nullable=True)  # 저장할 때 만든 원문 미리보기
     summary_text = Column(Text, nullable=True)
     key_phrases = Column(Text, nullable=True)  # JSON 형식으로 저장
     source_info = Column(JSON, nullable=True)  # 원본 정보(URL, 파일명 등)
     quality_score = Column(Integer, nullable=True)
     model_used = Column(String(100), nullable=True)
+    content_hash = Column(String(64), nullable=True)  # 원본 텍스트의 SHA-256
+    source_key = Column(String(255), nullable=True)  # 정규화한 원본 식별자 (예: 'youtube:<video_id>')
+    params_hash = Column(String(64), nullable=True)  # 모델, 언어 등 요약 파라미터의 SHA-256
+    user_id = Column(Integer, nullable=True, index=True)  # 요청한 사용자 (로그인하지 않은 요청은 None)
+    tokens_used = Column(Integer, nullable=True)  # 요약에 사용한 LLM 토큰 수
     created_at = Column(DateTime, default=datetime.utcnow)
 
-    def to_dict(self):
+    @hybrid_property
+    def original_text(self):
+        """원문. 압축 저장된 경우 이 속성에 처음 접근할 때 blob을 읽어 압축을 풉니다."""
+        if self.inline_original_text is not None:
+            return self.inline_original_text
+        if self.original_blob_hash is None:
+            return None
+        blob = self.original_blob
+        return decompress_text(blob.codec, blob.data) if blob is not None else None
+
+    @original_text.setter
+    def original_text(self, value):
+        """행에 그대로 저장합니다. 긴 원문을 압축 저장하려면 text_blobs.set_original_text를 사용합니다."""
+        self.inline_original_text = value
+        self.original_blob_hash = None
+        self.preview = make_preview(value)
+
+    @original_text.expression
+    def original_text(cls):
+        # SQL 식에서는 등록된 text_decompress 함수로 압축을 풂 (LIKE 검색 등)
+        return func.coalesce(
+            cls.inline_original_text,
+            select(func.text_decompress(TextBlob.codec, TextBlob.data))
+            .where(TextBlob.hash == cls.original_blob_hash)
+            .scalar_subquery()
+        )
+
+    def to_dict(self, full_text: bool = False):
+        """full_text가 False이면 원문 대신 미리보기를 사용하므로 원문을 읽지 않습니다."""
         return {
             "id": self.id,
             "summary_type": self.summary_type,
-            "original_text": self.original_text[:200] + "..." if self.original_text and len(self.original_text) > 200 else self.original_text,
+            "original_text": self.original_text if full_text else self.preview,
             "summary_text": self.summary_text,
             "key_phrases": self.key_phrases,
             "source_info": self.source_info,
             "quality_score": self.quality_score,
             "model_used": self.model_used,
             "created_at": self.created_at.isoformat() if self.created_at else None
-        } 
\ No newline at end of file
+        }
+
+class UsageRollup(Base):
+    """
+    사용자/날짜/요약 종류/모델별 요약 수와 토큰 합계. summary_history에 행이 추가될 때 트리거로 갱신됩니다.
+    (보존 정책으로 히스토리를 삭제해도 사용량은 줄지 않음)
+    """
+    __tablename__ = "usage_rollups"
+    
+    user_id = Column(Integer, primary_key=True)  # 로그인하지 않은 요청은 0
+    day = Column(String(10), primary_key=True)  # 'YYYY-MM-DD' (UTC)
+    summary_type = Column(String(50), primary_key=True)
+    model = Column(String(100), primary_key=True)
+    summary_count = Column(Integer, default=0)
+    tokens_total = Column(Integer, default=0)
@@ -1,13 +1,4 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from app.core.config import settings
+# 엔진과 세션은 app.db.database 한 곳에서 만듭니다. 기존 임포트 경로 호환용.
+from app.db.database import engine, SessionLocal, get_db
 
-engine = create_engine(settings.SQLALCHEMY_DATABASE_URI, pool_pre_ping=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close() 
\ No newline at end of file
+__all__ = ["engine", "SessionLocal", "get_db"]
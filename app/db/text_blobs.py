@@ -0,0 +1,116 @@
+from sqlalchemy import bindparam, text
+from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Iterable, Optional
+import hashlib
+import logging
+import zlib
+
+logger = logging.getLogger(__name__)
+
+TEXT_BLOBS_TABLE = "text_blobs"
+
+# 이 길이(문자 수) 이상인 원문만 압축 저장, 짧은 텍스트는 행에 그대로 둠
+MIN_COMPRESS_LENGTH = 1024
+CODEC_ZLIB = "zlib"
+# 목록에 보여줄 원문 미리보기 길이
+PREVIEW_LENGTH = 200
+COMPRESSION_LEVEL = 6
+
+
+def make_preview(content: Optional[str]) -> Optional[str]:
+    if content and len(content) > PREVIEW_LENGTH:
+        return content[:PREVIEW_LENGTH] + "..."
+    return content
+
+
+def content_key(content: str) -> str:
+    """원문 텍스트의 SHA-256. 같은 원문은 하나의 blob을 공유합니다."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def compress_text(content: str) -> bytes:
+    return zlib.compress(content.encode("utf-8"), COMPRESSION_LEVEL)
+
+
+def decompress_text(codec: Optional[str], data: Optional[bytes]) -> Optional[str]:
+    if data is None:
+        return None
+    if codec == CODEC_ZLIB:
+        return zlib.decompress(data).decode("utf-8")
+    raise ValueError(f"지원하지 않는 압축 형식: {codec}")
+
+
+def register_sql_functions(dbapi_connection) -> None:
+    """SQL에서 text_decompress(codec, data)로 압축된 원문을 읽을 수 있게 합니다. 트리거에서는 사용하지 않습니다."""
+    dbapi_connection.create_function("text_decompress", 2, decompress_text, deterministic=True)
+
+
+def store_text(db: Session, content: str) -> str:
+    """
+    원문을 압축해 blob 테이블에 저장하고 키를 반환합니다. 이미 같은 원문이 있으면 새로 저장하지 않습니다.
+    새로 저장한 원문은 검색 인덱스에도 추가합니다. 커밋은 호출한 쪽에서 합니다.
+    """
+    key = content_key(content)
+    result = db.execute(text(
+        f"INSERT INTO {TEXT_BLOBS_TABLE} (hash, codec, size, data, created_at, fts_id) "
+        f"SELECT :hash, :codec, :size, :data, :created_at, COALESCE(MAX(fts_id), 0) + 1 FROM {TEXT_BLOBS_TABLE} "
+        f"WHERE true ON CONFLICT(hash) DO NOTHING"
+    ), {
+        "hash": key,
+        "codec": CODEC_ZLIB,
+        "size": len(content),
+        "data": compress_text(content),
+        "created_at": datetime.utcnow(),
+    })
+    if result.rowcount == 1:
+        from app.db.fts import index_blob
+        index_blob(db, key, content)
+    return key
+
+
+def set_original_text(db: Session, item, content: Optional[str]) -> None:
+    """
+    요약 히스토리의 원문을 설정합니다. 긴 원문은 압축 blob에 저장하고 행에는 키와 미리보기만 남깁니다.
+    """
+    if content is not None and len(content) >= MIN_COMPRESS_LENGTH:
+        item.original_blob_hash = store_text(db, content)
+        item.inline_original_text = None
+        item.preview = make_preview(content)
+    else:
+        item.original_text = content
+
+
+def purge_unused_blobs(db: Session, hashes: Optional[Iterable[str]] = None) -> int:
+    """
+    어떤 히스토리도 참조하지 않는 blob을 삭제하고 삭제한 개수를 반환합니다.
+    hashes를 주면 그 blob만 확인합니다. 커밋은 호출한 쪽에서 합니다.
+    """
+    unused = (
+        f"NOT EXISTS (SELECT 1 FROM summary_history h WHERE h.original_blob_hash = {TEXT_BLOBS_TABLE}.hash)"
+    )
+    if hashes is None:
+        candidates = db.execute(text(f"SELECT hash FROM {TEXT_BLOBS_TABLE} WHERE {unused}")).scalars().all()
+    else:
+        hashes = list(set(hashes))
+        if not hashes:
+            return 0
+        candidates = db.execute(
+            text(f"SELECT hash FROM {TEXT_BLOBS_TABLE} WHERE hash IN :hashes AND {unused}")
+            .bindparams(bindparam("hashes", expanding=True)),
+            {"hashes": hashes}
+        ).scalars().all()
+    if not candidates:
+        return 0
+
+    # 검색 인덱스에서 지우려면 원문이 필요하므로 blob을 삭제하기 전에 처리
+    from app.db.fts import unindex_blobs
+    unindex_blobs(db, candidates)
+    result = db.execute(
+        text(f"DELETE FROM {TEXT_BLOBS_TABLE} WHERE hash IN :hashes")
+        .bindparams(bindparam("hashes", expanding=True)),
+        {"hashes": candidates}
+    )
+    if result.rowcount:
+        logger.info(f"사용하지 않는 원문 blob {result.rowcount}개 삭제")
+    return result.rowcount or 0
@@ -0,0 +1,86 @@
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from typing import Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+USAGE_ROLLUPS_TABLE = "usage_rollups"
+
+# summary_history 행의 집계 키와 값 (로그인하지 않은 요청은 user_id 0)
+_KEY_SQL = (
+    "COALESCE({row}user_id, 0), date({row}created_at), "
+    "COALESCE({row}summary_type, ''), COALESCE({row}model_used, '')"
+)
+_COLUMNS = "user_id, day, summary_type, model, summary_count, tokens_total"
+
+_TRIGGER_SQL = f"""CREATE TRIGGER IF NOT EXISTS summary_history_usage_ai AFTER INSERT ON summary_history BEGIN
+    INSERT INTO {USAGE_ROLLUPS_TABLE} ({_COLUMNS})
+    VALUES ({_KEY_SQL.format(row='new.')}, 1, COALESCE(new.tokens_used, 0))
+    ON CONFLICT(user_id, day, summary_type, model) DO UPDATE SET
+        summary_count = summary_count + 1,
+        tokens_total = tokens_total + excluded.tokens_total;
+END"""
+
+# 중복 요약이라 히스토리 행을 만들지 않은 요청의 사용량 (트리거와 같은 키, 오늘 날짜(UTC))
+_RECORD_SQL = f"""INSERT INTO {USAGE_ROLLUPS_TABLE} ({_COLUMNS})
+VALUES (COALESCE(:user_id, 0), date('now'), COALESCE(:summary_type, ''), COALESCE(:model, ''), 1, COALESCE(:tokens_used, 0))
+ON CONFLICT(user_id, day, summary_type, model) DO UPDATE SET
+    summary_count = summary_count + 1,
+    tokens_total = tokens_total + excluded.tokens_total"""
+
+
+def ensure_usage_rollups(engine: Engine) -> None:
+    """
+    사용량 집계 트리거를 만듭니다. 집계 테이블이 비어 있으면 기존 히스토리로 채웁니다.
+    테이블은 UsageRollup 모델로 create_all에서 만들어집니다.
+    """
+    with engine.begin() as conn:
+        conn.execute(text(_TRIGGER_SQL))
+        if conn.execute(text(f"SELECT 1 FROM {USAGE_ROLLUPS_TABLE} LIMIT 1")).scalar() is None:
+            _rebuild(conn, None)
+
+
+def _rebuild(conn, since: Optional[str]) -> None:
+    if since:
+        conn.execute(text(f"DELETE FROM {USAGE_ROLLUPS_TABLE} WHERE day >= :since"), {"since": since})
+        where = "WHERE date(created_at) >= :since"
+    else:
+        conn.execute(text(f"DELETE FROM {USAGE_ROLLUPS_TABLE}"))
+        where = ""
+    key = _KEY_SQL.format(row="")
+    conn.execute(text(
+        f"INSERT INTO {USAGE_ROLLUPS_TABLE} ({_COLUMNS}) "
+        f"SELECT {key}, COUNT(*), COALESCE(SUM(tokens_used), 0) FROM summary_history {where} GROUP BY {key}"
+    ), {"since": since} if since else {})
+
+
+def rebuild_usage_rollups(db: Session, since: Optional[str] = None) -> None:
+    """
+    집계를 summary_history에서 다시 계산합니다. since('YYYY-MM-DD')를 주면 그 날 이후만 다시 계산합니다.
+    보존 정책으로 삭제된 히스토리와 record_usage로 센 중복 요청은 다시 셀 수 없으므로
+    보존 기간 안의 날짜만 다시 계산하는 것이 안전합니다.
+    커밋은 호출한 쪽에서 합니다.
+    """
+    _rebuild(db, since)
+    logger.info(f"사용량 집계 재계산 완료 (since: {since or '전체'})")
+
+
+def record_usage(
+    db: Session,
+    summary_type: str,
+    model: Optional[str],
+    user_id: Optional[int] = None,
+    tokens_used: Optional[int] = None
+) -> None:
+    """
+    히스토리 행 없이 사용량을 하나 셉니다. 요약을 실행했지만 기존 히스토리와 중복이라 저장하지 않은 요청도
+    한도와 통계에 포함되도록 합니다. 커밋은 호출한 쪽에서 합니다.
+    """
+    db.execute(text(_RECORD_SQL), {
+        "user_id": user_id,
+        "summary_type": summary_type,
+        "model": model,
+        "tokens_used": tokens_used
+    })
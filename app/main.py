@@ -4,7 +4,7 @@ from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from starlette.middleware.cors import CORSMiddleware
-from app.api.endpoints import summarizer, history, youtube_manage, auth
+from app.api.endpoints import summarizer, history, youtube_manage, auth, websub
 from app.core.config import settings
 from app.db.database import init_db
 from app.db.models import YoutubeChannel, YoutubeKeyword, Video, SummaryHistory
@@ -44,6 +44,7 @@ app.include_router(summarizer.router, prefix="/api/v1", tags=["summarizer"])
 app.include_router(history.router, prefix="/api/v1/history", tags=["history"])
 app.include_router(youtube_manage.router, prefix="/api/v1/youtube", tags=["youtube"])
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["auth"])
+app.include_router(websub.router, prefix="/api/v1/websub", tags=["websub"])
 
 @app.on_event("startup")
 async def startup_db_client():
@@ -55,6 +56,32 @@ async def startup_db_client():
     except Exception as e:
         logger.error(f"데이터베이스 초기화 오류: {e}")
 
+@app.on_event("startup")
+async def startup_scheduler():
+    """설정된 경우 채널 확인 스케줄러 시작"""
+    if not settings.SCHEDULER_ENABLED:
+        return
+    try:
+        from app.services.scheduler_service import get_scheduler_service
+        get_scheduler_service().start()
+        logger.info("채널 확인 스케줄러 시작")
+    except Exception as e:
+        logger.error(f"스케줄러 시작 오류: {e}")
+
+@app.on_event("shutdown")
+async def shutdown_history_writer():
+    """대기 중인 요약 히스토리를 모두 저장"""
+    from app.services.history_writer import history_writer
+    history_writer.stop()
+
+@app.on_event("shutdown")
+async def shutdown_scheduler():
+    """애플리케이션 종료 시 스케줄러 중지"""
+    if not settings.SCHEDULER_ENABLED:
+        return
+    from app.services.scheduler_service import get_scheduler_service
+    get_scheduler_service().shutdown()
+
 # 계정 관리 페이지
 @app.get("/account", response_class=HTMLResponse)
 async def account_page(request: Request, current_user: User = Depends(get_current_active_user)):
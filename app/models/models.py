@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Boolean, Enum, Table, Float, JSON
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Boolean, Enum, Table, Float, JSON, Index, LargeBinary
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.base_class import Base
@@ -59,8 +59,29 @@ class Channel(Base):
     description = Column(Text)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    
+    # 채널별 확인 주기 관련 필드
+    last_polled_at = Column(DateTime(timezone=True), nullable=True)
+    next_check_at = Column(DateTime(timezone=True), nullable=True, index=True)
+    poll_interval_seconds = Column(Integer, nullable=True)
+    last_poll_lag_seconds = Column(Float, nullable=True)  # 예정 시간보다 늦게 확인된 시간
+    
     videos = relationship("Video", back_populates="channel")
 
+class WebSubSubscription(Base):
+    __tablename__ = "websub_subscriptions"
+
+    id = Column(Integer, primary_key=True, index=True)
+    channel_id = Column(String, unique=True, index=True)  # YouTube 채널 ID
+    topic = Column(String)
+    status = Column(String, default="pending")  # 'pending', 'active', 'unsubscribed', 'failed'
+    lease_seconds = Column(Integer, nullable=True)
+    expires_at = Column(DateTime(timezone=True), nullable=True, index=True)
+    verified_at = Column(DateTime(timezone=True), nullable=True)
+    last_notification_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
 class Keyword(Base):
     __tablename__ = "keywords"
 
@@ -79,6 +100,10 @@ class Tag(Base):
 
 class Video(Base):
     __tablename__ = "videos"
+    __table_args__ = (
+        # 커서 페이지네이션 (published_at, id) 정렬용
+        Index("ix_videos_published", "published_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     video_id = Column(String, unique=True, index=True)
@@ -101,6 +126,9 @@ class Video(Base):
     # 중복 체크 관련 필드
     similarity_score = Column(Float, default=0.0)  # 다른 비디오와의 유사도 점수
     is_duplicate = Column(Boolean, default=False)
+    minhash = Column(LargeBinary, nullable=True)  # 설명 텍스트의 MinHash 서명 (근접 중복 인덱스용)
+    transcript_minhash = Column(LargeBinary, nullable=True)  # 자막의 MinHash 서명
+    duplicate_of_id = Column(Integer, ForeignKey("videos.id"), nullable=True, index=True)  # 원본 비디오
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -109,6 +137,7 @@ class Video(Base):
     channel = relationship("Channel", back_populates="videos")
     keyword = relationship("Keyword", back_populates="videos")
     tags = relationship("Tag", secondary=video_tags, back_populates="videos")
+    duplicate_of = relationship("Video", remote_side=[id])
 
 class SearchHistory(Base):
     __tablename__ = "search_history"
@@ -129,4 +158,45 @@ class SummaryHistory(Base):
     original_text = Column(Text, nullable=True)
     source_info = Column(Text, nullable=True)  # JSON 형식으로 저장된 소스 정보
     summary_params = Column(Text, nullable=True)  # JSON 형식으로 저장된 요약 파라미터
-    created_at = Column(DateTime(timezone=True), server_default=func.now()) 
\ No newline at end of file
+    created_at = Column(DateTime(timezone=True), server_default=func.now()) 
+
+class Job(Base):
+    __tablename__ = "jobs"
+    __table_args__ = (
+        # 작업 가져오기: 상태별로 우선순위가 높고 실행 가능 시간이 이른 작업 순
+        Index("ix_jobs_claim", "status", "priority", "available_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_type = Column(String, index=True)  # 'summarize_video', 'ingest_videos' 등
+    payload = Column(Text)  # JSON 형식으로 저장된 작업 인자
+    priority = Column(Integer, default=0)  # 클수록 먼저 처리
+    status = Column(String, default="queued")  # 'queued', 'leased', 'done', 'dead'
+    dedupe_key = Column(String, unique=True, nullable=True)  # 같은 작업의 중복 등록 방지
+    attempts = Column(Integer, default=0)
+    max_attempts = Column(Integer, default=5)
+    available_at = Column(DateTime)  # 이 시간 이후에 실행 가능 (UTC)
+    leased_until = Column(DateTime, nullable=True)  # 임대 만료 시간, 지나면 다른 작업자가 가져갈 수 있음
+    lease_owner = Column(String, nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    finished_at = Column(DateTime, nullable=True)
+
+class SchedulerLease(Base):
+    __tablename__ = "scheduler_leases"
+
+    name = Column(String, primary_key=True)  # 리더를 뽑는 대상 (예: 'scheduler')
+    owner = Column(String, nullable=True)  # 현재 리더 프로세스 ID
+    expires_at = Column(DateTime)  # 이 시간까지 갱신하지 않으면 다른 프로세스가 리더가 됨 (UTC)
+    acquired_at = Column(DateTime, nullable=True)
+
+class VideoLshBucket(Base):
+    __tablename__ = "video_lsh_buckets"
+    __table_args__ = (
+        Index("ix_video_lsh_buckets_band_bucket", "band", "bucket"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    band = Column(Integer)  # MinHash 서명의 밴드 번호
+    bucket = Column(Integer)  # 밴드 값의 해시
+    video_id = Column(Integer, ForeignKey("videos.id", ondelete="CASCADE"), index=True)
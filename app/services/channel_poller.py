@@ -0,0 +1,200 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Any, List, Optional, Set
+from sqlalchemy import or_, true
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.models import Channel, Video
+import logging
+import random
+import threading
+
+logger = logging.getLogger(__name__)
+
+# 업로드 주기 추정에 사용할 최근 비디오 수
+_HISTORY_SIZE = 20
+
+
+class ChannelPoller:
+    """
+    채널마다 다음 확인 시간을 두고, 확인 시간이 된 채널을 제한된 작업자 풀에서 동시에 확인합니다.
+    확인 주기는 채널의 과거 업로드 빈도에 따라 조정되며 몰림을 막기 위해 무작위 편차를 더합니다.
+    """
+    def __init__(
+        self,
+        check_channel: Callable[..., None],
+        session_factory=SessionLocal,
+        max_workers: int = None
+    ):
+        self.check_channel = check_channel
+        self.session_factory = session_factory
+        self.max_workers = max_workers or settings.POLLER_MAX_WORKERS
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="channel-poller")
+        self._in_flight: Set[int] = set()
+        # 다음 확인 때 변경 여부(304)와 관계없이 전체를 확인할 채널
+        self._full_check: Set[int] = set()
+        self._lock = threading.Lock()
+        self._polls = 0
+        self._failures = 0
+
+    def tick(self) -> int:
+        """확인 시간이 된 채널을 작업자 풀에 제출하고 제출한 채널 수를 반환합니다."""
+        with self._lock:
+            # 작업자 수의 두 배까지만 대기시켜 오래된 예약이 쌓이지 않게 함
+            available = self.max_workers * 2 - len(self._in_flight)
+            in_flight = set(self._in_flight)
+        if available <= 0:
+            return 0
+
+        db = self.session_factory()
+        try:
+            now = datetime.utcnow()
+            due_ids = [
+                row.id for row in db.query(Channel.id).filter(
+                    or_(Channel.next_check_at.is_(None), Channel.next_check_at <= now),
+                    ~Channel.id.in_(in_flight) if in_flight else true()
+                ).order_by(Channel.next_check_at.asc()).limit(available).all()
+            ]
+        finally:
+            db.close()
+
+        submitted = 0
+        for channel_pk in due_ids:
+            with self._lock:
+                if channel_pk in self._in_flight:
+                    continue
+                self._in_flight.add(channel_pk)
+            self.executor.submit(self._poll, channel_pk)
+            submitted += 1
+        if submitted:
+            logger.info(f"채널 {submitted}개 확인 예약 (진행 중 {len(self._in_flight)}개)")
+        return submitted
+
+    def mark_all_due(self, full_check: bool = False) -> int:
+        """
+        모든 채널을 즉시 확인 대상으로 표시합니다. (재확인용)
+        full_check가 True이면 다음 확인에서 업로드 목록이 변경되지 않았어도 끝까지 확인합니다.
+        """
+        db = self.session_factory()
+        try:
+            now = datetime.utcnow()
+            if full_check:
+                channel_ids = {row.id for row in db.query(Channel.id).all()}
+                with self._lock:
+                    self._full_check |= channel_ids
+            count = db.query(Channel).filter(
+                or_(Channel.next_check_at.is_(None), Channel.next_check_at > now)
+            ).update({Channel.next_check_at: now}, synchronize_session=False)
+            db.commit()
+            return count
+        finally:
+            db.close()
+
+    def _poll(self, channel_pk: int) -> None:
+        db = self.session_factory()
+        try:
+            channel = db.query(Channel).filter(Channel.id == channel_pk).first()
+            if channel is None:
+                return
+
+            started_at = datetime.utcnow()
+            lag = (started_at - channel.next_check_at).total_seconds() if channel.next_check_at else 0.0
+            with self._lock:
+                full_check = channel_pk in self._full_check
+                self._full_check.discard(channel_pk)
+            try:
+                self.check_channel(channel, db, only_changed=not full_check)
+                interval = self.compute_interval(channel, db)
+            except Exception as e:
+                db.rollback()
+                logger.error(f"채널 확인 중 오류 ({channel.channel_id}): {str(e)}")
+                interval = settings.POLLER_MIN_INTERVAL_MINUTES * 60
+                with self._lock:
+                    self._failures += 1
+                    if full_check:
+                        self._full_check.add(channel_pk)
+
+            channel.last_polled_at = started_at
+            channel.last_poll_lag_seconds = max(0.0, lag)
+            channel.poll_interval_seconds = int(interval)
+            channel.next_check_at = datetime.utcnow() + timedelta(seconds=interval)
+            db.commit()
+            with self._lock:
+                self._polls += 1
+        except Exception as e:
+            db.rollback()
+            logger.error(f"채널 확인 일정 갱신 오류 (ID={channel_pk}): {str(e)}")
+        finally:
+            db.close()
+            with self._lock:
+                self._in_flight.discard(channel_pk)
+
+    def compute_interval(self, channel: Channel, db: Session) -> float:
+        """
+        최근 업로드 간격으로 다음 확인까지의 시간(초)을 계산합니다.
+        평균 업로드 간격의 절반마다 확인하고, 마지막 업로드 이후 오래 조용한 채널은 점점 드물게 확인합니다.
+        """
+        min_interval = settings.POLLER_MIN_INTERVAL_MINUTES * 60
+        max_interval = settings.POLLER_MAX_INTERVAL_HOURS * 3600
+
+        published = [
+            row.published_at for row in db.query(Video.published_at).filter(
+                Video.channel_id == channel.id,
+                Video.published_at.isnot(None)
+            ).order_by(Video.published_at.desc()).limit(_HISTORY_SIZE).all()
+        ]
+        if len(published) < 2:
+            interval = settings.POLLER_DEFAULT_INTERVAL_HOURS * 3600
+        else:
+            newest = published[0].replace(tzinfo=None)
+            oldest = published[-1].replace(tzinfo=None)
+            mean_gap = (newest - oldest).total_seconds() / (len(published) - 1)
+            since_last = (datetime.utcnow() - newest).total_seconds()
+            interval = max(mean_gap, since_last) / 2 if since_last > mean_gap * 2 else mean_gap / 2
+
+        interval = min(max(interval, min_interval), max_interval)
+        jitter = settings.POLLER_JITTER_RATIO
+        return interval * random.uniform(1 - jitter, 1 + jitter)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "in_flight": len(self._in_flight),
+                "polls": self._polls,
+                "failures": self._failures,
+            }
+
+    @staticmethod
+    def collect_lag_metrics(db: Session, limit: int = 100) -> Dict[str, Any]:
+        """
+        채널별 확인 지연 지표를 반환합니다. 현재 밀려 있는 채널을 지연이 큰 순서로 보여줍니다.
+        """
+        now = datetime.utcnow()
+        overdue_query = db.query(Channel).filter(
+            Channel.next_check_at.isnot(None),
+            Channel.next_check_at < now
+        )
+        overdue_count = overdue_query.count()
+        overdue = overdue_query.order_by(Channel.next_check_at.asc()).limit(limit).all()
+        total = db.query(Channel).count()
+        never_polled = db.query(Channel).filter(Channel.last_polled_at.is_(None)).count()
+
+        channels: List[Dict[str, Any]] = [
+            {
+                "channel_id": channel.channel_id,
+                "current_lag_seconds": (now - channel.next_check_at.replace(tzinfo=None)).total_seconds(),
+                "last_poll_lag_seconds": channel.last_poll_lag_seconds,
+                "poll_interval_seconds": channel.poll_interval_seconds,
+                "last_polled_at": channel.last_polled_at.isoformat() if channel.last_polled_at else None,
+            }
+            for channel in overdue
+        ]
+        return {
+            "total_channels": total,
+            "never_polled": never_polled,
+            "overdue_channels": overdue_count,
+            "max_lag_seconds": channels[0]["current_lag_seconds"] if channels else 0.0,
+            "channels": channels,
+        }
@@ -1,40 +1,130 @@
+from typing import Dict, List, Optional, Set
 from sqlalchemy.orm import Session
 from app.models.models import Video
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from app.services.near_duplicate_index import (
+    NearDuplicateIndex, near_duplicate_index, transcript_index, shingles, jaccard,
+    minhash_signature, signature_to_bytes, signature_from_bytes, estimate_similarity
+)
+import logging
 import numpy as np
 
+logger = logging.getLogger(__name__)
+
+# MinHash 추정 유사도가 이 값만큼 임계값보다 낮아도 정확한 유사도를 계산 (64개 해시의 추정 오차 고려)
+_ESTIMATE_MARGIN = 0.2
+
 class DuplicateChecker:
-    def __init__(self, similarity_threshold=0.8):
+    def __init__(
+        self,
+        similarity_threshold=0.8,
+        index: NearDuplicateIndex = near_duplicate_index,
+        transcript_index: NearDuplicateIndex = transcript_index
+    ):
         self.similarity_threshold = similarity_threshold
-        self.vectorizer = TfidfVectorizer(stop_words='english')
-    
+        self.index = index
+        self.transcript_index = transcript_index
+
     def is_duplicate(self, video: Video, db: Session) -> bool:
-        # 최근 100개의 비디오와 비교
-        recent_videos = db.query(Video).filter(
-            Video.id != video.id,
-            Video.is_duplicate == False
-        ).order_by(Video.created_at.desc()).limit(100).all()
-        
-        if not recent_videos:
-            return False
-        
-        # 텍스트 데이터 준비
-        texts = [video.description] + [v.description for v in recent_videos]
-        
-        # TF-IDF 벡터화
+        return self.check_batch([video], db)[0]
+
+    def check_batch(self, videos: List[Video], db: Session) -> List[bool]:
+        """
+        여러 비디오의 중복 여부를 한 번에 확인합니다.
+        LSH 인덱스 후보와 배치 안의 앞선 비디오를 서명 행렬로 비교하고, 추정 유사도가 높은 쌍만 정확히 다시 계산합니다.
+        확인한 비디오는 인덱스에 추가되므로 video.id가 있어야 합니다(flush 이후 호출).
+        """
+        results = [False] * len(videos)
         try:
-            tfidf_matrix = self.vectorizer.fit_transform(texts)
-            
-            # 코사인 유사도 계산
-            similarities = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:])
-            
-            # 가장 높은 유사도 찾기
-            max_similarity = np.max(similarities)
-            video.similarity_score = float(max_similarity)
-            
-            return max_similarity > self.similarity_threshold
-            
+            shingle_sets = [shingles(video.description) for video in videos]
+            signatures = [minhash_signature(shingle_set) for shingle_set in shingle_sets]
+            valid = [i for i, signature in enumerate(signatures) if signature is not None]
+            for video in videos:
+                video.similarity_score = 0.0
+            if not valid:
+                return results
+
+            batch_ids = {videos[i].id for i in valid}
+            batch_matrix = np.vstack([signatures[i] for i in valid])
+            prefilter = self.similarity_threshold - _ESTIMATE_MARGIN
+
+            # 인덱스 후보 전체를 한 번에 조회하고 배치 전체와의 추정 유사도 행렬 계산
+            candidate_map = self.index.candidates_many(db, {videos[i].id: signatures[i] for i in valid})
+            candidate_ids = set().union(*candidate_map.values()) - batch_ids if candidate_map else set()
+            references = db.query(Video.id, Video.description, Video.minhash).filter(
+                Video.id.in_(candidate_ids),
+                Video.is_duplicate == False,
+                Video.minhash.isnot(None)
+            ).all() if candidate_ids else []
+            reference_shingles: Dict[int, Set[str]] = {}
+            if references:
+                reference_matrix = np.vstack([signature_from_bytes(r.minhash) for r in references])
+                estimates = (batch_matrix[:, None, :] == reference_matrix[None, :, :]).mean(axis=2)
+                for row, col in zip(*np.nonzero(estimates >= prefilter)):
+                    i = valid[row]
+                    reference = references[col]
+                    if reference.id not in candidate_map.get(videos[i].id, ()):
+                        continue
+                    if reference.id not in reference_shingles:
+                        reference_shingles[reference.id] = shingles(reference.description)
+                    similarity = jaccard(shingle_sets[i], reference_shingles[reference.id])
+                    videos[i].similarity_score = max(videos[i].similarity_score, similarity)
+
+            # 배치 안에서는 앞선(중복이 아닌) 비디오와 비교
+            batch_estimates = (batch_matrix[:, None, :] == batch_matrix[None, :, :]).mean(axis=2)
+            for row, i in enumerate(valid):
+                if videos[i].similarity_score <= self.similarity_threshold:
+                    for col in np.nonzero(batch_estimates[row, :row] >= prefilter)[0]:
+                        j = valid[col]
+                        if results[j]:
+                            continue
+                        similarity = jaccard(shingle_sets[i], shingle_sets[j])
+                        videos[i].similarity_score = max(videos[i].similarity_score, similarity)
+                        if similarity > self.similarity_threshold:
+                            break
+                results[i] = videos[i].similarity_score > self.similarity_threshold
+
+            # 결과와 서명은 ORM 객체에 기록되어 다음 flush에서 한 번에 반영되고, 인덱스 행도 한 번에 추가
+            self.index.add_many(db, {videos[i].id: signatures[i] for i in valid})
+            for i in valid:
+                videos[i].minhash = signature_to_bytes(signatures[i])
+                videos[i].is_duplicate = results[i]
+            return results
+
         except Exception as e:
-            print(f"Error in duplicate checking: {str(e)}")
-            return False 
\ No newline at end of file
+            logger.error(f"중복 체크 중 오류: {str(e)}")
+            return [False] * len(videos)
+
+    def check_transcript(self, video: Video, transcript_text: str, db: Session) -> Optional[int]:
+        """
+        자막 지문(MinHash)으로 재업로드를 찾습니다. 자막이 있으면 설명 기반 결과 대신 이 결과를 사용합니다.
+        후보는 저장된 지문끼리만 비교하므로 다른 비디오의 자막을 다시 처리하지 않습니다.
+        원본 비디오 ID를 반환하고, 중복이 아니면 None을 반환합니다.
+        """
+        signature = minhash_signature(shingles(transcript_text))
+        if signature is None:
+            return None
+        video.transcript_minhash = signature_to_bytes(signature)
+
+        best_id, best_similarity = None, 0.0
+        candidate_ids = self.transcript_index.candidates(db, signature, exclude_id=video.id)
+        if candidate_ids:
+            # 원본(다른 비디오의 중복이 아닌 비디오)과만 비교
+            candidates = db.query(Video.id, Video.transcript_minhash).filter(
+                Video.id.in_(candidate_ids),
+                Video.duplicate_of_id.is_(None),
+                Video.transcript_minhash.isnot(None)
+            ).all()
+            for candidate in candidates:
+                similarity = estimate_similarity(signature, signature_from_bytes(candidate.transcript_minhash))
+                if similarity > best_similarity:
+                    best_id, best_similarity = candidate.id, similarity
+
+        self.transcript_index.add(db, video.id, signature)
+        video.similarity_score = best_similarity
+        if best_similarity > self.similarity_threshold:
+            video.is_duplicate = True
+            video.duplicate_of_id = best_id
+            return best_id
+        video.is_duplicate = False
+        video.duplicate_of_id = None
+        return None
@@ -0,0 +1,87 @@
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, Optional, Tuple
+import threading
+
+# 스레드별로 커밋 전까지 보류 중인 ETag
+_pending = threading.local()
+
+
+class EtagCache:
+    """
+    YouTube Data API 리소스별 ETag와 마지막 응답을 보관하는 프로세스 내 캐시.
+    조건부 요청(If-None-Match)이 304를 반환하면 저장된 응답을 그대로 사용합니다.
+    채널별 적중/미적중 통계도 함께 기록합니다.
+    deferred() 안에서 저장한 ETag는 블록이 오류 없이 끝날 때만 반영됩니다.
+    """
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[str, Dict[str, Any]]]" = OrderedDict()
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, resource_key: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """저장된 (ETag, 응답)을 반환합니다."""
+        with self._lock:
+            entry = self._entries.get(resource_key)
+            if entry is not None:
+                self._entries.move_to_end(resource_key)
+            return entry
+
+    def put(self, resource_key: str, etag: str, response: Dict[str, Any]) -> None:
+        staged = getattr(_pending, "entries", None)
+        if staged is not None:
+            staged[resource_key] = (etag, response)
+            return
+        self._put(resource_key, etag, response)
+
+    @contextmanager
+    def deferred(self) -> Iterator[None]:
+        """
+        이 스레드에서 저장하는 ETag를 블록이 끝날 때까지 보류합니다. 블록 안에서 오류가 나면 버립니다.
+        응답을 처리한 결과(DB 커밋)가 실패했는데 ETag만 남으면 다음 확인에서 304를 받아 변경 내용을 놓치기 때문입니다.
+        """
+        outer = getattr(_pending, "entries", None)
+        staged: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+        _pending.entries = staged
+        try:
+            yield
+        finally:
+            _pending.entries = outer
+        for resource_key, (etag, response) in staged.items():
+            self.put(resource_key, etag, response)
+
+    def _put(self, resource_key: str, etag: str, response: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[resource_key] = (etag, response)
+            self._entries.move_to_end(resource_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def record(self, channel_id: Optional[str], hit: bool) -> None:
+        """채널별 조건부 요청 결과(304 적중 여부)를 기록합니다."""
+        key = channel_id or "_unknown"
+        with self._lock:
+            stats = self._stats.setdefault(key, {"hits": 0, "misses": 0})
+            stats["hits" if hit else "misses"] += 1
+
+    def get_stats(self, channel_id: Optional[str] = None) -> Dict[str, Any]:
+        """채널별 적중/미적중 횟수와 적중률을 반환합니다."""
+        with self._lock:
+            items = (
+                {channel_id: self._stats.get(channel_id, {"hits": 0, "misses": 0})}
+                if channel_id else dict(self._stats)
+            )
+            return {
+                key: {
+                    "hits": value["hits"],
+                    "misses": value["misses"],
+                    "hit_rate": value["hits"] / (value["hits"] + value["misses"])
+                    if value["hits"] + value["misses"] else 0.0
+                }
+                for key, value in items.items()
+            }
+
+
+# 모든 YouTubeService 인스턴스가 공유하는 캐시
+etag_cache = EtagCache()
@@ -0,0 +1,123 @@
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, Optional
+from app.db.database import SessionLocal
+from app.db.models import SummaryHistory
+import csv
+import io
+import json
+import logging
+import zlib
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ("ndjson", "csv")
+# 한 번에 DB에서 가져올 행 수와 내보낼 청크 크기
+FETCH_SIZE = 1000
+CHUNK_BYTES = 64 * 1024
+
+EXPORT_FIELDS = [
+    "id", "summary_type", "created_at", "model_used", "quality_score",
+    "summary_text", "key_phrases", "source_info", "preview", "user_id", "tokens_used",
+]
+
+
+class HistoryExportService:
+    """
+    요약 히스토리를 NDJSON 또는 CSV로 스트리밍합니다.
+    ORM 객체 대신 필요한 컬럼만 FETCH_SIZE개씩 서버 측 커서로 읽어 바로 내보내므로
+    내보내는 행 수와 관계없이 메모리 사용량이 일정합니다.
+    """
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+
+    def iter_rows(
+        self,
+        summary_type: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        model: Optional[str] = None,
+        include_original: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        """조건에 맞는 히스토리를 id 순서로 한 행씩 반환합니다. 스트리밍 동안 자체 세션을 사용합니다."""
+        columns = [getattr(SummaryHistory, field) for field in EXPORT_FIELDS]
+        if include_original:
+            # 압축 저장된 원문도 SQL에서 풀어서 함께 읽음 (행마다 추가 조회 없음)
+            columns.append(SummaryHistory.original_text.label("original_text"))
+
+        db = self.session_factory()
+        try:
+            query = db.query(*columns)
+            if summary_type:
+                query = query.filter(SummaryHistory.summary_type == summary_type)
+            if start_date:
+                query = query.filter(SummaryHistory.created_at >= start_date)
+            if end_date:
+                query = query.filter(SummaryHistory.created_at <= end_date)
+            if model:
+                query = query.filter(SummaryHistory.model_used == model)
+
+            for row in query.order_by(SummaryHistory.id.asc()).yield_per(FETCH_SIZE):
+                item = row._asdict()
+                if item["created_at"] is not None:
+                    item["created_at"] = item["created_at"].isoformat()
+                yield item
+        finally:
+            db.close()
+
+    def iter_ndjson(self, rows: Iterable[Dict[str, Any]]) -> Iterator[bytes]:
+        buffer = io.StringIO()
+        for row in rows:
+            buffer.write(json.dumps(row, ensure_ascii=False, default=str))
+            buffer.write("\n")
+            if buffer.tell() >= CHUNK_BYTES:
+                yield buffer.getvalue().encode("utf-8")
+                buffer.seek(0)
+                buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode("utf-8")
+
+    def iter_csv(self, rows: Iterable[Dict[str, Any]], include_original: bool = False) -> Iterator[bytes]:
+        fields = EXPORT_FIELDS + (["original_text"] if include_original else [])
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=fields)
+        writer.writeheader()
+        for row in rows:
+            if row.get("source_info") is not None:
+                row["source_info"] = json.dumps(row["source_info"], ensure_ascii=False)
+            writer.writerow(row)
+            if buffer.tell() >= CHUNK_BYTES:
+                yield buffer.getvalue().encode("utf-8")
+                buffer.seek(0)
+                buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode("utf-8")
+
+    @staticmethod
+    def gzip_stream(chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """청크 스트림을 gzip 형식으로 압축합니다."""
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        for chunk in chunks:
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.flush()
+
+    def export(
+        self,
+        format: str = "ndjson",
+        gzip: bool = False,
+        summary_type: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        model: Optional[str] = None,
+        include_original: bool = False
+    ) -> Iterator[bytes]:
+        """조건에 맞는 히스토리를 지정한 형식의 바이트 청크로 반환합니다."""
+        if format not in EXPORT_FORMATS:
+            raise ValueError(f"지원하지 않는 내보내기 형식: {format}")
+        rows = self.iter_rows(summary_type, start_date, end_date, model, include_original)
+        if format == "csv":
+            chunks = self.iter_csv(rows, include_original)
+        else:
+            chunks = self.iter_ndjson(rows)
+        return self.gzip_stream(chunks) if gzip else chunks
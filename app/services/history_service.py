@@ -1,5 +1,9 @@
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 from app.db.models import SummaryHistory
+from app.db.text_blobs import set_original_text
+from app.db.usage_rollups import record_usage
+from app.db.fts import FTS_TABLE, BLOB_FTS_TABLE, FTS_COLUMNS, BM25_WEIGHTS, build_match_query, get_tokenizer
 import json
 import logging
 import hashlib
@@ -11,26 +15,75 @@ class HistoryService:
     def __init__(self, db: Session = None):
         self.db = db
     
-    def _generate_content_hash(self, content: str) -> str:
+    @staticmethod
+    def _generate_content_hash(content: str) -> str:
         """컨텐츠의 해시값을 생성하여 중복 확인에 사용합니다."""
-        return hashlib.md5(content.encode('utf-8')).hexdigest()
+        return hashlib.sha256(content.strip().encode('utf-8')).hexdigest()
     
-    def find_duplicate_text_summary(self, text: str) -> Optional[SummaryHistory]:
-        """동일한 텍스트에 대한 기존 요약이 있는지 확인합니다."""
-        if not self.db:
+    @staticmethod
+    def _extract_video_id(video_url: str) -> Optional[str]:
+        """유튜브 URL에서 비디오 ID를 추출합니다. (v= 파라미터 또는 youtu.be 주소)"""
+        if not video_url:
             return None
-            
+        if "v=" in video_url:
+            return video_url.split("v=")[1].split("&")[0]
+        if "youtu.be/" in video_url:
+            return video_url.split("youtu.be/")[1].split("?")[0]
+        return None
+    
+    @staticmethod
+    def _generate_params_hash(model_used: Optional[str], params: Optional[Dict[str, Any]] = None) -> str:
+        """요약 결과에 영향을 주는 파라미터(모델, 언어, 스타일 등)의 해시값"""
+        payload = {"model": model_used}
+        if params:
+            payload.update({key: value for key, value in params.items() if value is not None})
+        return hashlib.sha256(
+            json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str).encode('utf-8')
+        ).hexdigest()
+    
+    @classmethod
+    def build_dedup_keys(
+        cls,
+        summary_type: str,
+        original_text: Optional[str],
+        source_info: Optional[Dict[str, Any]],
+        model_used: Optional[str],
+        params: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Optional[str]]:
+        """중복 확인용 content_hash, source_key, params_hash 값을 만듭니다."""
+        source_info = source_info or {}
+        source_key = None
+        if summary_type == "youtube":
+            video_id = source_info.get("video_id") or cls._extract_video_id(source_info.get("video_url"))
+            source_key = f"youtube:{video_id}" if video_id else None
+        elif summary_type == "document" and source_info.get("file_name"):
+            source_key = f"document:{source_info['file_name']}"
+        
+        return {
+            "content_hash": cls._generate_content_hash(original_text) if original_text else None,
+            "source_key": source_key,
+            "params_hash": cls._generate_params_hash(model_used, params)
+        }
+    
+    def _find_by_key(self, summary_type: str, column, value: Optional[str],
+                     params_hash: Optional[str] = None) -> Optional[SummaryHistory]:
+        """(요약 유형, 해시/소스 키, 파라미터 해시) 인덱스로 기존 요약을 찾습니다."""
+        if not self.db or not value:
+            return None
+        query = self.db.query(SummaryHistory).filter(
+            SummaryHistory.summary_type == summary_type,
+            column == value
+        )
+        if params_hash:
+            query = query.filter(SummaryHistory.params_hash == params_hash)
+        return query.order_by(SummaryHistory.created_at.desc()).first()
+    
+    def find_duplicate_text_summary(self, text: str, params_hash: Optional[str] = None) -> Optional[SummaryHistory]:
+        """동일한 텍스트에 대한 기존 요약이 있는지 확인합니다."""
         try:
-            content_hash = self._generate_content_hash(text)
-            # 원본 텍스트의 처음 100자를 기준으로 검색
-            text_prefix = text[:100] if len(text) > 100 else text
-            
-            # 동일한 텍스트의 요약 검색
-            existing_summary = self.db.query(SummaryHistory).filter(
-                SummaryHistory.summary_type == "text",
-                SummaryHistory.original_text.like(f"{text_prefix}%")
-            ).order_by(SummaryHistory.created_at.desc()).first()
-            
+            existing_summary = self._find_by_key(
+                "text", SummaryHistory.content_hash, self._generate_content_hash(text), params_hash
+            )
             if existing_summary:
                 logger.info(f"기존 텍스트 요약을 찾았습니다. ID: {existing_summary.id}")
             return existing_summary
@@ -38,28 +91,16 @@ class HistoryService:
             logger.error(f"텍스트 요약 중복 확인 중 오류 발생: {str(e)}")
             return None
     
-    def find_duplicate_youtube_summary(self, video_url: str) -> Optional[SummaryHistory]:
-        """동일한 유튜브 URL에 대한 기존 요약이 있는지 확인합니다."""
-        if not self.db:
-            return None
-            
+    def find_duplicate_youtube_summary(self, video_url: str, params_hash: Optional[str] = None) -> Optional[SummaryHistory]:
+        """동일한 유튜브 영상에 대한 기존 요약이 있는지 확인합니다."""
         try:
-            # 유튜브 ID 추출 (URL에서 v= 파라미터 값)
-            video_id = None
-            if "v=" in video_url:
-                video_id = video_url.split("v=")[1].split("&")[0]
-            elif "youtu.be/" in video_url:
-                video_id = video_url.split("youtu.be/")[1].split("?")[0]
-            
+            video_id = self._extract_video_id(video_url)
             if not video_id:
                 return None
             
-            # 동일한 유튜브 영상의 요약 검색
-            existing_summary = self.db.query(SummaryHistory).filter(
-                SummaryHistory.summary_type == "youtube",
-                SummaryHistory.source_info.contains(video_id)
-            ).order_by(SummaryHistory.created_at.desc()).first()
-            
+            existing_summary = self._find_by_key(
+                "youtube", SummaryHistory.source_key, f"youtube:{video_id}", params_hash
+            )
             if existing_summary:
                 logger.info(f"기존 유튜브 요약을 찾았습니다. ID: {existing_summary.id}")
             return existing_summary
@@ -67,20 +108,13 @@ class HistoryService:
             logger.error(f"유튜브 요약 중복 확인 중 오류 발생: {str(e)}")
             return None
     
-    def find_duplicate_document_summary(self, file_name: str, file_content: str) -> Optional[SummaryHistory]:
-        """동일한 문서에 대한 기존 요약이 있는지 확인합니다."""
-        if not self.db:
-            return None
-            
+    def find_duplicate_document_summary(self, file_name: str, file_content: str,
+                                        params_hash: Optional[str] = None) -> Optional[SummaryHistory]:
+        """동일한 내용의 문서에 대한 기존 요약이 있는지 확인합니다. (파일명이 달라도 내용이 같으면 중복)"""
         try:
-            content_hash = self._generate_content_hash(file_content)
-            
-            # 동일한 파일명과 비슷한 내용의 문서 요약 검색
-            existing_summary = self.db.query(SummaryHistory).filter(
-                SummaryHistory.summary_type == "document",
-                SummaryHistory.source_info.contains(file_name)
-            ).order_by(SummaryHistory.created_at.desc()).first()
-            
+            existing_summary = self._find_by_key(
+                "document", SummaryHistory.content_hash, self._generate_content_hash(file_content), params_hash
+            )
             if existing_summary:
                 logger.info(f"기존 문서 요약을 찾았습니다. ID: {existing_summary.id}")
             return existing_summary
@@ -88,39 +122,106 @@ class HistoryService:
             logger.error(f"문서 요약 중복 확인 중 오류 발생: {str(e)}")
             return None
     
+    @staticmethod
+    def youtube_source_info(video_result: Dict[str, Any], language: str) -> Dict[str, Any]:
+        """저장된 요약으로 같은 응답을 다시 만들 수 있도록 히스토리에 함께 저장할 정보"""
+        return {
+            "video_id": video_result.get("video_id"),
+            "language": language,
+            "publish_date": video_result.get("publish_date"),
+            "views": video_result.get("views", 0),
+            "likes": video_result.get("likes", 0),
+            "evaluation": video_result.get("evaluation")
+        }
+    
+    @staticmethod
+    def youtube_result_from_history(item: SummaryHistory) -> Dict[str, Any]:
+        """저장된 유튜브 요약을 /summarize/youtube 응답 형식으로 변환합니다."""
+        source_info = item.source_info or {}
+        return {
+            "video_id": source_info.get("video_id"),
+            "title": source_info.get("video_title", ""),
+            "channel": source_info.get("channel_name", ""),
+            "publish_date": source_info.get("publish_date", ""),
+            "views": source_info.get("views", 0),
+            "likes": source_info.get("likes", 0),
+            "transcript": item.original_text or "",
+            "summary": item.summary_text,
+            "keywords": json.loads(item.key_phrases) if item.key_phrases else [],
+            "evaluation": source_info.get("evaluation"),
+            "cached": True
+        }
+    
+    def find_cached_youtube_summary(self, video_id: str, language: str, model: str) -> Optional[SummaryHistory]:
+        """같은 비디오, 언어, 모델로 만든 유튜브 요약(미리 생성된 요약 포함)을 찾습니다."""
+        try:
+            item = self._find_by_key(
+                "youtube", SummaryHistory.source_key, f"youtube:{video_id}" if video_id else None,
+                self._generate_params_hash(model, {"language": language})
+            )
+            if item:
+                logger.info(f"저장된 유튜브 요약을 사용합니다. ID: {item.id}")
+            return item
+        except Exception as e:
+            logger.error(f"저장된 유튜브 요약 조회 중 오류 발생: {str(e)}")
+            return None
+    
+    def _record_duplicate_usage(self, summary_type: str, model_used: Optional[str], user_id: Optional[int],
+                                tokens_used: Optional[int], commit: bool) -> None:
+        """중복이라 저장하지 않은 요약도 요약은 실행했으므로 사용량에 셉니다."""
+        record_usage(self.db, summary_type, model_used, user_id, tokens_used)
+        if commit:
+            self.db.commit()
+    
     def save_text_summary(
         self,
         original_text: str,
         summary_text: str,
         key_phrases: list = None,
         model_used: str = None,
-        quality_score: int = None
+        quality_score: int = None,
+        params: Dict[str, Any] = None,
+        user_id: int = None,
+        tokens_used: int = None,
+        commit: bool = True
     ) -> SummaryHistory:
         """텍스트 요약 결과를 히스토리에 저장합니다."""
         try:
+            keys = self.build_dedup_keys("text", original_text, None, model_used, params)
+            
             # 중복 확인
-            duplicate = self.find_duplicate_text_summary(original_text)
+            duplicate = self.find_duplicate_text_summary(original_text, keys["params_hash"])
             if duplicate:
                 logger.info(f"중복된 텍스트 요약이 발견되어 기존 요약을 반환합니다. ID: {duplicate.id}")
+                self._record_duplicate_usage("text", model_used, user_id, tokens_used, commit)
                 return duplicate
                 
             history_item = SummaryHistory(
                 summary_type="text",
-                original_text=original_text,
                 summary_text=summary_text,
                 key_phrases=json.dumps(key_phrases) if key_phrases else None,
                 model_used=model_used,
                 quality_score=quality_score,
+                user_id=user_id,
+                tokens_used=tokens_used,
+                **keys
             )
+            set_original_text(self.db, history_item, original_text)
             
             self.db.add(history_item)
-            self.db.commit()
-            self.db.refresh(history_item)
+            if commit:
+                self.db.commit()
+                self.db.refresh(history_item)
+            else:
+                # 여러 건을 묶어 커밋할 때는 같은 배치의 다음 중복 확인에서 보이도록 flush만 함
+                self.db.flush()
             
             logger.info(f"텍스트 요약 히스토리가 저장되었습니다. ID: {history_item.id}")
             return history_item
         except Exception as e:
             logger.error(f"텍스트 요약 히스토리 저장 중 오류 발생: {str(e)}")
+            if not commit:
+                raise
             self.db.rollback()
             return None
     
@@ -133,40 +234,58 @@ class HistoryService:
         summary_text: str,
         key_phrases: list = None,
         model_used: str = None,
-        quality_score: int = None
+        quality_score: int = None,
+        extra_info: Dict[str, Any] = None,
+        user_id: int = None,
+        tokens_used: int = None,
+        commit: bool = True
     ) -> SummaryHistory:
         """유튜브 동영상 요약 결과를 히스토리에 저장합니다."""
         try:
-            # 중복 확인
-            duplicate = self.find_duplicate_youtube_summary(video_url)
-            if duplicate:
-                logger.info(f"중복된 유튜브 요약이 발견되어 기존 요약을 반환합니다. ID: {duplicate.id}")
-                return duplicate
-                
             metadata = {
                 "video_url": video_url,
                 "video_title": video_title,
                 "channel_name": channel_name
             }
+            if extra_info:
+                metadata.update(extra_info)
+            params = {"language": metadata.get("language")}
+            keys = self.build_dedup_keys("youtube", original_transcript, metadata, model_used, params)
+            
+            # 중복 확인
+            duplicate = self.find_duplicate_youtube_summary(video_url, keys["params_hash"])
+            if duplicate:
+                logger.info(f"중복된 유튜브 요약이 발견되어 기존 요약을 반환합니다. ID: {duplicate.id}")
+                self._record_duplicate_usage("youtube", model_used, user_id, tokens_used, commit)
+                return duplicate
             
             history_item = SummaryHistory(
                 summary_type="youtube",
-                original_text=original_transcript,
                 summary_text=summary_text,
                 key_phrases=json.dumps(key_phrases) if key_phrases else None,
                 source_info=metadata,
                 model_used=model_used,
                 quality_score=quality_score,
+                user_id=user_id,
+                tokens_used=tokens_used,
+                **keys
             )
+            set_original_text(self.db, history_item, original_transcript)
             
             self.db.add(history_item)
-            self.db.commit()
-            self.db.refresh(history_item)
+            if commit:
+                self.db.commit()
+                self.db.refresh(history_item)
+            else:
+                # 여러 건을 묶어 커밋할 때는 같은 배치의 다음 중복 확인에서 보이도록 flush만 함
+                self.db.flush()
             
             logger.info(f"유튜브 요약 히스토리가 저장되었습니다. ID: {history_item.id}")
             return history_item
         except Exception as e:
             logger.error(f"유튜브 요약 히스토리 저장 중 오류 발생: {str(e)}")
+            if not commit:
+                raise
             self.db.rollback()
             return None
     
@@ -178,39 +297,54 @@ class HistoryService:
         summary_text: str,
         key_phrases: list = None,
         model_used: str = None,
-        quality_score: int = None
+        quality_score: int = None,
+        params: Dict[str, Any] = None,
+        user_id: int = None,
+        tokens_used: int = None,
+        commit: bool = True
     ) -> SummaryHistory:
         """문서 요약 결과를 히스토리에 저장합니다."""
         try:
-            # 중복 확인
-            duplicate = self.find_duplicate_document_summary(file_name, original_text)
-            if duplicate:
-                logger.info(f"중복된 문서 요약이 발견되어 기존 요약을 반환합니다. ID: {duplicate.id}")
-                return duplicate
-                
             metadata = {
                 "file_name": file_name,
                 "file_type": file_type
             }
+            keys = self.build_dedup_keys("document", original_text, metadata, model_used, params)
+            
+            # 중복 확인
+            duplicate = self.find_duplicate_document_summary(file_name, original_text, keys["params_hash"])
+            if duplicate:
+                logger.info(f"중복된 문서 요약이 발견되어 기존 요약을 반환합니다. ID: {duplicate.id}")
+                self._record_duplicate_usage("document", model_used, user_id, tokens_used, commit)
+                return duplicate
             
             history_item = SummaryHistory(
                 summary_type="document",
-                original_text=original_text,
                 summary_text=summary_text,
                 key_phrases=json.dumps(key_phrases) if key_phrases else None,
                 source_info=metadata,
                 model_used=model_used,
                 quality_score=quality_score,
+                user_id=user_id,
+                tokens_used=tokens_used,
+                **keys
             )
+            set_original_text(self.db, history_item, original_text)
             
             self.db.add(history_item)
-            self.db.commit()
-            self.db.refresh(history_item)
+            if commit:
+                self.db.commit()
+                self.db.refresh(history_item)
+            else:
+                # 여러 건을 묶어 커밋할 때는 같은 배치의 다음 중복 확인에서 보이도록 flush만 함
+                self.db.flush()
             
             logger.info(f"문서 요약 히스토리가 저장되었습니다. ID: {history_item.id}")
             return history_item
         except Exception as e:
             logger.error(f"문서 요약 히스토리 저장 중 오류 발생: {str(e)}")
+            if not commit:
+                raise
             self.db.rollback()
             return None
     
@@ -229,14 +363,22 @@ class HistoryService:
             return []
             
     def search_history(self, query: str, summary_type: Optional[str] = None, limit: int = 10) -> List[Dict]:
-        """히스토리에서 검색합니다."""
+        """
+        히스토리에서 검색합니다. 전문 검색 인덱스가 있으면 BM25 순위와 강조된 발췌문을 함께 반환합니다.
+        """
         try:
+            if query:
+                get_tokenizer(self.db.get_bind())
+            match_query = build_match_query(query) if query else None
+            if match_query:
+                return self._search_fts(match_query, summary_type, limit)
+            
             db_query = self.db.query(SummaryHistory)
             
             if summary_type:
                 db_query = db_query.filter(SummaryHistory.summary_type == summary_type)
                 
-            # 검색어로 필터링
+            # 검색어로 필터링 (전문 검색을 사용할 수 없는 짧은 검색어 등)
             if query:
                 search_term = f"%{query}%"
                 db_query = db_query.filter(
@@ -248,4 +390,57 @@ class HistoryService:
             return [item.to_dict() for item in items]
         except Exception as e:
             logger.error(f"히스토리 검색 중 오류 발생: {str(e)}")
-            return [] 
\ No newline at end of file
+            return []
+    
+    def _search_fts(self, match_query: str, summary_type: Optional[str], limit: int) -> List[Dict]:
+        type_filter = "AND h.summary_type = :summary_type" if summary_type else ""
+        params = {"match_query": match_query, "summary_type": summary_type, "limit": limit}
+        rows = self.db.execute(text(f"""
+            SELECT h.id AS id,
+                   bm25({FTS_TABLE}, {", ".join(str(w) for w in BM25_WEIGHTS)}) AS rank,
+                   snippet({FTS_TABLE}, 1, '<mark>', '</mark>', '…', 16) AS summary_snippet,
+                   snippet({FTS_TABLE}, 2, '<mark>', '</mark>', '…', 16) AS original_snippet
+            FROM {FTS_TABLE}
+            JOIN summary_history h ON h.id = {FTS_TABLE}.rowid
+            WHERE {FTS_TABLE} MATCH :match_query {type_filter}
+            ORDER BY rank
+            LIMIT :limit
+        """), params).fetchall()
+        hits = {row.id: row._asdict() for row in rows}
+
+        # 압축 저장된 원문에서 찾은 항목 (원문 컬럼 가중치 적용, 발췌문은 만들 수 없음)
+        blob_rows = self.db.execute(text(f"""
+            SELECT h.id AS id,
+                   bm25({BLOB_FTS_TABLE}) * {BM25_WEIGHTS[FTS_COLUMNS.index("original_text")]} AS rank,
+                   NULL AS summary_snippet, NULL AS original_snippet
+            FROM {BLOB_FTS_TABLE}
+            JOIN text_blobs b ON b.fts_id = {BLOB_FTS_TABLE}.rowid
+            JOIN summary_history h ON h.original_blob_hash = b.hash
+            WHERE {BLOB_FTS_TABLE} MATCH :match_query {type_filter}
+            ORDER BY rank
+            LIMIT :limit
+        """), params).fetchall()
+        for row in blob_rows:
+            hit = hits.setdefault(row.id, row._asdict())
+            hit["rank"] = min(hit["rank"], row.rank)
+        rows = sorted(hits.values(), key=lambda hit: hit["rank"])[:limit]
+        if not rows:
+            return []
+        
+        items = {
+            item.id: item for item in self.db.query(SummaryHistory).filter(
+                SummaryHistory.id.in_([hit["id"] for hit in rows])
+            ).all()
+        }
+        results = []
+        for hit in rows:
+            item = items.get(hit["id"])
+            if item is None:
+                continue
+            result = item.to_dict()
+            # bm25는 관련도가 높을수록 작은(음수) 값
+            result["score"] = -hit["rank"]
+            result["summary_snippet"] = hit["summary_snippet"]
+            result["original_snippet"] = hit["original_snippet"]
+            results.append(result)
+        return results
\ No newline at end of file
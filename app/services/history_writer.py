@@ -0,0 +1,171 @@
+from typing import Any, Dict, List, Optional, Tuple
+from fastapi.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.services.history_service import HistoryService
+import logging
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# 대기열에 넣을 수 있는 HistoryService 저장 메서드
+_SAVE_METHODS = ("save_text_summary", "save_youtube_summary", "save_document_summary")
+_STOP = object()
+
+
+class HistoryWriter:
+    """
+    요약 히스토리를 요청 안에서 바로 커밋하지 않고 대기열에 모아 백그라운드 스레드에서 한 번에 커밋합니다.
+    첫 항목이 들어온 뒤 interval_ms가 지나거나 batch_size개가 모이면 한 트랜잭션으로 저장하므로
+    동시 요청이 많을 때 커밋(fsync) 횟수가 크게 줄고 요청은 디스크 쓰기를 기다리지 않습니다.
+    대기열이 가득 차면 호출한 쪽이 기다리고(backpressure), 그래도 자리가 나지 않으면 바로 저장합니다.
+    async 엔드포인트는 save_* (submit_async)를 await 하여 기다림과 직접 저장을 스레드 풀에서 처리하므로
+    이벤트 루프는 막히지 않고 해당 요청만 기다립니다.
+    """
+    def __init__(
+        self,
+        batch_size: Optional[int] = None,
+        interval_ms: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        session_factory=SessionLocal
+    ):
+        self.batch_size = batch_size or settings.HISTORY_WRITE_BATCH_SIZE
+        self.interval = (interval_ms or settings.HISTORY_WRITE_INTERVAL_MS) / 1000.0
+        self.session_factory = session_factory
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size or settings.HISTORY_WRITE_QUEUE_SIZE)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._stats = {"written": 0, "batches": 0, "failed": 0, "direct": 0}
+
+    async def save_text_summary(self, **kwargs) -> None:
+        await self.submit_async("save_text_summary", **kwargs)
+
+    async def save_youtube_summary(self, **kwargs) -> None:
+        await self.submit_async("save_youtube_summary", **kwargs)
+
+    async def save_document_summary(self, **kwargs) -> None:
+        await self.submit_async("save_document_summary", **kwargs)
+
+    async def submit_async(self, method: str, **kwargs) -> None:
+        """
+        이벤트 루프에서 호출하는 submit. 대기열에 자리가 있으면 바로 넣고,
+        가득 찼거나 바로 저장해야 하면 기다림과 저장을 스레드 풀에서 처리합니다.
+        """
+        if method not in _SAVE_METHODS:
+            raise ValueError(f"지원하지 않는 히스토리 저장 메서드: {method}")
+        if settings.HISTORY_WRITE_BEHIND:
+            self._ensure_thread()
+            try:
+                self._queue.put_nowait((method, kwargs))
+                return
+            except queue.Full:
+                pass
+        await run_in_threadpool(self.submit, method, **kwargs)
+
+    def submit(self, method: str, **kwargs) -> None:
+        """HistoryService 저장 메서드 호출을 대기열에 넣습니다. 대기열이 가득 차면 이 스레드에서 기다립니다."""
+        if method not in _SAVE_METHODS:
+            raise ValueError(f"지원하지 않는 히스토리 저장 메서드: {method}")
+        if not settings.HISTORY_WRITE_BEHIND:
+            self._write_direct(method, kwargs)
+            return
+
+        self._ensure_thread()
+        try:
+            self._queue.put((method, kwargs), timeout=settings.HISTORY_WRITE_BLOCK_SECONDS)
+        except queue.Full:
+            logger.warning("히스토리 저장 대기열이 가득 차 바로 저장합니다.")
+            self._write_direct(method, kwargs)
+
+    def flush(self) -> None:
+        """지금까지 넣은 항목이 모두 저장될 때까지 기다립니다."""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.join()
+
+    def stop(self) -> None:
+        """남은 항목을 모두 저장하고 백그라운드 스레드를 종료합니다. (애플리케이션 종료 시)"""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is None or not thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        thread.join()
+        logger.info(f"히스토리 저장 스레드 종료 (저장 {self._stats['written']}건, 커밋 {self._stats['batches']}회)")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self._stats, "queued": self._queue.qsize()}
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="history-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                self._queue.task_done()
+                break
+            batch: List[Tuple[str, Dict[str, Any]]] = [item]
+
+            # 첫 항목 이후 interval 동안 또는 batch_size개까지 모음
+            deadline = time.monotonic() + self.interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    self._queue.task_done()
+                    stopping = True
+                    break
+                batch.append(item)
+
+            try:
+                self._write_batch(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _write_batch(self, batch: List[Tuple[str, Dict[str, Any]]]) -> None:
+        db = self.session_factory()
+        try:
+            history_service = HistoryService(db)
+            for method, kwargs in batch:
+                getattr(history_service, method)(commit=False, **kwargs)
+            db.commit()
+            self._stats["written"] += len(batch)
+            self._stats["batches"] += 1
+        except Exception as e:
+            # 한 건 때문에 배치 전체를 잃지 않도록 한 건씩 다시 저장
+            logger.error(f"히스토리 일괄 저장 중 오류, 한 건씩 다시 저장합니다: {str(e)}")
+            db.rollback()
+            for method, kwargs in batch:
+                if getattr(HistoryService(db), method)(**kwargs) is None:
+                    self._stats["failed"] += 1
+                else:
+                    self._stats["written"] += 1
+                    self._stats["batches"] += 1
+        finally:
+            db.close()
+
+    def _write_direct(self, method: str, kwargs: Dict[str, Any]) -> None:
+        db = self.session_factory()
+        try:
+            getattr(HistoryService(db), method)(**kwargs)
+            self._stats["direct"] += 1
+        finally:
+            db.close()
+
+
+history_writer = HistoryWriter()
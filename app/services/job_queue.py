@@ -0,0 +1,240 @@
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional
+from sqlalchemy import func, or_, and_, update
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.models.models import Job
+import json
+import logging
+import random
+
+logger = logging.getLogger(__name__)
+
+# 작업 상태
+STATUS_QUEUED = "queued"
+STATUS_LEASED = "leased"
+STATUS_DONE = "done"
+STATUS_DEAD = "dead"
+
+# 작업 우선순위 (클수록 먼저 처리)
+PRIORITY_LOW = 0
+PRIORITY_NORMAL = 50
+PRIORITY_HIGH = 100
+
+
+class JobQueue:
+    """
+    SQLite 테이블에 저장되는 작업 큐.
+    작업자는 임대(lease)를 잡고 작업을 처리하며, 임대 시간 안에 완료하지 못하면 다른 작업자가 다시 가져갑니다.
+    실패한 작업은 지수 백오프로 재시도하고, 최대 시도 횟수를 넘으면 'dead' 상태로 남깁니다.
+    """
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+
+    def enqueue(
+        self,
+        db: Session,
+        job_type: str,
+        payload: Dict[str, Any],
+        priority: int = PRIORITY_NORMAL,
+        dedupe_key: Optional[str] = None,
+        delay_seconds: float = 0,
+        max_attempts: Optional[int] = None
+    ) -> None:
+        """
+        작업을 등록합니다. 호출한 쪽의 트랜잭션에 포함되므로 커밋은 호출한 쪽에서 합니다.
+        같은 dedupe_key의 작업이 이미 있으면 등록하지 않습니다.
+        """
+        statement = insert(Job).values(
+            job_type=job_type,
+            payload=json.dumps(payload, ensure_ascii=False),
+            priority=priority,
+            status=STATUS_QUEUED,
+            dedupe_key=dedupe_key,
+            attempts=0,
+            max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+            available_at=datetime.utcnow() + timedelta(seconds=delay_seconds)
+        ).on_conflict_do_nothing(index_elements=["dedupe_key"])
+        db.execute(statement)
+
+    def claim(self, worker_id: str, job_types: Optional[List[str]] = None,
+              lease_seconds: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        실행 가능한 작업 하나를 임대합니다. 여러 작업자가 같은 작업을 고르면 조건부 UPDATE로 한 작업자만 성공합니다.
+        """
+        lease_seconds = lease_seconds or settings.JOB_LEASE_SECONDS
+        db = self.session_factory()
+        try:
+            self._expire_dead_leases(db)
+            for _ in range(3):
+                now = datetime.utcnow()
+                claimable = or_(
+                    and_(Job.status == STATUS_QUEUED, Job.available_at <= now),
+                    # 임대가 만료된 작업은 시도 횟수가 남아 있을 때만 다시 가져감
+                    and_(Job.status == STATUS_LEASED, Job.leased_until < now, Job.attempts < Job.max_attempts)
+                )
+                query = db.query(Job.id).filter(claimable)
+                if job_types:
+                    query = query.filter(Job.job_type.in_(job_types))
+                # 상위 몇 개 중 무작위로 골라 작업자 간 경합을 줄임
+                candidates = [
+                    row.id for row in query.order_by(Job.priority.desc(), Job.available_at.asc()).limit(5).all()
+                ]
+                if not candidates:
+                    return None
+
+                job_id = random.choice(candidates[:2])
+                result = db.execute(
+                    update(Job)
+                    .where(Job.id == job_id, claimable)
+                    .values(
+                        status=STATUS_LEASED,
+                        lease_owner=worker_id,
+                        leased_until=now + timedelta(seconds=lease_seconds),
+                        attempts=Job.attempts + 1
+                    )
+                )
+                db.commit()
+                if result.rowcount == 1:
+                    job = db.query(Job).filter(Job.id == job_id).first()
+                    return {
+                        "id": job.id,
+                        "job_type": job.job_type,
+                        "payload": json.loads(job.payload) if job.payload else {},
+                        "attempts": job.attempts,
+                        "max_attempts": job.max_attempts,
+                    }
+            return None
+        except Exception as e:
+            db.rollback()
+            logger.error(f"작업 임대 중 오류: {str(e)}")
+            return None
+        finally:
+            db.close()
+
+    def _expire_dead_leases(self, db: Session) -> int:
+        """
+        시도 횟수를 다 쓴 채 임대가 만료된 작업을 'dead'로 표시합니다.
+        작업자 프로세스가 죽으면 fail()이 호출되지 않으므로 여기서 정리합니다.
+        """
+        now = datetime.utcnow()
+        result = db.execute(
+            update(Job)
+            .where(
+                Job.status == STATUS_LEASED,
+                Job.leased_until < now,
+                Job.attempts >= Job.max_attempts
+            )
+            .values(
+                status=STATUS_DEAD,
+                leased_until=None,
+                finished_at=now,
+                last_error="lease expired"
+            )
+        )
+        db.commit()
+        if result.rowcount:
+            logger.error(f"임대가 만료되고 최대 시도 횟수를 넘은 작업 {result.rowcount}개를 중단 처리")
+        return result.rowcount
+
+    def extend_lease(self, job_id: int, worker_id: str, lease_seconds: Optional[int] = None) -> bool:
+        """처리 중인 작업의 임대 시간을 연장합니다. 임대를 잃었으면 False를 반환합니다."""
+        lease_seconds = lease_seconds or settings.JOB_LEASE_SECONDS
+        return self._update_owned(job_id, worker_id, {
+            "leased_until": datetime.utcnow() + timedelta(seconds=lease_seconds)
+        })
+
+    def complete(self, job_id: int, worker_id: str) -> bool:
+        return self._update_owned(job_id, worker_id, {
+            "status": STATUS_DONE,
+            "leased_until": None,
+            "finished_at": datetime.utcnow(),
+            "last_error": None
+        })
+
+    def fail(self, job_id: int, worker_id: str, error: str, attempts: int, max_attempts: int) -> bool:
+        """실패한 작업을 백오프 후 다시 대기시키거나, 시도 횟수를 다 쓰면 'dead'로 표시합니다."""
+        if attempts >= max_attempts:
+            logger.error(f"작업 {job_id} 최대 시도 횟수 초과로 중단: {error}")
+            return self._update_owned(job_id, worker_id, {
+                "status": STATUS_DEAD,
+                "leased_until": None,
+                "finished_at": datetime.utcnow(),
+                "last_error": error
+            })
+
+        delay = min(
+            settings.JOB_RETRY_BASE_SECONDS * (2 ** (attempts - 1)),
+            settings.JOB_RETRY_MAX_SECONDS
+        )
+        delay *= random.uniform(0.8, 1.2)
+        logger.warning(f"작업 {job_id} 실패 ({attempts}/{max_attempts}), {delay:.0f}초 후 재시도: {error}")
+        return self._update_owned(job_id, worker_id, {
+            "status": STATUS_QUEUED,
+            "leased_until": None,
+            "lease_owner": None,
+            "available_at": datetime.utcnow() + timedelta(seconds=delay),
+            "last_error": error
+        })
+
+    def retry_dead(self, job_type: Optional[str] = None) -> int:
+        """'dead' 상태의 작업을 다시 대기시킵니다."""
+        db = self.session_factory()
+        try:
+            statement = update(Job).where(Job.status == STATUS_DEAD)
+            if job_type:
+                statement = statement.where(Job.job_type == job_type)
+            result = db.execute(statement.values(
+                status=STATUS_QUEUED,
+                attempts=0,
+                available_at=datetime.utcnow(),
+                finished_at=None
+            ))
+            db.commit()
+            return result.rowcount
+        finally:
+            db.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """작업 유형·상태별 작업 수와 가장 오래 기다린 작업의 대기 시간을 반환합니다."""
+        db = self.session_factory()
+        try:
+            counts: Dict[str, Dict[str, int]] = {}
+            for job_type, status, count in db.query(
+                Job.job_type, Job.status, func.count(Job.id)
+            ).group_by(Job.job_type, Job.status).all():
+                counts.setdefault(job_type, {})[status] = count
+
+            oldest = db.query(func.min(Job.available_at)).filter(Job.status == STATUS_QUEUED).scalar()
+            return {
+                "jobs": counts,
+                "oldest_queued_seconds": (datetime.utcnow() - oldest).total_seconds() if oldest else 0.0
+            }
+        finally:
+            db.close()
+
+    def _update_owned(self, job_id: int, worker_id: str, values: Dict[str, Any]) -> bool:
+        """임대를 가진 작업자만 작업 상태를 바꿀 수 있습니다."""
+        db = self.session_factory()
+        try:
+            result = db.execute(
+                update(Job)
+                .where(Job.id == job_id, Job.lease_owner == worker_id, Job.status == STATUS_LEASED)
+                .values(**values)
+            )
+            db.commit()
+            if result.rowcount != 1:
+                logger.warning(f"작업 {job_id}의 임대를 잃어 상태를 변경하지 못했습니다.")
+                return False
+            return True
+        except Exception as e:
+            db.rollback()
+            logger.error(f"작업 {job_id} 상태 변경 오류: {str(e)}")
+            return False
+        finally:
+            db.close()
+
+
+job_queue = JobQueue()
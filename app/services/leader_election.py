@@ -0,0 +1,155 @@
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Any, Optional
+from sqlalchemy import or_, update
+from sqlalchemy.dialects.sqlite import insert
+from app.core.config import settings
+from app.db.database import SessionLocal, engine
+from app.models.models import SchedulerLease
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+
+class LeaderElector:
+    """
+    SQLite 임대 행으로 여러 프로세스 중 하나만 리더가 되도록 합니다.
+    리더는 주기적으로 임대를 갱신하고, 갱신이 끊기면 임대 만료 후 다른 프로세스가 리더가 됩니다.
+    """
+    def __init__(
+        self,
+        name: str = "scheduler",
+        session_factory=SessionLocal,
+        lease_seconds: Optional[int] = None,
+        heartbeat_seconds: Optional[int] = None,
+        on_change: Optional[Callable[[bool], None]] = None
+    ):
+        self.name = name
+        self.session_factory = session_factory
+        self.lease_seconds = lease_seconds or settings.LEADER_LEASE_SECONDS
+        self.heartbeat_seconds = heartbeat_seconds or settings.LEADER_HEARTBEAT_SECONDS
+        self.on_change = on_change
+        self.owner_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._is_leader = False
+        # DB 시간과 별개로 로컬에서도 임대 만료를 확인 (갱신이 멈춘 리더가 계속 작업하지 않도록)
+        self._valid_until = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self._is_leader and time.monotonic() < self._valid_until
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        SchedulerLease.__table__.create(bind=engine, checkfirst=True)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=f"leader-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """갱신을 멈추고, 리더였다면 임대를 바로 반납해 다른 프로세스가 즉시 이어받게 합니다."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(self.heartbeat_seconds)
+        if self._is_leader:
+            self._release()
+        self._set_leader(False)
+
+    def try_acquire(self) -> bool:
+        """임대를 얻거나 갱신합니다. 이 프로세스가 리더이면 True를 반환합니다."""
+        started = time.monotonic()
+        db = self.session_factory()
+        try:
+            now = datetime.utcnow()
+            expires_at = now + timedelta(seconds=self.lease_seconds)
+            db.execute(
+                insert(SchedulerLease)
+                .values(name=self.name, owner=None, expires_at=now)
+                .on_conflict_do_nothing(index_elements=["name"])
+            )
+            result = db.execute(
+                update(SchedulerLease)
+                .where(
+                    SchedulerLease.name == self.name,
+                    or_(
+                        SchedulerLease.owner == self.owner_id,
+                        SchedulerLease.owner.is_(None),
+                        SchedulerLease.expires_at < now
+                    )
+                )
+                .values(owner=self.owner_id, expires_at=expires_at)
+            )
+            acquired = result.rowcount == 1
+            if acquired and not self._is_leader:
+                db.execute(
+                    update(SchedulerLease)
+                    .where(SchedulerLease.name == self.name)
+                    .values(acquired_at=now)
+                )
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"리더 임대 갱신 중 오류: {str(e)}")
+            acquired = False
+        finally:
+            db.close()
+
+        if acquired:
+            self._valid_until = started + self.lease_seconds
+        self._set_leader(acquired)
+        return acquired
+
+    def get_status(self) -> Dict[str, Any]:
+        db = self.session_factory()
+        try:
+            lease = db.query(SchedulerLease).filter(SchedulerLease.name == self.name).first()
+            return {
+                "name": self.name,
+                "owner_id": self.owner_id,
+                "is_leader": self.is_leader,
+                "leader": lease.owner if lease else None,
+                "expires_at": lease.expires_at.isoformat() if lease and lease.expires_at else None,
+            }
+        finally:
+            db.close()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.try_acquire()
+            self._stop.wait(self.heartbeat_seconds)
+
+    def _release(self) -> None:
+        db = self.session_factory()
+        try:
+            db.execute(
+                update(SchedulerLease)
+                .where(SchedulerLease.name == self.name, SchedulerLease.owner == self.owner_id)
+                .values(owner=None, expires_at=datetime.utcnow())
+            )
+            db.commit()
+            logger.info(f"리더 임대 반납: {self.name}")
+        except Exception as e:
+            db.rollback()
+            logger.error(f"리더 임대 반납 중 오류: {str(e)}")
+        finally:
+            db.close()
+
+    def _set_leader(self, is_leader: bool) -> None:
+        if is_leader == self._is_leader:
+            return
+        self._is_leader = is_leader
+        if is_leader:
+            logger.info(f"리더가 되었습니다: {self.name} ({self.owner_id})")
+        else:
+            logger.warning(f"리더 지위를 잃었습니다: {self.name} ({self.owner_id})")
+        if self.on_change:
+            try:
+                self.on_change(is_leader)
+            except Exception as e:
+                logger.error(f"리더 변경 처리 중 오류: {str(e)}")
@@ -0,0 +1,137 @@
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session
+from app.models.models import VideoLshBucket
+import hashlib
+import re
+import zlib
+import numpy as np
+
+# MinHash 파라미터: 64개 해시를 4개씩 16개 밴드로 나눔
+# 자카드 유사도 0.8인 쌍은 거의 항상, 0.5인 쌍은 약 64% 확률로 후보가 됨
+NUM_PERM = 64
+BANDS = 16
+ROWS_PER_BAND = NUM_PERM // BANDS
+SHINGLE_SIZE = 5
+
+# 32비트 해시 값에 대한 범용 해시 (a * x + b) mod P, uint64 안에서 넘치지 않음
+_MERSENNE_PRIME = np.uint64((1 << 31) - 1)
+_rng = np.random.RandomState(20240501)
+_PERM_A = _rng.randint(1, (1 << 31) - 1, size=NUM_PERM).astype(np.uint64)
+_PERM_B = _rng.randint(0, (1 << 31) - 1, size=NUM_PERM).astype(np.uint64)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def shingles(text: Optional[str], size: int = SHINGLE_SIZE) -> Set[str]:
+    """공백을 정규화한 텍스트의 문자 n-gram 집합. 언어와 관계없이 동작합니다."""
+    if not text:
+        return set()
+    normalized = _WHITESPACE.sub(" ", text.lower()).strip()
+    if not normalized:
+        return set()
+    if len(normalized) <= size:
+        return {normalized}
+    return {normalized[i:i + size] for i in range(len(normalized) - size + 1)}
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def minhash_signature(shingle_set: Iterable[str]) -> Optional[np.ndarray]:
+    """shingle 집합의 MinHash 서명(uint32 NUM_PERM개)을 계산합니다. 빈 집합이면 None."""
+    hashes = np.fromiter(
+        (zlib.crc32(s.encode("utf-8")) & 0x7FFFFFFF for s in shingle_set), dtype=np.uint64
+    )
+    if hashes.size == 0:
+        return None
+    permuted = (_PERM_A[:, None] * hashes[None, :] + _PERM_B[:, None]) % _MERSENNE_PRIME
+    return permuted.min(axis=1).astype(np.uint32)
+
+
+def signature_to_bytes(signature: np.ndarray) -> bytes:
+    return signature.astype("<u4").tobytes()
+
+
+def signature_from_bytes(data: Optional[bytes]) -> Optional[np.ndarray]:
+    if not data:
+        return None
+    return np.frombuffer(data, dtype="<u4")
+
+
+def estimate_similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """두 MinHash 서명이 일치하는 비율로 자카드 유사도를 추정합니다."""
+    return float(np.mean(a == b))
+
+
+def band_keys(signature: np.ndarray) -> List[Tuple[int, int]]:
+    """서명을 밴드로 나눠 (밴드 번호, 버킷 해시) 목록을 반환합니다."""
+    data = signature.astype("<u4").tobytes()
+    band_size = ROWS_PER_BAND * 4
+    keys = []
+    for band in range(BANDS):
+        digest = hashlib.blake2b(data[band * band_size:(band + 1) * band_size], digest_size=8).digest()
+        keys.append((band, int.from_bytes(digest, "little", signed=True)))
+    return keys
+
+
+class NearDuplicateIndex:
+    """
+    비디오 텍스트의 MinHash 서명을 LSH 버킷 테이블에 저장하는 근접 중복 인덱스.
+    새 비디오는 같은 버킷을 공유하는 비디오만 후보로 가져오므로 카탈로그 크기와 관계없이 조회 비용이 거의 일정합니다.
+    band_offset으로 같은 테이블에 서로 다른 텍스트(설명, 자막)의 인덱스를 나눠 저장합니다.
+    """
+    def __init__(self, band_offset: int = 0):
+        self.band_offset = band_offset
+
+    def _keys(self, signature: np.ndarray) -> List[Tuple[int, int]]:
+        return [(band + self.band_offset, bucket) for band, bucket in band_keys(signature)]
+
+    def add(self, db: Session, video_id: int, signature: np.ndarray) -> None:
+        """비디오를 인덱스에 추가합니다. 커밋은 호출한 쪽에서 합니다."""
+        self.add_many(db, {video_id: signature})
+
+    def add_many(self, db: Session, signatures: Dict[int, np.ndarray]) -> None:
+        """여러 비디오의 버킷 행을 한 번에 추가합니다."""
+        db.bulk_insert_mappings(VideoLshBucket, [
+            {"band": band, "bucket": bucket, "video_id": video_id}
+            for video_id, signature in signatures.items()
+            for band, bucket in self._keys(signature)
+        ])
+
+    def remove(self, db: Session, video_id: int) -> None:
+        db.query(VideoLshBucket).filter(
+            VideoLshBucket.video_id == video_id,
+            VideoLshBucket.band >= self.band_offset,
+            VideoLshBucket.band < self.band_offset + BANDS
+        ).delete(synchronize_session=False)
+
+    def candidates(self, db: Session, signature: np.ndarray, exclude_id: Optional[int] = None) -> Set[int]:
+        """같은 밴드 버킷에 한 번이라도 들어간 비디오 ID 집합을 반환합니다."""
+        return self.candidates_many(db, {exclude_id or 0: signature}).get(exclude_id or 0, set())
+
+    def candidates_many(self, db: Session, signatures: Dict[int, np.ndarray]) -> Dict[int, Set[int]]:
+        """여러 서명의 후보를 한 번의 조회로 찾습니다. 결과에서 자기 자신은 제외합니다."""
+        owners: Dict[Tuple[int, int], List[int]] = {}
+        for key_id, signature in signatures.items():
+            for key in self._keys(signature):
+                owners.setdefault(key, []).append(key_id)
+        if not owners:
+            return {}
+
+        results: Dict[int, Set[int]] = {key_id: set() for key_id in signatures}
+        rows = db.query(VideoLshBucket.band, VideoLshBucket.bucket, VideoLshBucket.video_id).filter(
+            tuple_(VideoLshBucket.band, VideoLshBucket.bucket).in_(list(owners))
+        ).all()
+        for band, bucket, video_id in rows:
+            for key_id in owners[(band, bucket)]:
+                if video_id != key_id:
+                    results[key_id].add(video_id)
+        return results
+
+
+near_duplicate_index = NearDuplicateIndex()
+transcript_index = NearDuplicateIndex(band_offset=BANDS)
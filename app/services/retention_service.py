@@ -0,0 +1,238 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.db.models import SummaryHistory
+from app.db.text_blobs import purge_unused_blobs
+import glob
+import gzip
+import json
+import logging
+import os
+import re
+import time
+
+logger = logging.getLogger(__name__)
+
+# 보관 파일에 저장할 컬럼 (원문은 압축 저장 여부와 관계없이 풀어서 저장)
+ARCHIVE_FIELDS = [
+    "id", "summary_type", "created_at", "model_used", "quality_score", "summary_text", "key_phrases",
+    "source_info", "preview", "content_hash", "source_key", "params_hash", "user_id", "tokens_used",
+]
+# 배치 사이에 쉬는 시간 (다른 요청이 쓰기 잠금을 얻을 수 있게)
+BATCH_PAUSE_SECONDS = 0.05
+_MONTH_PATTERN = re.compile(r"^\d{4}-\d{2}$")
+# 배치마다 돌려받을 최대 빈 페이지 수 (auto_vacuum=INCREMENTAL일 때)
+INCREMENTAL_VACUUM_PAGES = 1000
+# auto_vacuum 경고는 프로세스마다 한 번만 출력
+_auto_vacuum_warned = False
+
+
+class RetentionService:
+    """
+    요약 종류별 보존 기간이 지난 히스토리를 월별 JSONL.gz 파일로 옮긴 뒤 작은 배치로 삭제합니다.
+    배치마다 커밋하므로 긴 쓰기 잠금을 잡지 않고, 삭제로 생긴 빈 페이지는 점진적으로 돌려받습니다.
+    보관 파일은 필요할 때 read_archive로 조회할 수 있습니다.
+    """
+    def __init__(
+        self,
+        policies: Optional[Dict[str, int]] = None,
+        archive_dir: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        session_factory=SessionLocal
+    ):
+        self.policies = settings.HISTORY_RETENTION_DAYS if policies is None else policies
+        self.archive_dir = os.path.join(archive_dir or settings.HISTORY_ARCHIVE_DIR, "summary_history")
+        self.batch_size = batch_size or settings.HISTORY_RETENTION_BATCH_SIZE
+        self.session_factory = session_factory
+
+    def apply(self) -> Dict[str, int]:
+        """보존 정책을 적용하고 요약 종류별로 보관 후 삭제한 행 수를 반환합니다."""
+        self._warn_if_not_incremental()
+        results = {}
+        for summary_type, days in self.policies.items():
+            if not days or days <= 0:
+                continue
+            cutoff = datetime.utcnow() - timedelta(days=days)
+            archived = 0
+            db = self.session_factory()
+            try:
+                while True:
+                    count = self._archive_batch(db, summary_type, cutoff)
+                    if not count:
+                        break
+                    archived += count
+                    self.incremental_vacuum(db)
+                    time.sleep(BATCH_PAUSE_SECONDS)
+            except Exception as e:
+                db.rollback()
+                logger.error(f"히스토리 보존 정책 적용 중 오류 ({summary_type}): {str(e)}")
+            finally:
+                db.close()
+            if archived:
+                logger.info(f"보존 기간이 지난 {summary_type} 히스토리 {archived}개 보관 후 삭제")
+            results[summary_type] = archived
+        return results
+
+    def _archive_batch(self, db: Session, summary_type: str, cutoff: datetime) -> int:
+        columns = [getattr(SummaryHistory, field) for field in ARCHIVE_FIELDS]
+        rows = db.query(
+            *columns,
+            SummaryHistory.original_text.label("original_text"),
+            SummaryHistory.original_blob_hash
+        ).filter(
+            SummaryHistory.summary_type == summary_type,
+            SummaryHistory.created_at < cutoff
+        ).order_by(SummaryHistory.id.asc()).limit(self.batch_size).all()
+        if not rows:
+            return 0
+
+        # 삭제하기 전에 보관 파일에 먼저 기록 (중간에 실패하면 다음 실행에서 다시 기록될 수 있음, 조회 시 id로 중복 제거)
+        by_month: Dict[str, List[Dict[str, Any]]] = {}
+        for row in rows:
+            record = row._asdict()
+            record.pop("original_blob_hash")
+            by_month.setdefault(record["created_at"].strftime("%Y-%m"), []).append(record)
+        for month, records in by_month.items():
+            self._append_archive(month, records)
+
+        ids = [row.id for row in rows]
+        db.query(SummaryHistory).filter(SummaryHistory.id.in_(ids)).delete(synchronize_session=False)
+        purge_unused_blobs(db, [row.original_blob_hash for row in rows if row.original_blob_hash])
+        db.commit()
+        return len(rows)
+
+    def _archive_path(self, month: str) -> str:
+        if not _MONTH_PATTERN.match(month):
+            raise ValueError("월은 YYYY-MM 형식이어야 합니다.")
+        return os.path.join(self.archive_dir, f"{month}.jsonl.gz")
+
+    def _append_archive(self, month: str, records: List[Dict[str, Any]]) -> None:
+        os.makedirs(self.archive_dir, exist_ok=True)
+        # gzip 파일 뒤에 새 멤버로 이어 쓰면 하나의 스트림으로 읽힘
+        with open(self._archive_path(month), "ab") as raw:
+            with gzip.GzipFile(fileobj=raw, mode="ab") as archive:
+                for record in records:
+                    archive.write(json.dumps(record, ensure_ascii=False, default=str).encode("utf-8"))
+                    archive.write(b"\n")
+            raw.flush()
+            os.fsync(raw.fileno())
+
+    def clear(self, summary_type: Optional[str] = None) -> int:
+        """히스토리를 보관하지 않고 작은 배치로 나눠 삭제하고 삭제한 행 수를 반환합니다."""
+        deleted = 0
+        db = self.session_factory()
+        try:
+            while True:
+                query = db.query(SummaryHistory.id, SummaryHistory.original_blob_hash)
+                if summary_type:
+                    query = query.filter(SummaryHistory.summary_type == summary_type)
+                rows = query.order_by(SummaryHistory.id.asc()).limit(self.batch_size).all()
+                if not rows:
+                    break
+                db.query(SummaryHistory).filter(
+                    SummaryHistory.id.in_([row.id for row in rows])
+                ).delete(synchronize_session=False)
+                purge_unused_blobs(db, [row.original_blob_hash for row in rows if row.original_blob_hash])
+                db.commit()
+                deleted += len(rows)
+                self.incremental_vacuum(db)
+                time.sleep(BATCH_PAUSE_SECONDS)
+        except Exception as e:
+            db.rollback()
+            logger.error(f"히스토리 삭제 중 오류: {str(e)}")
+            raise
+        finally:
+            db.close()
+        return deleted
+
+    def _warn_if_not_incremental(self) -> None:
+        """auto_vacuum=INCREMENTAL이 아니면 삭제로 생긴 빈 페이지를 돌려받지 못하므로 경고합니다."""
+        global _auto_vacuum_warned
+        if _auto_vacuum_warned:
+            return
+        db = self.session_factory()
+        try:
+            mode = db.execute(text("PRAGMA auto_vacuum")).scalar()
+        finally:
+            db.close()
+        if mode != 2:
+            _auto_vacuum_warned = True
+            logger.warning(
+                f"auto_vacuum={mode}: 보존 정책으로 삭제한 공간이 파일 크기에 반영되지 않습니다. "
+                f"서비스를 멈추고 scripts/apply_retention.py --enable-incremental-vacuum을 한 번 실행하세요."
+            )
+
+    @staticmethod
+    def incremental_vacuum(db: Session, pages: int = INCREMENTAL_VACUUM_PAGES) -> None:
+        """auto_vacuum=INCREMENTAL인 데이터베이스에서 빈 페이지를 조금씩 돌려받습니다. 아니면 아무것도 하지 않습니다."""
+        if db.execute(text("PRAGMA auto_vacuum")).scalar() != 2:
+            return
+        db.execute(text(f"PRAGMA incremental_vacuum({int(pages)})"))
+        db.commit()
+
+    def list_archives(self) -> List[Dict[str, Any]]:
+        """보관 파일 목록 (월, 파일 크기)."""
+        archives = []
+        for path in sorted(glob.glob(os.path.join(self.archive_dir, "*.jsonl.gz"))):
+            archives.append({
+                "month": os.path.basename(path)[:-len(".jsonl.gz")],
+                "size_bytes": os.path.getsize(path)
+            })
+        return archives
+
+    def read_archive(
+        self,
+        month: Optional[str] = None,
+        summary_type: Optional[str] = None,
+        history_id: Optional[int] = None,
+        query: Optional[str] = None,
+        limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """
+        보관 파일에서 조건에 맞는 히스토리를 찾습니다. month를 주면 그 달의 파일만 읽습니다.
+        파일은 한 줄씩 읽으므로 파일 크기와 관계없이 메모리 사용량이 일정합니다.
+        """
+        months = [month] if month else [archive["month"] for archive in reversed(self.list_archives())]
+        results: List[Dict[str, Any]] = []
+        seen = set()
+        for archive_month in months:
+            for record in self._iter_archive(archive_month):
+                if record["id"] in seen:
+                    continue
+                if summary_type and record.get("summary_type") != summary_type:
+                    continue
+                if history_id is not None and record["id"] != history_id:
+                    continue
+                if query and query not in (record.get("summary_text") or "") \
+                        and query not in (record.get("original_text") or ""):
+                    continue
+                seen.add(record["id"])
+                results.append(record)
+                if len(results) >= limit:
+                    return results
+        return results
+
+    def _iter_archive(self, month: str) -> Iterator[Dict[str, Any]]:
+        path = self._archive_path(month)
+        if not os.path.exists(path):
+            return
+        with gzip.open(path, "rt", encoding="utf-8") as archive:
+            for line in archive:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def enable_incremental_vacuum(engine) -> None:
+    """
+    데이터베이스를 auto_vacuum=INCREMENTAL로 바꿉니다. 전체 VACUUM이 필요하므로 한 번만, 서비스를 멈추고 실행합니다.
+    VACUUM은 명시적 INTEGER PRIMARY KEY가 없는 테이블의 rowid를 바꿀 수 있으므로 원문 검색 인덱스는 text_blobs.fts_id를 키로 씁니다.
+    """
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        if conn.execute(text("PRAGMA auto_vacuum")).scalar() == 2:
+            return
+        conn.execute(text("PRAGMA auto_vacuum=INCREMENTAL"))
+        conn.execute(text("VACUUM"))
+        logger.info("auto_vacuum=INCREMENTAL 설정 완료")
@@ -2,78 +2,237 @@ from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
+from app.core.config import settings
 from app.db.session import SessionLocal
 from app.models.models import Channel, Video
 from app.services.youtube_service import YouTubeService
-from app.services.summarizer_service import SummarizerService
+from app.services.etag_cache import etag_cache
+from app.services.job_queue import job_queue
+from app.services.worker_service import JOB_SUMMARIZE_VIDEO
 from app.services.duplicate_checker import DuplicateChecker
+from app.services.websub_service import WebSubService
+from app.services.channel_poller import ChannelPoller
+from app.services.leader_election import LeaderElector
+from app.services.retention_service import RetentionService
+from typing import Callable, List, Dict, Any, Optional
+import logging
+
+logger = logging.getLogger(__name__)
 
 class SchedulerService:
     def __init__(self):
         self.scheduler = BackgroundScheduler()
         self.youtube_service = YouTubeService()
-        self.summarizer_service = SummarizerService()
         self.duplicate_checker = DuplicateChecker()
+        self.websub_service = WebSubService()
+        self.channel_poller = ChannelPoller(self._check_channel_videos)
+        # 여러 프로세스에서 시작해도 리더 프로세스만 예약 작업을 실행
+        self.leader = LeaderElector("scheduler")
         
     def start(self):
-        # 24시간마다 실행
+        self.leader.start()
+        
+        # 채널별 확인 시간이 된 채널을 작업자 풀에서 확인
+        self.scheduler.add_job(
+            self._leader_only(self.channel_poller.tick),
+            IntervalTrigger(seconds=settings.POLLER_TICK_SECONDS),
+            id='poll_due_channels',
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True
+        )
+        
+        # WebSub 푸시를 사용하면 전체 채널 확인은 느린 재확인 용도로만 실행
+        interval_hours = settings.CHANNEL_RECONCILE_INTERVAL_HOURS if self.websub_service.enabled else 24
         self.scheduler.add_job(
-            self.check_new_videos,
-            IntervalTrigger(hours=24),
+            self._leader_only(self.check_new_videos),
+            IntervalTrigger(hours=interval_hours),
             id='check_new_videos',
             replace_existing=True
         )
+        
+        # WebSub 구독 갱신 (1시간마다, 시작 시 즉시 한 번)
+        if self.websub_service.enabled:
+            self.scheduler.add_job(
+                self._leader_only(self.renew_websub_subscriptions),
+                IntervalTrigger(hours=1),
+                id='renew_websub_subscriptions',
+                replace_existing=True,
+                next_run_time=datetime.now() + timedelta(seconds=settings.LEADER_HEARTBEAT_SECONDS)
+            )
+        
+        # 보존 기간이 지난 요약 히스토리를 보관 파일로 옮기고 삭제
+        if settings.HISTORY_RETENTION_DAYS:
+            self.scheduler.add_job(
+                self._leader_only(self.apply_history_retention),
+                IntervalTrigger(hours=settings.HISTORY_RETENTION_INTERVAL_HOURS),
+                id='apply_history_retention',
+                replace_existing=True,
+                max_instances=1,
+                coalesce=True
+            )
         self.scheduler.start()
     
-    def check_new_videos(self):
+    def shutdown(self):
+        if self.scheduler.running:
+            self.scheduler.shutdown(wait=False)
+        self.channel_poller.executor.shutdown(wait=False, cancel_futures=True)
+        self.leader.stop()
+    
+    def _leader_only(self, func: Callable[[], Any]) -> Callable[[], None]:
+        """리더가 아닌 프로세스에서는 예약 작업을 건너뜁니다."""
+        def job():
+            if not self.leader.is_leader:
+                return
+            func()
+        job.__name__ = func.__name__
+        return job
+    
+    def apply_history_retention(self):
+        try:
+            RetentionService().apply()
+        except Exception as e:
+            logger.error(f"히스토리 보존 정책 적용 중 오류: {str(e)}")
+    
+    def renew_websub_subscriptions(self):
         db = SessionLocal()
         try:
-            # 모든 채널에 대해 새로운 비디오 확인
-            channels = db.query(Channel).all()
-            for channel in channels:
-                self._check_channel_videos(channel, db)
+            channel_ids = [row.channel_id for row in db.query(Channel.channel_id).all()]
+            self.websub_service.renew_expiring(channel_ids, db)
+        except Exception as e:
+            logger.error(f"WebSub 구독 갱신 중 오류: {str(e)}")
         finally:
             db.close()
     
-    def _check_channel_videos(self, channel: Channel, db: Session):
-        # 마지막 확인 시간 이후의 비디오만 가져오기
-        last_check = channel.videos[0].last_checked_at if channel.videos else datetime.min
-        
-        # YouTube API로 새 비디오 가져오기
-        new_videos = self.youtube_service.get_channel_videos(
-            channel.channel_id,
-            max_results=50
-        )
-        
-        for video_data in new_videos:
-            # 이미 존재하는 비디오인지 확인
-            existing_video = db.query(Video).filter(
-                Video.video_id == video_data['video_id']
-            ).first()
+    def ingest_videos(self, youtube_channel_id: str, video_ids: List[str]):
+        """
+        푸시 알림으로 받은 비디오를 바로 추가합니다.
+        """
+        db = SessionLocal()
+        try:
+            channel = db.query(Channel).filter(Channel.channel_id == youtube_channel_id).first()
+            if channel is None:
+                logger.warning(f"등록되지 않은 채널의 알림을 무시합니다: {youtube_channel_id}")
+                return
             
-            if not existing_video:
-                # 새 비디오 추가
-                video = Video(
-                    video_id=video_data['video_id'],
-                    title=video_data['title'],
-                    description=video_data['description'],
-                    published_at=video_data['published_at'],
-                    duration=video_data.get('duration'),
-                    channel_id=channel.id,
-                    last_checked_at=datetime.utcnow()
-                )
-                db.add(video)
-                
-                # 중복 체크
-                if self.duplicate_checker.is_duplicate(video, db):
-                    video.is_duplicate = True
-                
-                # 요약 생성
-                if not video.is_duplicate:
-                    video.summary = self.summarizer_service.summarize_text(
-                        video.description,
-                        max_length=video.summary_length
+            new_ids = self._filter_new_video_ids(video_ids, db)
+            if not new_ids:
+                return
+            
+            added = self._add_videos(channel, self.youtube_service.get_videos(new_ids, youtube_channel_id), db)
+            db.commit()
+            logger.info(f"푸시 알림으로 채널 {youtube_channel_id}의 비디오 {added}개를 처리했습니다.")
+        except Exception as e:
+            db.rollback()
+            logger.error(f"푸시 알림 비디오 처리 중 오류: {str(e)}")
+            # 작업 큐에서 다시 시도하도록 오류 전달
+            raise
+        finally:
+            db.close()
+    
+    def check_new_videos(self):
+        # 모든 채널을 확인 대상으로 표시하면 채널 확인 작업자 풀이 동시에 처리
+        # 재확인은 304여도 목록을 끝까지 확인해 이전에 놓친 비디오를 복구
+        count = self.channel_poller.mark_all_due(full_check=True)
+        logger.info(f"전체 채널 재확인 예약: {count}개 채널")
+    
+    def _check_channel_videos(self, channel: Channel, db: Session, only_changed: bool = True):
+        """
+        채널의 새 비디오를 추가합니다. only_changed가 True이면 업로드 목록이 변경되지 않은(304) 경우 바로 끝냅니다.
+        ETag는 채널의 커밋이 성공한 뒤에만 저장하므로 커밋이 실패하면 다음 확인에서 다시 가져옵니다.
+        """
+        added = 0
+        
+        try:
+            with etag_cache.deferred():
+                # YouTube API로 새 비디오를 최신순으로 페이지 단위로 가져오기
+                for new_videos in self.youtube_service.iter_channel_videos(
+                    channel.channel_id,
+                    max_results=settings.CHANNEL_POLL_MAX_VIDEOS,
+                    only_changed=only_changed
+                ):
+                    # 배치 전체의 존재 여부를 한 번에 확인
+                    new_ids = set(self._filter_new_video_ids([v['video_id'] for v in new_videos], db))
+                    added += self._add_videos(
+                        channel, [v for v in new_videos if v['video_id'] in new_ids], db
                     )
-                    video.is_summarized = True
+                    
+                    # 이미 알고 있는 비디오에 도달하면 이후 페이지는 가져오지 않음
+                    if len(new_ids) < len(new_videos):
+                        break
                 
-                db.commit() 
\ No newline at end of file
+                # 채널 단위로 한 번만 커밋
+                db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        
+        stats = etag_cache.get_stats(channel.channel_id)[channel.channel_id]
+        logger.info(
+            f"채널 {channel.channel_id}: 새 비디오 {added}개, "
+            f"조건부 요청 적중 {stats['hits']}, 미적중 {stats['misses']}"
+        )
+    
+    def _filter_new_video_ids(self, video_ids: List[str], db: Session) -> List[str]:
+        """DB에 없는 비디오 ID만 원래 순서대로 반환합니다."""
+        if not video_ids:
+            return []
+        existing_ids = {
+            row.video_id for row in db.query(Video.video_id).filter(Video.video_id.in_(video_ids)).all()
+        }
+        return [video_id for video_id in dict.fromkeys(video_ids) if video_id not in existing_ids]
+    
+    def _add_videos(self, channel: Channel, videos_data: List[Dict[str, Any]], db: Session) -> int:
+        """
+        새 비디오를 한 번에 추가하고 중복 체크와 요약을 수행합니다. 커밋은 호출한 쪽에서 합니다.
+        """
+        if not videos_data:
+            return 0
+        
+        now = datetime.utcnow()
+        videos = [
+            Video(
+                video_id=video_data['video_id'],
+                title=video_data['title'],
+                description=video_data['description'],
+                published_at=self._published_at(video_data['published_at']),
+                duration=video_data.get('duration'),
+                channel_id=channel.id,
+                last_checked_at=now
+            )
+            for video_data in videos_data
+        ]
+        db.add_all(videos)
+        db.flush()
+        
+        # 배치 전체의 설명 기반 중복 여부를 한 번에 확인
+        self.duplicate_checker.check_batch(videos, db)
+        for video in videos:
+            # 요약은 작업 큐에 등록하고 작업자가 처리 (비디오와 같은 트랜잭션으로 커밋)
+            # 설명이 비슷해도 자막 지문으로 다시 판단하므로 모든 새 비디오를 등록
+            job_queue.enqueue(
+                db,
+                JOB_SUMMARIZE_VIDEO,
+                {"video_id": video.id},
+                dedupe_key=f"{JOB_SUMMARIZE_VIDEO}:{video.video_id}"
+            )
+        
+        return len(videos)
+    
+    @staticmethod
+    def _published_at(value: Any) -> Optional[datetime]:
+        """API가 돌려준 게시 시간 문자열을 DateTime 컬럼에 넣을 수 있는 datetime으로 변환합니다."""
+        if isinstance(value, str):
+            return YouTubeService._parse_published_at(value) if value else None
+        return value
+
+
+_scheduler_service: Optional[SchedulerService] = None
+
+
+def get_scheduler_service() -> SchedulerService:
+    """프로세스에서 공유하는 스케줄러 서비스를 반환합니다."""
+    global _scheduler_service
+    if _scheduler_service is None:
+        _scheduler_service = SchedulerService()
+    return _scheduler_service
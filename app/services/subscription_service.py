@@ -4,6 +4,7 @@ from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 from app.models.models import User
 from app.db.crud import is_subscription_active
+from app.services.usage_stats_service import UsageStatsService
 import logging
 
 logger = logging.getLogger(__name__)
@@ -19,7 +20,8 @@ class SubscriptionService:
             "max_tokens": 1000,
             "max_document_size": 1,  # MB
             "max_video_length": 10,  # 분
-            "advanced_features": False
+            "advanced_features": False,
+            "scheduling_weight": 1  # 요약 작업 스케줄링 가중치 (차례마다 처리받는 작업 수)
         },
         "premium": {
             "daily_summaries": 20,
@@ -27,7 +29,8 @@ class SubscriptionService:
             "max_tokens": 4000,
             "max_document_size": 10,  # MB
             "max_video_length": 60,  # 분
-            "advanced_features": True
+            "advanced_features": True,
+            "scheduling_weight": 3
         },
         "enterprise": {
             "daily_summaries": 100,
@@ -35,7 +38,8 @@ class SubscriptionService:
             "max_tokens": 16000,
             "max_document_size": 50,  # MB
             "max_video_length": 240,  # 분
-            "advanced_features": True
+            "advanced_features": True,
+            "scheduling_weight": 6
         }
     }
     
@@ -52,37 +56,37 @@ class SubscriptionService:
             tier = "free"
         return cls.TIER_LIMITS[tier]
     
+    @classmethod
+    def get_scheduling_weight(cls, user: Optional[User]) -> int:
+        """요약 작업 스케줄링 가중치. 로그인하지 않았거나 구독이 만료된 사용자는 무료 등급으로 취급합니다."""
+        if user is None or not cls.check_subscription_active(user):
+            return cls.TIER_LIMITS["free"]["scheduling_weight"]
+        return cls.get_user_limits(user)["scheduling_weight"]
+    
     @classmethod
     def check_summary_limit(cls, user: User, db: Session) -> None:
         """사용자가 요약 기능을 사용할 수 있는지 한도 확인"""
-        # 현재 날짜의 00:00:00 시간
-        today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        if user.subscription_tier != "free":
+            return
+        # 미리 집계된 사용량으로 확인 (히스토리 테이블을 세지 않음)
+        usage = UsageStatsService(db)
+        today = datetime.now(timezone.utc).date()
         
-        if user.subscription_tier == "free":
-            # 오늘 사용한 요약 수 확인
-            daily_count = db.query(SummaryHistory).filter(
-                SummaryHistory.user_id == user.id,
-                SummaryHistory.created_at >= today
-            ).count()
-            
-            if daily_count >= cls.TIER_LIMITS["free"]["daily_summaries"]:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="일일 요약 한도를 초과했습니다. 프리미엄으로 업그레이드하세요."
-                )
-                
-            # 이번 달 사용한 요약 수 확인
-            first_day_of_month = datetime.now(timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-            monthly_count = db.query(SummaryHistory).filter(
-                SummaryHistory.user_id == user.id,
-                SummaryHistory.created_at >= first_day_of_month
-            ).count()
+        # 오늘 사용한 요약 수 확인
+        daily_count = usage.count_summaries(user.id, today)
+        if daily_count >= cls.TIER_LIMITS["free"]["daily_summaries"]:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="일일 요약 한도를 초과했습니다. 프리미엄으로 업그레이드하세요."
+            )
             
-            if monthly_count >= cls.TIER_LIMITS["free"]["monthly_summaries"]:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="월간 요약 한도를 초과했습니다. 프리미엄으로 업그레이드하세요."
-                )
+        # 이번 달 사용한 요약 수 확인
+        monthly_count = usage.count_summaries(user.id, today.replace(day=1))
+        if monthly_count >= cls.TIER_LIMITS["free"]["monthly_summaries"]:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="월간 요약 한도를 초과했습니다. 프리미엄으로 업그레이드하세요."
+            )
     
     @classmethod
     def check_document_size(cls, user: User, file_size_mb: float) -> None:
@@ -59,6 +59,7 @@ class SummarizerService:
                 )
                 
                 summary = response.choices[0].message.content.strip()
+                usage = response.get("usage") or {}
                 
                 return {
                     "summary": summary,
@@ -68,7 +69,8 @@ class SummarizerService:
                         "format": format,
                         "max_length": max_length,
                         "timestamp": datetime.now().isoformat(),
-                        "model": use_model
+                        "model": use_model,
+                        "tokens_used": usage.get("total_tokens")
                     }
                 }
                 
@@ -0,0 +1,177 @@
+from collections import deque, OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+from app.core.config import settings
+import asyncio
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# 우선순위 클래스 (작을수록 먼저 처리)
+PRIORITY_INTERACTIVE = 0  # 사용자가 응답을 기다리는 단건 요청
+PRIORITY_BATCH = 1  # 일괄 요약 요청
+PRIORITY_BACKGROUND = 2  # 새 비디오 요약 등 백그라운드 작업
+PRIORITY_NAMES = {
+    PRIORITY_INTERACTIVE: "interactive",
+    PRIORITY_BATCH: "batch",
+    PRIORITY_BACKGROUND: "background",
+}
+
+
+class _Task:
+    __slots__ = ("fn", "args", "kwargs", "future", "enqueued_at")
+
+    def __init__(self, fn: Callable, args: tuple, kwargs: dict):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.future: Future = Future()
+        self.enqueued_at = time.monotonic()
+
+
+class _FairQueue:
+    """
+    한 우선순위 클래스 안에서 사용자별 대기열을 가중 라운드 로빈으로 돌며 작업을 꺼냅니다.
+    가중치가 w인 사용자는 차례가 올 때마다 최대 w개의 작업을 연속으로 처리받습니다.
+    """
+    def __init__(self):
+        self.queues: "OrderedDict[str, Deque[_Task]]" = OrderedDict()
+        self.weights: Dict[str, int] = {}
+        self.credits: Dict[str, int] = {}
+        self.size = 0
+
+    def push(self, user_key: str, weight: int, task: _Task) -> None:
+        if user_key not in self.queues:
+            self.queues[user_key] = deque()
+            self.credits[user_key] = max(1, weight)
+        self.weights[user_key] = max(1, weight)
+        self.queues[user_key].append(task)
+        self.size += 1
+
+    def pop(self) -> Optional[_Task]:
+        while self.queues:
+            user_key, queue = next(iter(self.queues.items()))
+            if not queue:
+                self._drop(user_key)
+                continue
+            task = queue.popleft()
+            self.size -= 1
+            self.credits[user_key] -= 1
+            if not queue:
+                self._drop(user_key)
+            elif self.credits[user_key] <= 0:
+                # 차례를 다 쓴 사용자는 맨 뒤로
+                self.credits[user_key] = self.weights[user_key]
+                self.queues.move_to_end(user_key)
+            return task
+        return None
+
+    def _drop(self, user_key: str) -> None:
+        del self.queues[user_key]
+        self.weights.pop(user_key, None)
+        self.credits.pop(user_key, None)
+
+
+class SummaryWorkScheduler:
+    """
+    LLM 요약 작업을 제한된 작업자 스레드에서 실행하는 스케줄러.
+    우선순위가 높은 클래스(대화형 > 일괄 > 백그라운드)를 먼저 처리하고, 같은 클래스 안에서는 사용자별로 돌아가며 처리합니다.
+    일부 작업자는 대화형 요청 전용으로 남겨 두어 큰 일괄 작업이 있어도 대화형 요청이 기다리지 않게 합니다.
+    """
+    def __init__(self, max_workers: Optional[int] = None, reserved_interactive: Optional[int] = None):
+        self.max_workers = max_workers or settings.SUMMARY_MAX_WORKERS
+        reserved = settings.SUMMARY_RESERVED_INTERACTIVE_WORKERS if reserved_interactive is None else reserved_interactive
+        self.reserved_interactive = min(reserved, self.max_workers - 1)
+        self._queues = {priority: _FairQueue() for priority in PRIORITY_NAMES}
+        self._cond = threading.Condition()
+        self._threads: List[threading.Thread] = []
+        self._waits: Dict[int, Deque[float]] = {priority: deque(maxlen=1000) for priority in PRIORITY_NAMES}
+        self._running: Dict[int, int] = {priority: 0 for priority in PRIORITY_NAMES}
+
+    def submit(
+        self,
+        priority: int,
+        user_key: str,
+        fn: Callable[..., Any],
+        *args,
+        weight: int = 1,
+        **kwargs
+    ) -> Future:
+        task = _Task(fn, args, kwargs)
+        with self._cond:
+            self._ensure_workers()
+            self._queues[priority].push(user_key, weight, task)
+            self._cond.notify_all()
+        return task.future
+
+    async def run(self, priority: int, user_key: str, fn: Callable[..., Any], *args, weight: int = 1, **kwargs) -> Any:
+        """비동기 엔드포인트에서 이벤트 루프를 막지 않고 작업 결과를 기다립니다."""
+        future = self.submit(priority, user_key, fn, *args, weight=weight, **kwargs)
+        return await asyncio.wrap_future(future)
+
+    def call(self, priority: int, user_key: str, fn: Callable[..., Any], *args, weight: int = 1, **kwargs) -> Any:
+        """동기 코드에서 작업 결과를 기다립니다."""
+        return self.submit(priority, user_key, fn, *args, weight=weight, **kwargs).result()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """우선순위 클래스별 대기 작업 수, 실행 중인 작업 수, 대기 시간 분위수(초)를 반환합니다."""
+        with self._cond:
+            stats = {}
+            for priority, name in PRIORITY_NAMES.items():
+                waits = sorted(self._waits[priority])
+                stats[name] = {
+                    "queued": self._queues[priority].size,
+                    "users": len(self._queues[priority].queues),
+                    "running": self._running[priority],
+                    "wait_p50": waits[len(waits) // 2] if waits else 0.0,
+                    "wait_p99": waits[min(len(waits) - 1, int(len(waits) * 0.99))] if waits else 0.0,
+                }
+            return {
+                "max_workers": self.max_workers,
+                "reserved_interactive": self.reserved_interactive,
+                "classes": stats,
+            }
+
+    def _ensure_workers(self) -> None:
+        if self._threads:
+            return
+        for index in range(self.max_workers):
+            # 앞쪽 작업자는 대화형 요청만 처리
+            interactive_only = index < self.reserved_interactive
+            thread = threading.Thread(
+                target=self._worker, args=(interactive_only,), name=f"summary-worker-{index}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def _next_task(self, interactive_only: bool) -> Tuple[Optional[int], Optional[_Task]]:
+        priorities = [PRIORITY_INTERACTIVE] if interactive_only else sorted(PRIORITY_NAMES)
+        for priority in priorities:
+            task = self._queues[priority].pop()
+            if task is not None:
+                return priority, task
+        return None, None
+
+    def _worker(self, interactive_only: bool) -> None:
+        while True:
+            with self._cond:
+                priority, task = self._next_task(interactive_only)
+                while task is None:
+                    self._cond.wait()
+                    priority, task = self._next_task(interactive_only)
+                self._waits[priority].append(time.monotonic() - task.enqueued_at)
+                self._running[priority] += 1
+
+            if task.future.set_running_or_notify_cancel():
+                try:
+                    task.future.set_result(task.fn(*task.args, **task.kwargs))
+                except BaseException as e:
+                    task.future.set_exception(e)
+
+            with self._cond:
+                self._running[priority] -= 1
+
+
+summary_work_scheduler = SummaryWorkScheduler()
@@ -0,0 +1,189 @@
+from array import array
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional
+from sqlalchemy.exc import IntegrityError
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.db.models import TranscriptCache
+import logging
+import struct
+import sys
+import zlib
+
+logger = logging.getLogger(__name__)
+
+# 자막 종류
+KIND_MANUAL = "manual"
+KIND_AUTO = "auto"
+KIND_NONE = "none"
+
+# 같은 언어에 여러 종류가 저장된 경우의 우선순위
+_KIND_PRIORITY = {KIND_MANUAL: 0, KIND_AUTO: 1, KIND_NONE: 2}
+
+_HEADER = struct.Struct("<I")
+
+
+def encode_segments(segments: List[Dict[str, Any]]) -> bytes:
+    """
+    자막 세그먼트를 배열 기반의 압축 바이트로 변환합니다.
+    형식: [개수(uint32)] [start float64 배열] [duration float64 배열] [NUL로 구분된 UTF-8 텍스트]
+    """
+    starts = array('d', (float(seg.get('start', 0.0)) for seg in segments))
+    durations = array('d', (float(seg.get('duration', 0.0)) for seg in segments))
+    if sys.byteorder != 'little':
+        starts.byteswap()
+        durations.byteswap()
+    texts = "\x00".join((seg.get('text') or "").replace("\x00", "") for seg in segments)
+    payload = _HEADER.pack(len(segments)) + starts.tobytes() + durations.tobytes() + texts.encode('utf-8')
+    return zlib.compress(payload, 6)
+
+
+def decode_segments(blob: bytes) -> List[Dict[str, Any]]:
+    """encode_segments로 만든 바이트를 자막 세그먼트 목록으로 복원합니다."""
+    payload = zlib.decompress(blob)
+    (count,) = _HEADER.unpack_from(payload, 0)
+    if count == 0:
+        return []
+    offset = _HEADER.size
+    width = count * 8
+    starts = array('d')
+    starts.frombytes(payload[offset:offset + width])
+    durations = array('d')
+    durations.frombytes(payload[offset + width:offset + 2 * width])
+    if sys.byteorder != 'little':
+        starts.byteswap()
+        durations.byteswap()
+    texts = payload[offset + 2 * width:].decode('utf-8').split("\x00")
+    return [
+        {"text": texts[i], "start": starts[i], "duration": durations[i]}
+        for i in range(count)
+    ]
+
+
+class StoredTranscript:
+    """
+    저장소에서 읽은 자막. 세그먼트는 처음 접근할 때만 압축을 해제합니다.
+    """
+    __slots__ = ("video_id", "language", "kind", "track_language", "segment_count", "_blob", "_segments")
+
+    def __init__(self, video_id: str, language: str, kind: str, track_language: Optional[str],
+                 segment_count: int, blob: Optional[bytes]):
+        self.video_id = video_id
+        self.language = language
+        self.kind = kind
+        self.track_language = track_language
+        self.segment_count = segment_count or 0
+        self._blob = blob
+        self._segments = None
+
+    @property
+    def is_missing(self) -> bool:
+        return self.kind == KIND_NONE
+
+    @property
+    def segments(self) -> List[Dict[str, Any]]:
+        if self._segments is None:
+            self._segments = decode_segments(self._blob) if self._blob else []
+            self._blob = None
+        return self._segments
+
+    def __len__(self) -> int:
+        return self.segment_count
+
+
+class TranscriptStore:
+    """
+    (video_id, language, kind) 단위로 자막을 영구 저장하는 저장소.
+    '자막 없음' 결과도 기록하여 자막이 없는 비디오에 대한 반복 요청을 막습니다.
+    """
+    def __init__(self, session_factory=SessionLocal, missing_ttl_hours: int = None):
+        self.session_factory = session_factory
+        if missing_ttl_hours is None:
+            missing_ttl_hours = settings.TRANSCRIPT_MISSING_TTL_HOURS
+        self.missing_ttl = timedelta(hours=missing_ttl_hours)
+
+    def get(self, video_id: str, language: str) -> Optional[StoredTranscript]:
+        """저장된 자막을 반환합니다. 수동 자막을 자동 생성 자막보다 우선합니다."""
+        db = self.session_factory()
+        try:
+            rows = db.query(TranscriptCache).filter(
+                TranscriptCache.video_id == video_id,
+                TranscriptCache.language == language
+            ).all()
+            if not rows:
+                return None
+            row = min(rows, key=lambda r: _KIND_PRIORITY.get(r.kind, len(_KIND_PRIORITY)))
+            if row.kind == KIND_NONE and row.created_at and datetime.utcnow() - row.created_at > self.missing_ttl:
+                # 오래된 '자막 없음' 기록은 무시하고 다시 확인
+                return None
+            return StoredTranscript(
+                row.video_id, row.language, row.kind, row.track_language,
+                row.segment_count, row.segments
+            )
+        except Exception as e:
+            logger.error(f"자막 저장소 조회 오류: {str(e)}")
+            return None
+        finally:
+            db.close()
+
+    def put(self, video_id: str, language: str, kind: str, segments: List[Dict[str, Any]],
+            track_language: Optional[str] = None) -> None:
+        """자막을 저장합니다. 자막을 찾은 경우 기존 '자막 없음' 기록은 제거합니다."""
+        if not segments:
+            self.mark_missing(video_id, language)
+            return
+        self._upsert(video_id, language, kind, track_language, len(segments), encode_segments(segments))
+
+    def mark_missing(self, video_id: str, language: str) -> None:
+        """자막이 없다는 결과를 기록합니다."""
+        self._upsert(video_id, language, KIND_NONE, None, 0, None)
+
+    def purge_fallback(self) -> List[str]:
+        """
+        pytube 대체 방법으로 저장된 자막(트랙 언어 없는 자동 자막)을 삭제하고 해당 비디오 ID를 반환합니다.
+        이전에는 자막이 없을 때 제목/설명으로 만든 가짜 자막이 이렇게 저장되었으므로 다시 가져오게 합니다.
+        """
+        db = self.session_factory()
+        try:
+            query = db.query(TranscriptCache).filter(
+                TranscriptCache.kind == KIND_AUTO,
+                TranscriptCache.track_language.is_(None)
+            )
+            video_ids = sorted({row.video_id for row in query.with_entities(TranscriptCache.video_id).all()})
+            query.delete(synchronize_session=False)
+            db.commit()
+            return video_ids
+        except Exception as e:
+            db.rollback()
+            logger.error(f"대체 자막 삭제 오류: {str(e)}")
+            raise
+        finally:
+            db.close()
+
+    def _upsert(self, video_id: str, language: str, kind: str, track_language: Optional[str],
+                segment_count: int, blob: Optional[bytes]) -> None:
+        db = self.session_factory()
+        try:
+            query = db.query(TranscriptCache).filter(
+                TranscriptCache.video_id == video_id,
+                TranscriptCache.language == language
+            )
+            if kind != KIND_NONE:
+                query.filter(TranscriptCache.kind == KIND_NONE).delete(synchronize_session=False)
+            row = query.filter(TranscriptCache.kind == kind).first()
+            if row is None:
+                row = TranscriptCache(video_id=video_id, language=language, kind=kind)
+                db.add(row)
+            row.track_language = track_language
+            row.segment_count = segment_count
+            row.segments = blob
+            row.created_at = datetime.utcnow()
+            db.commit()
+        except IntegrityError:
+            # 다른 요청이 먼저 저장한 경우
+            db.rollback()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"자막 저장소 저장 오류: {str(e)}")
+        finally:
+            db.close()
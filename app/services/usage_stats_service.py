@@ -0,0 +1,80 @@
+from datetime import date
+from typing import Any, Dict, List, Optional
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.db.models import UsageRollup
+import logging
+
+logger = logging.getLogger(__name__)
+
+# get_stats에서 묶을 수 있는 기준
+GROUP_COLUMNS = {
+    "day": UsageRollup.day,
+    "summary_type": UsageRollup.summary_type,
+    "model": UsageRollup.model,
+    "user": UsageRollup.user_id,
+}
+
+
+class UsageStatsService:
+    """
+    사용자/날짜/요약 종류/모델별로 미리 집계된 사용량(usage_rollups)을 조회합니다.
+    히스토리 테이블을 세지 않으므로 한도 확인과 통계 조회 비용이 히스토리 크기와 관계없습니다.
+    """
+    def __init__(self, db: Session):
+        self.db = db
+
+    def count_summaries(self, user_id: int, since: date) -> int:
+        """since 날짜(UTC)부터 사용자가 만든 요약 수."""
+        count = self.db.query(func.coalesce(func.sum(UsageRollup.summary_count), 0)).filter(
+            UsageRollup.user_id == user_id,
+            UsageRollup.day >= since.isoformat()
+        ).scalar()
+        return int(count or 0)
+
+    def get_stats(
+        self,
+        user_id: Optional[int] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        summary_type: Optional[str] = None,
+        model: Optional[str] = None,
+        group_by: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """조건에 맞는 요약 수와 토큰 합계를 group_by 기준(day, summary_type, model, user)별로 반환합니다."""
+        group_by = [name for name in (group_by or []) if name in GROUP_COLUMNS]
+        group_columns = [GROUP_COLUMNS[name].label(name) for name in group_by]
+        query = self.db.query(
+            *group_columns,
+            func.sum(UsageRollup.summary_count).label("summary_count"),
+            func.sum(UsageRollup.tokens_total).label("tokens_total")
+        )
+        if user_id is not None:
+            query = query.filter(UsageRollup.user_id == user_id)
+        if start_date:
+            query = query.filter(UsageRollup.day >= start_date.isoformat())
+        if end_date:
+            query = query.filter(UsageRollup.day <= end_date.isoformat())
+        if summary_type:
+            query = query.filter(UsageRollup.summary_type == summary_type)
+        if model:
+            query = query.filter(UsageRollup.model == model)
+        if group_columns:
+            query = query.group_by(*[GROUP_COLUMNS[name] for name in group_by]).order_by(
+                *[GROUP_COLUMNS[name] for name in group_by]
+            )
+
+        rows = []
+        totals = {"summary_count": 0, "tokens_total": 0}
+        for row in query.all():
+            item = row._asdict()
+            item["summary_count"] = int(item["summary_count"] or 0)
+            item["tokens_total"] = int(item["tokens_total"] or 0)
+            totals["summary_count"] += item["summary_count"]
+            totals["tokens_total"] += item["tokens_total"]
+            rows.append(item)
+        return {
+            "group_by": group_by,
+            "totals": totals,
+            "rows": rows if group_columns else []
+        }
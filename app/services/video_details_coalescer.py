@@ -0,0 +1,112 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from collections import OrderedDict
+from typing import Callable, Dict, Any, List, Optional, Tuple
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# videos.list 한 번에 요청할 수 있는 최대 ID 수
+MAX_BATCH_SIZE = 50
+
+
+class VideoDetailsCoalescer:
+    """
+    여러 호출자(채널, 요청)의 비디오 상세 정보 요청을 짧은 시간 동안 모아
+    최대 50개 ID 단위의 videos.list 요청으로 합친 뒤 결과를 각 호출자에게 나눠줍니다.
+    """
+    def __init__(
+        self,
+        fetch_batch: Callable[[List[str]], Dict[str, Dict[str, Any]]],
+        window_seconds: float = 0.05,
+        batch_size: int = MAX_BATCH_SIZE,
+        max_concurrent_batches: int = 4
+    ):
+        self.fetch_batch = fetch_batch
+        self.window_seconds = window_seconds
+        self.batch_size = max(1, min(batch_size, MAX_BATCH_SIZE))
+        self._pending: "OrderedDict[str, Tuple[Future, float]]" = OrderedDict()
+        self._cond = threading.Condition()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrent_batches, thread_name_prefix="video-details"
+        )
+        self._thread: Optional[threading.Thread] = None
+        self._calls = 0
+        self._requested_ids = 0
+
+    def submit(self, video_ids: List[str]) -> Dict[str, Future]:
+        """비디오 ID별 Future를 반환합니다. 같은 ID가 이미 대기 중이면 같은 Future를 공유합니다."""
+        futures = {}
+        with self._cond:
+            self._ensure_dispatcher()
+            now = time.monotonic()
+            for video_id in video_ids:
+                entry = self._pending.get(video_id)
+                if entry is None:
+                    entry = (Future(), now)
+                    self._pending[video_id] = entry
+                futures[video_id] = entry[0]
+            self._cond.notify()
+        return futures
+
+    def fetch(self, video_ids: List[str], timeout: Optional[float] = 60.0) -> Dict[str, Dict[str, Any]]:
+        """상세 정보를 가져올 때까지 기다립니다. 찾지 못한 비디오는 결과에서 제외됩니다."""
+        return self.collect(self.submit(video_ids), timeout)
+
+    @staticmethod
+    def collect(futures: Dict[str, Future], timeout: Optional[float] = 60.0) -> Dict[str, Dict[str, Any]]:
+        results = {}
+        for video_id, future in futures.items():
+            details = future.result(timeout=timeout)
+            if details is not None:
+                results[video_id] = details
+        return results
+
+    def get_stats(self) -> Dict[str, Any]:
+        """요청 횟수, 요청한 ID 수, 평균 배치 채움 비율을 반환합니다."""
+        with self._cond:
+            return {
+                "calls": self._calls,
+                "requested_ids": self._requested_ids,
+                "pending_ids": len(self._pending),
+                "fill_factor": self._requested_ids / (self._calls * self.batch_size) if self._calls else 0.0
+            }
+
+    def _ensure_dispatcher(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run, name="video-details-coalescer", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                # 가장 오래 기다린 요청 기준으로 대기 시간이 지나거나 배치가 가득 찰 때까지 모음
+                oldest = next(iter(self._pending.values()))[1]
+                while len(self._pending) < self.batch_size:
+                    remaining = oldest + self.window_seconds - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = []
+                while self._pending and len(batch) < self.batch_size:
+                    video_id, (future, _) = self._pending.popitem(last=False)
+                    batch.append((video_id, future))
+                self._calls += 1
+                self._requested_ids += len(batch)
+            self._executor.submit(self._dispatch, batch)
+
+    def _dispatch(self, batch: List[Tuple[str, Future]]) -> None:
+        try:
+            results = self.fetch_batch([video_id for video_id, _ in batch])
+        except Exception as e:
+            logger.error(f"비디오 상세 정보 일괄 요청 오류: {str(e)}")
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        for video_id, future in batch:
+            future.set_result(results.get(video_id))
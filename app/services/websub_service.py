@@ -0,0 +1,178 @@
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Any, Optional, Tuple
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.models import WebSubSubscription
+import xml.etree.ElementTree as ET
+import hashlib
+import hmac
+import logging
+
+logger = logging.getLogger(__name__)
+
+TOPIC_URL = "https://www.youtube.com/xml/feeds/videos.xml?channel_id={channel_id}"
+
+# Atom 알림에서 사용하는 네임스페이스
+_NS = {
+    "atom": "http://www.w3.org/2005/Atom",
+    "yt": "http://www.youtube.com/xml/schemas/2015",
+    "at": "http://purl.org/atompub/tombstones/1.0",
+}
+
+
+class WebSubService:
+    """
+    YouTube 채널 업로드 알림을 WebSub(PubSubHubbub) 허브를 통해 푸시로 받기 위한 서비스.
+    구독 요청/갱신, 구독 확인(intent verification), 알림 서명 검증과 Atom 파싱을 담당합니다.
+    """
+    def __init__(self, hub_url: str = None, callback_url: str = None, secret: str = None,
+                 lease_seconds: int = None):
+        self.hub_url = hub_url or settings.WEBSUB_HUB_URL
+        self.callback_url = callback_url if callback_url is not None else settings.WEBSUB_CALLBACK_URL
+        self.secret = secret if secret is not None else settings.WEBSUB_SECRET
+        self.lease_seconds = lease_seconds or settings.WEBSUB_LEASE_SECONDS
+
+    @property
+    def enabled(self) -> bool:
+        """콜백 URL과 비밀 값이 모두 있어야 구독합니다. 비밀 값 없이 받은 알림은 위조 여부를 알 수 없습니다."""
+        return bool(self.callback_url and self.secret)
+
+    @staticmethod
+    def topic_for(channel_id: str) -> str:
+        return TOPIC_URL.format(channel_id=channel_id)
+
+    def _topic_secret(self, topic: str) -> str:
+        """구독별 서명 비밀 값. 전역 비밀 값에서 토픽마다 다른 값을 만듭니다."""
+        if not self.secret:
+            return ""
+        return hmac.new(self.secret.encode('utf-8'), topic.encode('utf-8'), hashlib.sha256).hexdigest()
+
+    def subscribe(self, channel_id: str, db: Session, mode: str = "subscribe") -> bool:
+        """허브에 구독(또는 구독 해지)을 요청합니다. 실제 활성화는 허브의 확인 요청 이후에 이루어집니다."""
+        if not self.enabled:
+            if self.callback_url:
+                logger.warning("WEBSUB_SECRET이 설정되지 않아 WebSub 구독 요청을 건너뜁니다.")
+            else:
+                logger.debug("WebSub 콜백 URL이 설정되지 않아 구독 요청을 건너뜁니다.")
+            return False
+
+        topic = self.topic_for(channel_id)
+        data = {
+            "hub.callback": self.callback_url,
+            "hub.topic": topic,
+            "hub.mode": mode,
+            "hub.verify": "async",
+            "hub.lease_seconds": str(self.lease_seconds),
+            "hub.secret": self._topic_secret(topic),
+        }
+
+        subscription = db.query(WebSubSubscription).filter(WebSubSubscription.channel_id == channel_id).first()
+        if subscription is None:
+            subscription = WebSubSubscription(channel_id=channel_id, topic=topic)
+            db.add(subscription)
+
+        try:
+            import httpx
+
+            response = httpx.post(self.hub_url, data=data, timeout=10.0)
+            accepted = response.status_code in (202, 204)
+            if accepted:
+                logger.info(f"WebSub {mode} 요청 완료: {channel_id}")
+                if mode == "subscribe" and subscription.status != "active":
+                    subscription.status = "pending"
+            else:
+                logger.warning(f"WebSub {mode} 요청 거부 ({response.status_code}): {response.text[:200]}")
+                subscription.status = "failed"
+            db.commit()
+            return accepted
+        except Exception as e:
+            db.rollback()
+            logger.error(f"WebSub {mode} 요청 오류 ({channel_id}): {str(e)}")
+            return False
+
+    def verify_intent(self, mode: str, topic: str, challenge: str, lease_seconds: Optional[int],
+                      db: Session) -> Optional[str]:
+        """허브의 구독 확인 요청을 검증하고, 우리가 요청한 구독이면 challenge 값을 반환합니다."""
+        subscription = db.query(WebSubSubscription).filter(WebSubSubscription.topic == topic).first()
+        if subscription is None or not challenge:
+            logger.warning(f"알 수 없는 WebSub 토픽에 대한 확인 요청: {topic}")
+            return None
+
+        now = datetime.now(timezone.utc)
+        if mode == "subscribe":
+            lease = lease_seconds or self.lease_seconds
+            subscription.status = "active"
+            subscription.lease_seconds = lease
+            subscription.expires_at = now + timedelta(seconds=lease)
+            subscription.verified_at = now
+        elif mode == "unsubscribe":
+            subscription.status = "unsubscribed"
+            subscription.expires_at = None
+        else:
+            return None
+        db.commit()
+        logger.info(f"WebSub {mode} 확인 완료: {subscription.channel_id}")
+        return challenge
+
+    def verify_signature(self, body: bytes, signature_header: Optional[str], topic: str) -> bool:
+        """X-Hub-Signature 헤더(예: 'sha1=...')를 검증합니다. 비밀 값이 없으면 모든 알림을 거부합니다."""
+        secret = self._topic_secret(topic)
+        if not secret:
+            return False
+        if not signature_header or "=" not in signature_header:
+            return False
+        method, signature = signature_header.split("=", 1)
+        digestmod = {"sha1": hashlib.sha1, "sha256": hashlib.sha256, "sha512": hashlib.sha512}.get(method.lower())
+        if digestmod is None:
+            return False
+        expected = hmac.new(secret.encode('utf-8'), body, digestmod).hexdigest()
+        return hmac.compare_digest(expected, signature.strip().lower())
+
+    def parse_notification(self, body: bytes) -> List[Tuple[str, str]]:
+        """Atom 알림에서 (채널 ID, 비디오 ID) 목록을 추출합니다. 삭제 알림은 무시합니다."""
+        try:
+            root = ET.fromstring(body)
+        except ET.ParseError as e:
+            logger.warning(f"WebSub 알림 파싱 오류: {str(e)}")
+            return []
+
+        entries = []
+        for entry in root.findall("atom:entry", _NS):
+            video_id = entry.findtext("yt:videoId", default="", namespaces=_NS).strip()
+            channel_id = entry.findtext("yt:channelId", default="", namespaces=_NS).strip()
+            if video_id and channel_id:
+                entries.append((channel_id, video_id))
+        return entries
+
+    def mark_notified(self, channel_id: str, db: Session) -> None:
+        subscription = db.query(WebSubSubscription).filter(WebSubSubscription.channel_id == channel_id).first()
+        if subscription is not None:
+            subscription.last_notification_at = datetime.now(timezone.utc)
+            db.commit()
+
+    def renew_expiring(self, channel_ids: List[str], db: Session) -> int:
+        """구독이 없거나 곧 만료되는 채널의 구독을 갱신합니다. 요청한 구독 수를 반환합니다."""
+        if not self.enabled:
+            return 0
+
+        renew_before = datetime.now(timezone.utc) + timedelta(hours=settings.WEBSUB_RENEW_BEFORE_HOURS)
+        subscriptions = {
+            s.channel_id: s for s in db.query(WebSubSubscription).filter(
+                WebSubSubscription.channel_id.in_(channel_ids)
+            ).all()
+        } if channel_ids else {}
+
+        renewed = 0
+        for channel_id in channel_ids:
+            subscription = subscriptions.get(channel_id)
+            if subscription is not None and subscription.status == "active" and subscription.expires_at:
+                expires_at = subscription.expires_at
+                if expires_at.tzinfo is None:
+                    expires_at = expires_at.replace(tzinfo=timezone.utc)
+                if expires_at > renew_before:
+                    continue
+            if self.subscribe(channel_id, db):
+                renewed += 1
+
+        logger.info(f"WebSub 구독 갱신 요청: {renewed}개 채널")
+        return renewed
@@ -0,0 +1,215 @@
+from typing import Callable, Dict, Any, List, Optional
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.services.job_queue import JobQueue, job_queue
+import json
+import logging
+import os
+import socket
+import threading
+import uuid
+
+logger = logging.getLogger(__name__)
+
+JOB_SUMMARIZE_VIDEO = "summarize_video"
+JOB_INGEST_VIDEOS = "ingest_videos"
+
+
+def summarize_video(payload: Dict[str, Any]) -> None:
+    """
+    새 비디오의 자막 지문으로 중복 여부를 확인하고, 자막 요약과 핵심 구문을 미리 만들어 둡니다.
+    재업로드로 확인되면 요약하지 않고 원본의 요약을 그대로 사용합니다.
+    """
+    from app.models.models import Video
+    from app.services.duplicate_checker import DuplicateChecker
+    from app.services.history_service import HistoryService
+    from app.services.summarizer_service import SummarizerService
+    from app.services.summary_work_scheduler import summary_work_scheduler, PRIORITY_BACKGROUND
+    from app.services.youtube_service import YouTubeService
+
+    db = SessionLocal()
+    try:
+        video = db.query(Video).filter(Video.id == payload["video_id"]).first()
+        if video is None or video.is_summarized:
+            return
+
+        youtube_service = YouTubeService()
+        language = settings.PREWARM_SUMMARY_LANGUAGE
+        
+        # 자막 지문은 자막을 처음 가져올 때 한 번만 계산 (가져온 자막은 자막 저장소에 남아 요약에 재사용)
+        if video.transcript_minhash is None:
+            transcript = youtube_service.get_transcript(video.video_id, language)
+            transcript_text = " ".join(segment.get("text", "") for segment in transcript)
+            if transcript_text.strip():
+                DuplicateChecker().check_transcript(video, transcript_text, db)
+                db.commit()
+
+        if video.is_duplicate:
+            original = video.duplicate_of
+            if original is not None and original.is_summarized:
+                video.summary = original.summary
+                video.key_phrases = original.key_phrases
+                video.is_summarized = True
+                db.commit()
+            # 원본이 아직 요약되지 않았으면 원본 요약 후 함께 채워짐
+            return
+
+        if settings.PREWARM_YOUTUBE_SUMMARIES:
+            # /summarize/youtube 와 같은 기본 조건으로 자막 요약을 미리 만들어 히스토리에 저장
+            video_url = f"https://www.youtube.com/watch?v={video.video_id}"
+            model = settings.DEFAULT_MODEL
+            result = summary_work_scheduler.call(
+                PRIORITY_BACKGROUND, "ingestion", youtube_service.summarize_video,
+                video_url, language_code=language, model=model
+            )
+            if "error" in result:
+                raise RuntimeError(result["error"])
+
+            HistoryService(db).save_youtube_summary(
+                video_url=video_url,
+                video_title=result.get("title", "No Title"),
+                channel_name=result.get("channel", "No Channel Info"),
+                original_transcript=result.get("transcript", ""),
+                summary_text=result["summary"],
+                key_phrases=result.get("keywords"),
+                model_used=model,
+                extra_info=HistoryService.youtube_source_info(result, language),
+                tokens_used=result.get("tokens_used")
+            )
+            video.summary = result["summary"]
+            video.key_phrases = json.dumps(result.get("keywords") or [], ensure_ascii=False)
+            video.summary_language = language
+        else:
+            result = summary_work_scheduler.call(
+                PRIORITY_BACKGROUND, "ingestion", SummarizerService().summarize_text,
+                video.description or video.title or "",
+                max_length=video.summary_length or settings.DEFAULT_MAX_LENGTH
+            )
+            if "error" in result:
+                # 실패한 요약은 저장하지 않고 재시도
+                raise RuntimeError(result.get("details") or result["error"])
+            video.summary = result["summary"]
+        video.is_summarized = True
+
+        # 이 비디오를 원본으로 하는 재업로드에도 같은 요약 사용
+        db.query(Video).filter(
+            Video.duplicate_of_id == video.id,
+            Video.is_summarized == False
+        ).update({
+            Video.summary: video.summary,
+            Video.key_phrases: video.key_phrases,
+            Video.is_summarized: True
+        }, synchronize_session=False)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def ingest_videos(payload: Dict[str, Any]) -> None:
+    """푸시 알림으로 받은 비디오를 추가합니다."""
+    from app.services.scheduler_service import get_scheduler_service
+    get_scheduler_service().ingest_videos(payload["channel_id"], payload["video_ids"])
+
+
+DEFAULT_HANDLERS: Dict[str, Callable[[Dict[str, Any]], None]] = {
+    JOB_SUMMARIZE_VIDEO: summarize_video,
+    JOB_INGEST_VIDEOS: ingest_videos,
+}
+
+
+class WorkerService:
+    """
+    작업 큐에서 작업을 가져와 처리하는 작업자.
+    작업을 처리하는 동안 주기적으로 임대를 연장하며, 여러 프로세스에서 동시에 실행할 수 있습니다.
+    """
+    def __init__(
+        self,
+        queue: JobQueue = job_queue,
+        handlers: Optional[Dict[str, Callable[[Dict[str, Any]], None]]] = None,
+        job_types: Optional[List[str]] = None,
+        concurrency: Optional[int] = None,
+        poll_seconds: Optional[float] = None
+    ):
+        self.queue = queue
+        self.handlers = dict(handlers or DEFAULT_HANDLERS)
+        self.job_types = job_types or list(self.handlers)
+        self.concurrency = concurrency or settings.WORKER_CONCURRENCY
+        self.poll_seconds = poll_seconds or settings.WORKER_POLL_SECONDS
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> None:
+        for index in range(self.concurrency):
+            thread = threading.Thread(
+                target=self.run_forever,
+                args=(f"{self.worker_id}/{index}",),
+                name=f"job-worker-{index}",
+                daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"작업자 시작: {self.worker_id} (동시 처리 {self.concurrency}개, 작업 유형 {self.job_types})")
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """새 작업을 가져오지 않고 처리 중인 작업이 끝날 때까지 기다립니다."""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def wait(self) -> None:
+        while any(thread.is_alive() for thread in self._threads):
+            self._stop.wait(1.0)
+
+    def run_forever(self, worker_id: Optional[str] = None) -> None:
+        worker_id = worker_id or self.worker_id
+        while not self._stop.is_set():
+            try:
+                if not self.run_once(worker_id):
+                    self._stop.wait(self.poll_seconds)
+            except Exception as e:
+                logger.error(f"작업자 실행 중 오류: {str(e)}")
+                self._stop.wait(self.poll_seconds)
+
+    def run_once(self, worker_id: Optional[str] = None) -> bool:
+        """작업 하나를 처리합니다. 처리할 작업이 없으면 False를 반환합니다."""
+        worker_id = worker_id or self.worker_id
+        job = self.queue.claim(worker_id, self.job_types)
+        if job is None:
+            return False
+
+        handler = self.handlers.get(job["job_type"])
+        if handler is None:
+            self.queue.fail(job["id"], worker_id, f"알 수 없는 작업 유형: {job['job_type']}", 1, 1)
+            return True
+
+        # 처리하는 동안 임대 시간의 1/3마다 임대 연장
+        done = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._heartbeat, args=(job["id"], worker_id, done), daemon=True
+        )
+        heartbeat.start()
+        error = None
+        try:
+            handler(job["payload"])
+        except Exception as e:
+            error = str(e) or e.__class__.__name__
+        finally:
+            done.set()
+            heartbeat.join()
+
+        if error is None:
+            self.queue.complete(job["id"], worker_id)
+        else:
+            self.queue.fail(job["id"], worker_id, error, job["attempts"], job["max_attempts"])
+        return True
+
+    def _heartbeat(self, job_id: int, worker_id: str, done: threading.Event) -> None:
+        interval = max(1.0, settings.JOB_LEASE_SECONDS / 3)
+        while not done.wait(interval):
+            if not self.queue.extend_lease(job_id, worker_id):
+                return
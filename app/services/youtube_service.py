@@ -1,18 +1,36 @@
 from googleapiclient.discovery import build
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from app.core.config import settings
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Iterator
 import random
 import logging
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from googleapiclient.errors import HttpError
+from googleapiclient.http import build_http
+from app.services.etag_cache import etag_cache
+from app.services.video_details_coalescer import VideoDetailsCoalescer
+from app.services.transcript_store import TranscriptStore, KIND_MANUAL, KIND_AUTO, KIND_NONE
+import threading
 import time
 
 logger = logging.getLogger(__name__)
 
+# 작업 스레드별 HTTP 객체 저장소
+_thread_local = threading.local()
+
 class YouTubeService:
-    def __init__(self, use_mock_data: bool = False):
+    # 비디오 상세 정보 요청 병합기 (프로세스 전체 공유)
+    _shared_coalescer: Optional[VideoDetailsCoalescer] = None
+    _coalescer_lock = threading.Lock()
+    # 병합기가 사용하는 API 키별 클라이언트 (특정 인스턴스의 키에 묶이지 않음)
+    _details_clients: Dict[str, Any] = {}
+
+    def __init__(self, use_mock_data: bool = False, transcript_store: Optional[TranscriptStore] = None):
+        # 자막 저장소
+        self.transcript_store = transcript_store or TranscriptStore()
+        
         # API 키 체크
         self.api_key = settings.YOUTUBE_API_KEY
         self.use_mock_data = use_mock_data or not self.api_key
@@ -258,117 +276,324 @@ class YouTubeService:
             })
         return videos
 
-    def get_channel_videos(self, channel_id: str, max_results: int = 50) -> List[Dict[str, Any]]:
-        def request():
-            try:
-                # First, get the uploads playlist ID
-                logger.info(f"채널 정보 요청: 채널 ID={channel_id}")
-                request = self.youtube.channels().list(
-                    part="contentDetails,snippet",
-                    id=channel_id
-                )
-                response = request.execute()
-                
-                if not response.get('items'):
-                    logger.warning(f"채널 {channel_id}에 대한 정보를 찾을 수 없음")
-                    
-                    # 채널 ID가 핸들 또는 사용자 정의 URL인 경우 검색 시도
-                    if channel_id.startswith('@') or channel_id.startswith('c/') or channel_id.startswith('user/'):
-                        logger.info(f"핸들 또는 커스텀 URL을 사용해 채널 검색 시도: {channel_id}")
-                        return self.search_by_handle_or_custom_url(channel_id)
-                    
-                    return []
-                
-                channel = response['items'][0]
-                channel_title = channel['snippet']['title']
-                logger.info(f"채널 제목: {channel_title}")
-                
-                # Get the uploads playlist ID
-                uploads_playlist_id = channel['contentDetails']['relatedPlaylists']['uploads']
-                logger.info(f"업로드 플레이리스트 ID: {uploads_playlist_id}")
-                
-                # Now get the videos from the uploads playlist
-                logger.info(f"채널 업로드 비디오 요청: 플레이리스트 ID={uploads_playlist_id}")
-                request = self.youtube.playlistItems().list(
-                    part="snippet",
-                    playlistId=uploads_playlist_id,
-                    maxResults=max_results
-                )
-                response = request.execute()
-                
-                videos = []
-                video_ids = []
-                for item in response.get('items', []):
-                    video_ids.append(item['snippet']['resourceId']['videoId'])
-                    
-                logger.info(f"총 {len(response.get('items', []))}개의 비디오 항목을 가져왔습니다.")
-                
-                # 비디오 상세 정보(조회수, 좋아요 수 등) 가져오기
-                if video_ids:
-                    batch_size = 50  # YouTube API 최대 제한
-                    video_details = {}
-                    
-                    for i in range(0, len(video_ids), batch_size):
-                        batch = video_ids[i:i + batch_size]
-                        details_request = self.youtube.videos().list(
-                            part="snippet,statistics,contentDetails",
-                            id=",".join(batch)
-                        )
-                        details_response = details_request.execute()
-                        
-                        for video in details_response.get('items', []):
-                            video_details[video['id']] = video
-                    
-                    # 비디오 정보 구성
-                    for item in response.get('items', []):
-                        video_id = item['snippet']['resourceId']['videoId']
-                        video_data = {
-                            'video_id': video_id,
-                            'title': item['snippet']['title'],
-                            'description': item['snippet'].get('description', ''),
-                            'thumbnail': item['snippet']['thumbnails'].get('high', {}).get('url', 
-                                          item['snippet']['thumbnails'].get('medium', {}).get('url', 
-                                          item['snippet']['thumbnails'].get('default', {}).get('url', ''))),
-                            'published_at': item['snippet'].get('publishedAt', ''),
-                            'channel_title': channel_title
-                        }
-                        
-                        # 상세 정보가 있으면 추가
-                        if video_id in video_details:
-                            details = video_details[video_id]
-                            stats = details.get('statistics', {})
-                            video_data.update({
-                                'view_count': int(stats.get('viewCount', 0)),
-                                'like_count': int(stats.get('likeCount', 0)),
-                                'comment_count': int(stats.get('commentCount', 0)),
-                                'duration': details.get('contentDetails', {}).get('duration', '')
-                            })
-                        
-                        videos.append(video_data)
-                
-                return videos
-                
-            except Exception as e:
-                logger.error(f"채널 비디오 가져오기 오류: {str(e)}")
-                return []
-        
+    def get_channel_videos(self, channel_id: str, max_results: int = 50,
+                           published_after: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """
+        채널의 업로드 비디오 목록을 최신순으로 반환합니다.
+        """
         try:
-            retries = 3
-            while retries > 0:
-                try:
-                    return request()
-                except HttpError as e:
-                    logger.warning(f"YouTube API HTTP 오류: {str(e)}")
-                    if e.resp.status in [429, 500, 503]:
-                        retries -= 1
-                        time.sleep(1)  # 재시도 전 잠시 대기
-                    else:
-                        raise
-            return []
+            videos = []
+            for batch in self.iter_channel_videos(channel_id, max_results=max_results, published_after=published_after):
+                videos.extend(batch)
+            return videos
         except Exception as e:
             logger.error(f"채널 비디오 요청 중 오류 발생: {str(e)}")
             return []
 
+    def iter_channel_videos(
+        self,
+        channel_id: str,
+        max_results: Optional[int] = None,
+        published_after: Optional[datetime] = None,
+        page_size: int = 50,
+        only_changed: bool = False
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        채널의 업로드 비디오를 최신순으로 페이지 단위(최대 50개)로 생성합니다.
+        nextPageToken을 따라가며 max_results 개수 또는 published_after 이전 비디오에 도달하면 멈춥니다.
+        각 페이지의 상세 정보(videos.list) 요청은 다른 호출자의 요청과 합쳐져 다음 페이지 요청과 동시에 진행됩니다.
+        호출자는 이미 알고 있는 비디오에 도달하면 순회를 중단하면 됩니다.
+        모든 요청은 ETag 조건부 요청으로 보내며, only_changed가 True이면
+        변경되지 않은(304) 페이지에서 즉시 멈춥니다. (정기 채널 확인용)
+        """
+        if self.use_mock_data:
+            videos = self._mock_channel_videos(channel_id, max_results or 10)
+            if published_after:
+                videos = [v for v in videos if v['published_at'] >= published_after]
+            if videos:
+                yield videos
+            return
+        
+        uploads = self._get_uploads_playlist(channel_id)
+        if uploads is None:
+            # 채널 ID가 핸들 또는 사용자 정의 URL인 경우 실제 채널 ID로 다시 시도
+            if channel_id.startswith('@') or channel_id.startswith('c/') or channel_id.startswith('user/'):
+                logger.info(f"핸들 또는 커스텀 URL을 사용해 채널 검색 시도: {channel_id}")
+                channel_info = self.get_channel_info(channel_id)
+                if "error" not in channel_info and channel_info['channel_id'] != channel_id:
+                    yield from self.iter_channel_videos(
+                        channel_info['channel_id'], max_results, published_after, page_size, only_changed
+                    )
+            return
+        
+        uploads_playlist_id, channel_title = uploads
+        cutoff = self._to_naive_utc(published_after) if published_after else None
+        page_size = max(1, min(page_size, 50))  # YouTube API 최대 제한
+        
+        coalescer = self._details_coalescer()
+        pending = None
+        page_token = None
+        collected = 0
+        while True:
+            logger.info(f"채널 업로드 비디오 요청: 플레이리스트 ID={uploads_playlist_id}, 페이지={page_token or '처음'}")
+            request = self.youtube.playlistItems().list(
+                part="snippet,contentDetails",
+                playlistId=uploads_playlist_id,
+                maxResults=page_size,
+                pageToken=page_token
+            )
+            response, not_modified = self._execute_conditional(
+                request,
+                f"playlistItems:{uploads_playlist_id}:{page_size}:{page_token or ''}",
+                channel_id
+            )
+            if not_modified and only_changed:
+                # 페이지가 변경되지 않았으므로 새 비디오가 없음
+                logger.info(f"채널 {channel_id}의 업로드 목록이 변경되지 않았습니다. (304)")
+                break
+            
+            items = []
+            reached_end = False
+            for item in response.get('items', []):
+                if max_results is not None and collected >= max_results:
+                    reached_end = True
+                    break
+                published_at = self._item_published_at(item)
+                if cutoff and published_at and self._parse_published_at(published_at) < cutoff:
+                    reached_end = True
+                    break
+                items.append(item)
+                collected += 1
+            
+            # 이번 페이지의 상세 정보 요청을 시작한 뒤 이전 페이지를 반환
+            current = None
+            if items:
+                video_ids = [item['snippet']['resourceId']['videoId'] for item in items]
+                current = (items, coalescer.submit(video_ids))
+            if pending:
+                yield self._build_channel_videos(pending[0], coalescer.collect(pending[1]), channel_title)
+            pending = current
+            
+            page_token = response.get('nextPageToken')
+            if reached_end or not page_token:
+                break
+        
+        if pending:
+            yield self._build_channel_videos(pending[0], coalescer.collect(pending[1]), channel_title)
+
+    def get_videos(self, video_ids: List[str], channel_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        비디오 ID 목록의 정보를 get_channel_videos와 같은 형식으로 반환합니다. (푸시 알림 처리용)
+        channel_id를 주면 조건부 요청 통계가 그 채널로 기록됩니다.
+        """
+        if self.use_mock_data:
+            return [
+                {
+                    'video_id': video_id,
+                    'title': f'모의 비디오 {video_id}',
+                    'description': '이것은 모의 비디오 설명입니다.',
+                    'published_at': datetime.now(),
+                    'channel_title': '모의 채널'
+                }
+                for video_id in video_ids
+            ]
+        
+        video_details = self._details_coalescer().fetch(video_ids)
+        videos = []
+        for video_id in video_ids:
+            details = video_details.get(video_id)
+            if not details:
+                continue
+            snippet = details.get('snippet', {})
+            thumbnails = snippet.get('thumbnails', {})
+            stats = details.get('statistics', {})
+            videos.append({
+                'video_id': video_id,
+                'title': snippet.get('title', ''),
+                'description': snippet.get('description', ''),
+                'thumbnail': thumbnails.get('high', {}).get('url', 
+                              thumbnails.get('medium', {}).get('url', 
+                              thumbnails.get('default', {}).get('url', ''))),
+                'published_at': snippet.get('publishedAt', ''),
+                'channel_title': snippet.get('channelTitle', ''),
+                'view_count': int(stats.get('viewCount', 0)),
+                'like_count': int(stats.get('likeCount', 0)),
+                'comment_count': int(stats.get('commentCount', 0)),
+                'duration': details.get('contentDetails', {}).get('duration', '')
+            })
+        return videos
+
+    def _get_uploads_playlist(self, channel_id: str) -> Optional[Tuple[str, str]]:
+        """채널의 업로드 플레이리스트 ID와 채널 제목을 반환합니다."""
+        logger.info(f"채널 정보 요청: 채널 ID={channel_id}")
+        request = self.youtube.channels().list(
+            part="contentDetails,snippet",
+            id=channel_id
+        )
+        response, _ = self._execute_conditional(request, f"channels:{channel_id}", channel_id)
+        
+        if not response.get('items'):
+            logger.warning(f"채널 {channel_id}에 대한 정보를 찾을 수 없음")
+            return None
+        
+        channel = response['items'][0]
+        uploads_playlist_id = channel['contentDetails']['relatedPlaylists']['uploads']
+        logger.info(f"채널 제목: {channel['snippet']['title']}, 업로드 플레이리스트 ID: {uploads_playlist_id}")
+        return uploads_playlist_id, channel['snippet']['title']
+
+    def _details_coalescer(self) -> VideoDetailsCoalescer:
+        """모든 인스턴스가 공유하는 비디오 상세 정보 요청 병합기를 반환합니다."""
+        with YouTubeService._coalescer_lock:
+            if YouTubeService._shared_coalescer is None:
+                YouTubeService._shared_coalescer = VideoDetailsCoalescer(
+                    YouTubeService._fetch_video_details_batch,
+                    window_seconds=settings.VIDEO_DETAILS_COALESCE_WINDOW_MS / 1000
+                )
+            return YouTubeService._shared_coalescer
+
+    @classmethod
+    def get_details_coalescer_stats(cls) -> Dict[str, Any]:
+        """비디오 상세 정보 요청 병합 통계(요청 횟수, 배치 채움 비율)를 반환합니다."""
+        if cls._shared_coalescer is None:
+            return {"calls": 0, "requested_ids": 0, "pending_ids": 0, "fill_factor": 0.0}
+        return cls._shared_coalescer.get_stats()
+
+    @classmethod
+    def _details_client(cls):
+        """현재 설정된 API 키의 클라이언트. 키가 바뀌면 새 키의 클라이언트를 만듭니다."""
+        api_key = settings.YOUTUBE_API_KEY
+        with cls._coalescer_lock:
+            client = cls._details_clients.get(api_key)
+            if client is None:
+                client = build('youtube', 'v3', developerKey=api_key)
+                cls._details_clients[api_key] = client
+            return client
+
+    @classmethod
+    def _fetch_video_details_batch(cls, video_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        비디오 상세 정보(조회수, 좋아요 수 등)를 한 번의 videos.list 요청(최대 50개)으로 가져옵니다.
+        모든 인스턴스가 공유하는 병합기에서 호출되므로 요청마다 설정의 현재 API 키를 사용하고,
+        할당량을 초과하면 다음 키로 전환합니다.
+        여러 채널의 요청을 합친 배치라 같은 ID 조합이 거의 반복되지 않고 통계도 자주 바뀌므로 조건부 요청은 보내지 않습니다.
+        """
+        for _ in range(max(1, min(10, len(settings.youtube_api_keys_list)))):
+            details_request = cls._details_client().videos().list(
+                part="snippet,statistics,contentDetails",
+                id=",".join(video_ids)
+            )
+            try:
+                details_response = cls._execute_with_retry(details_request, http=cls._thread_http())
+                break
+            except HttpError as e:
+                current_key = settings.YOUTUBE_API_KEY
+                if e.resp.status == 403 and "quota" in str(e).lower() and settings.next_youtube_api_key() != current_key:
+                    logger.warning(f"YouTube API 할당량 초과, 다음 키로 비디오 상세 정보를 다시 요청합니다: {e}")
+                    continue
+                raise
+        else:
+            raise Exception("YouTube API 요청 실패")
+        return {video['id']: video for video in details_response.get('items', [])}
+
+    def _build_channel_videos(self, items: List[Dict[str, Any]], video_details: Dict[str, Dict[str, Any]],
+                              channel_title: str) -> List[Dict[str, Any]]:
+        """플레이리스트 항목과 상세 정보를 합쳐 비디오 정보를 구성합니다."""
+        videos = []
+        for item in items:
+            video_id = item['snippet']['resourceId']['videoId']
+            thumbnails = item['snippet'].get('thumbnails', {})
+            video_data = {
+                'video_id': video_id,
+                'title': item['snippet']['title'],
+                'description': item['snippet'].get('description', ''),
+                'thumbnail': thumbnails.get('high', {}).get('url', 
+                              thumbnails.get('medium', {}).get('url', 
+                              thumbnails.get('default', {}).get('url', ''))),
+                'published_at': self._item_published_at(item),
+                'channel_title': channel_title
+            }
+            
+            # 상세 정보가 있으면 추가
+            if video_id in video_details:
+                details = video_details[video_id]
+                stats = details.get('statistics', {})
+                video_data.update({
+                    'view_count': int(stats.get('viewCount', 0)),
+                    'like_count': int(stats.get('likeCount', 0)),
+                    'comment_count': int(stats.get('commentCount', 0)),
+                    'duration': details.get('contentDetails', {}).get('duration', '')
+                })
+            
+            videos.append(video_data)
+        return videos
+
+    @classmethod
+    def _execute_conditional(cls, request, resource_key: str, channel_id: Optional[str] = None,
+                             http=None) -> Tuple[Dict[str, Any], bool]:
+        """
+        저장된 ETag로 조건부 요청(If-None-Match)을 보냅니다.
+        (응답, 변경 없음 여부)를 반환하며, 304인 경우 저장된 응답을 파싱 없이 그대로 반환합니다.
+        """
+        cached = etag_cache.get(resource_key)
+        if cached:
+            request.headers['If-None-Match'] = cached[0]
+        try:
+            response = cls._execute_with_retry(request, http=http)
+        except HttpError as e:
+            if cached and e.resp.status == 304:
+                etag_cache.record(channel_id, hit=True)
+                return cached[1], True
+            raise
+        
+        etag = response.get('etag')
+        if etag:
+            etag_cache.put(resource_key, etag, response)
+        etag_cache.record(channel_id, hit=False)
+        return response, False
+
+    @classmethod
+    def _execute_with_retry(cls, request, http=None, retries: int = 3):
+        """일시적인 오류(429, 500, 503)에 대해 지수 백오프로 개별 요청을 재시도합니다."""
+        # 여러 스레드(채널 확인 작업자)에서 호출되므로 스레드별 HTTP 객체 사용
+        http = http or cls._thread_http()
+        delay = 1.0
+        while True:
+            try:
+                return request.execute(http=http)
+            except HttpError as e:
+                if e.resp.status in [429, 500, 503] and retries > 0:
+                    logger.warning(f"YouTube API HTTP 오류, {delay:.0f}초 후 재시도: {str(e)}")
+                    retries -= 1
+                    time.sleep(delay)
+                    delay *= 2
+                    continue
+                raise
+
+    @staticmethod
+    def _thread_http():
+        """스레드별 HTTP 객체를 반환합니다. (httplib2는 스레드 안전하지 않음)"""
+        http = getattr(_thread_local, 'http', None)
+        if http is None:
+            http = build_http()
+            _thread_local.http = http
+        return http
+
+    @staticmethod
+    def _item_published_at(item: Dict[str, Any]) -> str:
+        """플레이리스트 항목의 실제 비디오 게시 시간을 반환합니다."""
+        return item.get('contentDetails', {}).get('videoPublishedAt') or item['snippet'].get('publishedAt', '')
+
+    @staticmethod
+    def _parse_published_at(value: str) -> datetime:
+        """YouTube API의 게시 시간 문자열을 UTC 기준 datetime으로 변환합니다."""
+        return datetime.strptime(value[:19], '%Y-%m-%dT%H:%M:%S')
+
+    @staticmethod
+    def _to_naive_utc(value: datetime) -> datetime:
+        if value.tzinfo is not None:
+            return value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
     def get_video_info(self, video_id: str) -> Dict[str, Any]:
         """
         유튜브 동영상의 기본 정보를 가져옵니다.
@@ -386,16 +611,11 @@ class YouTubeService:
                     "like_count": "100"
                 }
                 
-            request = self.youtube.videos().list(
-                part="snippet,contentDetails,statistics",
-                id=video_id
-            )
-            response = request.execute()
-            
-            if not response["items"]:
+            # 다른 요청과 합쳐서 조회
+            video_data = self._details_coalescer().fetch([video_id]).get(video_id)
+            if not video_data:
                 return {"error": "Video not found"}
             
-            video_data = response["items"][0]
             return {
                 "title": video_data["snippet"]["title"],
                 "description": video_data["snippet"]["description"],
@@ -462,7 +682,7 @@ class YouTubeService:
     def get_transcript(self, video_id: str, language_code: str = 'ko') -> List[Dict[str, Any]]:
         """
         유튜브 동영상의 자막을 가져옵니다.
-        언어 우선순위: 지정 언어 -> 자동 생성된 지정 언어 -> 영어 -> 어떤 언어든 가능한 것 -> 대체 방법(pytube) 시도
+        자막 저장소에 저장된 결과('자막 없음' 포함)가 있으면 네트워크 요청 없이 반환합니다.
         """
         # 모의 데이터 반환
         if self.use_mock_data:
@@ -475,93 +695,120 @@ class YouTubeService:
                     "duration": 2.0
                 })
             return mock_transcript
-            
+        
+        stored = self.transcript_store.get(video_id, language_code)
+        if stored is not None:
+            if stored.is_missing:
+                logger.info(f"자막이 없는 것으로 기록된 비디오입니다: {video_id} ({language_code})")
+                return []
+            logger.info(f"저장된 자막을 사용합니다: {video_id} ({language_code}, {stored.kind})")
+            return stored.segments
+        
+        result = self._fetch_transcript(video_id, language_code)
+        if result is None:
+            # 일시적인 오류는 기록하지 않음
+            return []
+        
+        transcript, kind, track_language = result
+        if transcript:
+            self.transcript_store.put(video_id, language_code, kind, transcript, track_language)
+        else:
+            self.transcript_store.mark_missing(video_id, language_code)
+        return transcript
+    
+    def _fetch_transcript(self, video_id: str, language_code: str = 'ko') -> Optional[Tuple[List[Dict[str, Any]], str, Optional[str]]]:
+        """
+        네트워크에서 자막을 가져와 (자막, 종류, 트랙 언어)를 반환합니다. 일시적인 오류 시 None을 반환합니다.
+        자막 목록을 한 번만 요청한 뒤 가장 적합한 트랙을 로컬에서 선택하므로 최대 1~2회의 요청으로 끝납니다.
+        사용 가능한 트랙이 없을 때만 pytube 대체 방법들을 동시에 시도합니다.
+        """
         try:
-            # 먼저 pytube를 통해 직접 자막 시도
-            try:
-                logger.info(f"먼저 pytube를 통해 직접 자막을 가져오려고 시도합니다: {video_id}")
-                transcript = self._get_transcript_directly_from_pytube(video_id, language_code)
-                if transcript:
-                    logger.info(f"pytube로 직접 자막을 성공적으로 가져왔습니다.")
-                    return transcript
-            except Exception as pytube_e:
-                logger.warning(f"pytube로 직접 자막 가져오기 실패: {str(pytube_e)}")
-            
-            # pytube 실패 시 youtube_transcript_api 사용
             from youtube_transcript_api import YouTubeTranscriptApi, NoTranscriptFound, TranscriptsDisabled, NoTranscriptAvailable
-            
-            try:
-                # 1. 먼저 지정된 언어로 시도
-                transcript = YouTubeTranscriptApi.get_transcript(video_id, languages=[language_code])
-                logger.info(f"지정된 언어({language_code})로 자막을 찾았습니다.")
-                return transcript
-            except (NoTranscriptFound, NoTranscriptAvailable) as e:
-                logger.warning(f"지정된 언어({language_code})로 자막을 찾을 수 없습니다: {str(e)}")
-                
-                try:
-                    # 2. 자동 생성된 지정 언어 자막 시도 (asr: Auto Speech Recognition)
-                    auto_language_code = f"{language_code}-generated"
-                    transcript = YouTubeTranscriptApi.get_transcript(video_id, languages=[auto_language_code])
-                    logger.info(f"자동 생성된 자막({auto_language_code})을 찾았습니다.")
-                    return transcript
-                except Exception as e:
-                    logger.warning(f"자동 생성된 자막(generated)도 찾을 수 없습니다: {str(e)}")
-                    
-                    try:
-                        # 2-1. 새로운 방법: asr 태그로 자동 생성된 자막 시도
-                        asr_auto_lang = f"asr-{language_code}"
-                        transcript = YouTubeTranscriptApi.get_transcript(video_id, languages=[asr_auto_lang])
-                        logger.info(f"ASR 자동 생성된 자막({asr_auto_lang})을 찾았습니다.")
-                        return transcript
-                    except Exception as e:
-                        logger.warning(f"ASR 자동 생성된 자막도 찾을 수 없습니다: {str(e)}")
-                        
-                        # 3. 영어 자막 시도 (일반 영어와 자동 생성 영어)
-                        for lang in ["en", "en-generated", "asr-en"]:
-                            try:
-                                transcript = YouTubeTranscriptApi.get_transcript(video_id, languages=[lang])
-                                logger.info(f"{lang} 자막을 찾았습니다.")
-                                return transcript
-                            except Exception as inner_e:
-                                logger.warning(f"{lang} 자막을 찾을 수 없습니다: {str(inner_e)}")
-                        
-                        # 영어 자막도 없는 경우
-                        logger.warning("영어 자막도 찾을 수 없습니다.")
-                        
-                        try:
-                            # 4. 사용 가능한 모든 자막 나열 및 첫 번째 시도
-                            transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
-                            available_transcripts = list(transcript_list)
-                            
-                            if available_transcripts:
-                                logger.info(f"사용 가능한 자막 목록: {[t.language_code for t in available_transcripts]}")
-                                first_transcript = available_transcripts[0]
-                                transcript = first_transcript.fetch()
-                                logger.info(f"사용 가능한 자막을 찾았습니다: {first_transcript.language_code}")
-                                return transcript
-                            else:
-                                logger.warning("사용 가능한 자막이 없습니다.")
-                                
-                        except Exception as e:
-                            logger.warning(f"사용 가능한 자막을 찾을 수 없습니다: {str(e)}")
-                        
-                        # 5. 대체 방법: pytube 시도
-                        logger.info("대체 방법으로 pytube를 사용하여 자막을 가져오려고 시도합니다.")
-                        return self._get_transcript_via_pytube(video_id)
-                            
-            except TranscriptsDisabled as e:
-                logger.warning(f"이 비디오에는 자막이 비활성화되어 있습니다: {str(e)}")
-                # pytube로 대체 시도
-                return self._get_transcript_via_pytube(video_id)
-                            
         except ImportError:
             logger.error("youtube_transcript_api 모듈을 설치해주세요: pip install youtube-transcript-api")
-            # pytube로 대체 시도
-            return self._get_transcript_via_pytube(video_id)
-            
+            transcript = self._race_pytube_fallbacks(video_id, language_code)
+            return (transcript, KIND_AUTO, None) if transcript else None
+        
+        listing_failed = False
+        try:
+            tracks = list(YouTubeTranscriptApi.list_transcripts(video_id))
+            logger.info(f"사용 가능한 자막 목록: {[(t.language_code, t.is_generated) for t in tracks]}")
+        except (TranscriptsDisabled, NoTranscriptFound, NoTranscriptAvailable) as e:
+            logger.warning(f"이 비디오에는 사용 가능한 자막이 없습니다: {str(e)}")
+            tracks = []
         except Exception as e:
-            logger.error(f"자막 가져오기 오류: {str(e)}")
+            logger.error(f"자막 목록 가져오기 오류: {str(e)}")
+            tracks = []
+            listing_failed = True
+        
+        if tracks:
+            track, translate = self._select_transcript_track(tracks, language_code)
+            try:
+                if translate:
+                    transcript = track.translate(language_code).fetch()
+                    track_language = language_code
+                else:
+                    transcript = track.fetch()
+                    track_language = track.language_code
+                kind = KIND_AUTO if track.is_generated else KIND_MANUAL
+                logger.info(f"자막을 찾았습니다: {track.language_code} ({kind}{', 번역됨' if translate else ''})")
+                return transcript, kind, track_language
+            except Exception as e:
+                logger.warning(f"선택한 자막 트랙({track.language_code})을 가져올 수 없습니다: {str(e)}")
+                listing_failed = True
+        
+        # 대체 방법: pytube
+        logger.info("대체 방법으로 pytube를 사용하여 자막을 가져오려고 시도합니다.")
+        transcript = self._race_pytube_fallbacks(video_id, language_code)
+        if transcript:
+            return transcript, KIND_AUTO, None
+        # 목록 조회가 실패한 경우에는 '자막 없음'으로 기록하지 않음
+        return None if listing_failed else ([], KIND_NONE, None)
+    
+    def _select_transcript_track(self, tracks: List[Any], language_code: str) -> Tuple[Any, bool]:
+        """
+        자막 트랙 목록에서 가장 적합한 트랙과 번역 필요 여부를 반환합니다.
+        우선순위: 지정 언어 -> 지정 언어로 번역 가능 -> 영어 -> 그 외, 각 단계에서 수동 자막을 자동 생성 자막보다 우선
+        """
+        def matches(code: str, target: str) -> bool:
+            return code == target or code.startswith(f"{target}-")
+        
+        def rank(track) -> Tuple[int, int]:
+            generated = 1 if track.is_generated else 0
+            if matches(track.language_code, language_code):
+                return 0, generated
+            if track.is_translatable and any(
+                lang.get('language_code') == language_code for lang in track.translation_languages
+            ):
+                return 1, generated
+            if matches(track.language_code, "en"):
+                return 2, generated
+            return 3, generated
+        
+        best = min(tracks, key=rank)
+        return best, rank(best)[0] == 1
+    
+    def _race_pytube_fallbacks(self, video_id: str, language_code: str) -> List[Dict[str, Any]]:
+        """
+        두 가지 pytube 대체 방법을 동시에 실행하고 먼저 얻은 자막을 반환합니다.
+        """
+        executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="transcript-fallback")
+        futures = [
+            executor.submit(self._get_transcript_directly_from_pytube, video_id, language_code),
+            executor.submit(self._get_transcript_via_pytube, video_id),
+        ]
+        try:
+            for future in as_completed(futures):
+                try:
+                    transcript = future.result()
+                except Exception as e:
+                    logger.warning(f"pytube 대체 방법 실패: {str(e)}")
+                    continue
+                if transcript:
+                    return transcript
             return []
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
     
     def _get_transcript_directly_from_pytube(self, video_id: str, language_code: str = 'ko') -> List[Dict[str, Any]]:
         """
@@ -570,7 +817,7 @@ class YouTubeService:
         try:
             from pytube import YouTube, innertube
             
-            logger.info(f"먼저 pytube를 통해 직접 자막을 가져오려고 시도합니다: {video_id}")
+            logger.info(f"pytube를 통해 직접 자막을 가져오려고 시도합니다: {video_id}")
             
             # InnerTube 클라이언트 생성 (최신 버전 호환성)
             try:
@@ -687,27 +934,9 @@ class YouTubeService:
                             logger.info("pytube를 사용하여 SRT 자막을 가져왔습니다.")
                             return transcript
             
-            # 자막이 없는 경우 비디오 제목과 설명으로 대체
-            logger.warning("자막을 찾을 수 없어 비디오 제목과 설명으로 대체합니다.")
-            title = yt.title or ""
-            description = yt.description or ""
-            if title or description:
-                transcript = [
-                    {"text": title, "start": 0.0, "duration": 5.0}
-                ]
-                
-                # 설명을 여러 조각으로 나누기
-                if description:
-                    paragraphs = description.split('\n\n')
-                    for i, para in enumerate(paragraphs):
-                        if para.strip():
-                            transcript.append({
-                                "text": para.strip(),
-                                "start": (i + 1) * 5.0,
-                                "duration": 5.0
-                            })
-                
-                return transcript
+            # 자막이 없으면 빈 목록을 반환 (제목/설명은 자막이 아니므로 자막으로 저장하지 않음,
+            # summarize_video가 자막이 없을 때 비디오 설명을 사용함)
+            logger.warning(f"pytube에서도 자막을 찾을 수 없습니다: {video_id}")
                 
         except ImportError:
             logger.error("pytube 모듈을 설치해주세요: pip install pytube")
@@ -820,7 +1049,8 @@ class YouTubeService:
                 "transcript": transcript_text,
                 "summary": summary_result["summary"],
                 "keywords": keywords,
-                "evaluation": evaluation
+                "evaluation": evaluation,
+                "tokens_used": (summary_result.get("metadata") or {}).get("tokens_used")
             }
             
         except Exception as e:
@@ -0,0 +1,86 @@
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+from sqlalchemy import and_, literal, tuple_
+from sqlalchemy.orm import Query
+import base64
+import json
+
+
+def encode_cursor(sort_key: str, value: Any, last_id: int) -> str:
+    """마지막 행의 (정렬 값, id)를 URL에 그대로 쓸 수 있는 불투명한 커서 문자열로 만듭니다."""
+    if isinstance(value, datetime):
+        payload = {"k": sort_key, "t": "dt", "v": value.isoformat(), "id": last_id}
+    else:
+        payload = {"k": sort_key, "t": "raw", "v": value, "id": last_id}
+    raw = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_key: str) -> Tuple[Any, int]:
+    """커서를 (정렬 값, id)로 되돌립니다. 형식이 잘못되었거나 다른 정렬의 커서이면 ValueError."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw.decode("utf-8"))
+        value = payload["v"]
+        if payload["t"] == "dt" and value is not None:
+            value = datetime.fromisoformat(value)
+        last_id = int(payload["id"])
+    except Exception:
+        raise ValueError("잘못된 커서입니다.")
+    if payload.get("k") != sort_key:
+        raise ValueError("다른 정렬 기준의 커서입니다.")
+    return value, last_id
+
+
+def _segments(sort_column, id_column, value: Any, last_id: int, descending: bool) -> List[Any]:
+    """
+    (정렬 값, id) 다음 행을 고르는 조건들을 정렬 순서대로 반환합니다.
+    각 조건은 인덱스 범위 검색이 되도록 행 값 비교((정렬 값, id) < (:v, :id)) 또는 IS NULL 하나만 사용합니다.
+    OR로 묶으면 SQLite가 인덱스 전체를 훑으므로 NULL 구간은 별도 조건으로 이어서 읽습니다.
+    SQLite는 NULL을 가장 작은 값으로 정렬하므로 내림차순에서는 NULL이 맨 뒤, 오름차순에서는 맨 앞에 옵니다.
+    """
+    if value is None:
+        if descending:
+            return [and_(sort_column.is_(None), id_column < last_id)]
+        return [and_(sort_column.is_(None), id_column > last_id), sort_column.isnot(None)]
+
+    cursor_key = tuple_(literal(value, sort_column.type), literal(last_id, id_column.type))
+    if descending:
+        return [tuple_(sort_column, id_column) < cursor_key, sort_column.is_(None)]
+    return [tuple_(sort_column, id_column) > cursor_key]
+
+
+def keyset_page(
+    query: Query,
+    sort_column,
+    id_column,
+    limit: int,
+    cursor: Optional[str] = None,
+    descending: bool = True,
+    sort_key: Optional[str] = None
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    (정렬 컬럼, id) 기준 커서 페이지네이션. OFFSET 없이 커서 다음 행부터 인덱스를 따라 읽으므로
+    몇 번째 페이지든 비용이 같습니다. (항목 목록, 다음 페이지 커서)를 반환하고 마지막 페이지이면 커서는 None입니다.
+    """
+    sort_key = sort_key or sort_column.key
+    if descending:
+        ordering = (sort_column.desc(), id_column.desc())
+    else:
+        ordering = (sort_column.asc(), id_column.asc())
+
+    # 한 행을 더 읽어 다음 페이지가 있는지 확인
+    if cursor:
+        value, last_id = decode_cursor(cursor, sort_key)
+        items = []
+        for segment in _segments(sort_column, id_column, value, last_id, descending):
+            items += query.filter(segment).order_by(*ordering).limit(limit + 1 - len(items)).all()
+            if len(items) > limit:
+                break
+    else:
+        items = query.order_by(*ordering).limit(limit + 1).all()
+    if len(items) <= limit:
+        return items, None
+    items = items[:limit]
+    last = items[-1]
+    return items, encode_cursor(sort_key, getattr(last, sort_column.key), getattr(last, id_column.key))
@@ -0,0 +1,35 @@
+import sys
+import os
+import argparse
+import json
+import logging
+
+# 프로젝트 루트 디렉토리를 PYTHONPATH에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.database import engine, init_db
+from app.services.retention_service import RetentionService, enable_incremental_vacuum
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def apply_retention(args):
+    """
+    요약 히스토리 보존 정책을 한 번 적용합니다. --days로 설정 대신 사용할 정책을 줄 수 있습니다.
+    """
+    init_db()
+    if args.enable_incremental_vacuum:
+        enable_incremental_vacuum(engine)
+
+    policies = json.loads(args.days) if args.days else None
+    results = RetentionService(policies=policies).apply()
+    logger.info(f"보존 정책 적용 완료: {results}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="요약 히스토리 보존 정책 적용")
+    parser.add_argument("--days", help='요약 종류별 보존 기간(일) JSON, 예: \'{"text": 90}\'')
+    parser.add_argument(
+        "--enable-incremental-vacuum", action="store_true",
+        help="데이터베이스를 auto_vacuum=INCREMENTAL로 바꿈 (전체 VACUUM, 한 번만 실행)"
+    )
+    apply_retention(parser.parse_args())
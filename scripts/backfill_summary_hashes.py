@@ -0,0 +1,66 @@
+import sys
+import os
+import logging
+
+# 프로젝트 루트 디렉토리를 PYTHONPATH에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import or_
+from sqlalchemy.orm import undefer
+from app.db.database import SessionLocal, engine
+from app.db.migrations import apply_column_migrations
+from app.db.models import SummaryHistory
+from app.services.history_service import HistoryService
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+
+def backfill_summary_hashes():
+    """
+    중복 확인용 키(content_hash, source_key, params_hash)가 없는 기존 요약 히스토리를 채웁니다.
+    텍스트/문서 요약은 요약 파라미터(style, max_length, language, format)를 저장하지 않았으므로
+    params_hash를 다시 만들 수 없습니다. 다른 파라미터의 요약과 잘못 일치하지 않도록 NULL로 둡니다
+    (중복 확인은 params_hash가 같은 행만 찾으므로 이런 행은 재사용되지 않음).
+    """
+    apply_column_migrations(engine)
+
+    db = SessionLocal()
+    updated = 0
+    last_id = 0
+    try:
+        while True:
+            items = db.query(SummaryHistory).options(undefer(SummaryHistory.inline_original_text)).filter(
+                SummaryHistory.id > last_id,
+                or_(SummaryHistory.content_hash.is_(None), SummaryHistory.params_hash.is_(None))
+            ).order_by(SummaryHistory.id.asc()).limit(BATCH_SIZE).all()
+            if not items:
+                break
+
+            for item in items:
+                source_info = item.source_info if isinstance(item.source_info, dict) else {}
+                # 유튜브 요약의 파라미터(언어)는 source_info에 남아 있어 다시 만들 수 있음
+                params = {"language": source_info.get("language")} if item.summary_type == "youtube" else None
+                keys = HistoryService.build_dedup_keys(
+                    item.summary_type, item.original_text, source_info, item.model_used, params
+                )
+                item.content_hash = keys["content_hash"]
+                item.source_key = keys["source_key"]
+                item.params_hash = keys["params_hash"] if item.summary_type == "youtube" else None
+                updated += 1
+
+            last_id = items[-1].id
+            db.commit()
+            logger.info(f"{updated}개 히스토리 갱신 (마지막 ID: {last_id})")
+    except Exception as e:
+        db.rollback()
+        logger.error(f"중복 확인 키 채우기 중 오류: {str(e)}")
+        raise
+    finally:
+        db.close()
+
+    logger.info(f"중복 확인 키 채우기 완료: {updated}개")
+
+if __name__ == "__main__":
+    backfill_summary_hashes()
@@ -0,0 +1,60 @@
+import sys
+import os
+import logging
+
+# 프로젝트 루트 디렉토리를 PYTHONPATH에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.database import SessionLocal, engine
+from app.db.migrations import apply_column_migrations
+from app.models.models import Base, Video, VideoLshBucket
+from app.services.near_duplicate_index import (
+    near_duplicate_index, shingles, minhash_signature, signature_to_bytes
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+
+def build_duplicate_index():
+    """
+    MinHash 서명이 없는 기존 비디오의 서명을 계산해 근접 중복 인덱스에 추가합니다.
+    """
+    Base.metadata.create_all(bind=engine, tables=[VideoLshBucket.__table__])
+    apply_column_migrations(engine)
+
+    db = SessionLocal()
+    indexed = 0
+    last_id = 0
+    try:
+        while True:
+            videos = db.query(Video).filter(
+                Video.id > last_id,
+                Video.minhash.is_(None)
+            ).order_by(Video.id.asc()).limit(BATCH_SIZE).all()
+            if not videos:
+                break
+
+            for video in videos:
+                signature = minhash_signature(shingles(video.description))
+                if signature is None:
+                    continue
+                video.minhash = signature_to_bytes(signature)
+                near_duplicate_index.add(db, video.id, signature)
+                indexed += 1
+
+            last_id = videos[-1].id
+            db.commit()
+            logger.info(f"{indexed}개 비디오 인덱스 추가 (마지막 ID: {last_id})")
+    except Exception as e:
+        db.rollback()
+        logger.error(f"인덱스 생성 중 오류: {str(e)}")
+        raise
+    finally:
+        db.close()
+
+    logger.info(f"인덱스 생성 완료: {indexed}개 비디오")
+
+if __name__ == "__main__":
+    build_duplicate_index()
@@ -0,0 +1,63 @@
+import sys
+import os
+import logging
+
+# 프로젝트 루트 디렉토리를 PYTHONPATH에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import func, text
+from sqlalchemy.orm import undefer
+from app.db.database import SessionLocal, engine, init_db
+from app.db.models import SummaryHistory
+from app.db.text_blobs import MIN_COMPRESS_LENGTH, set_original_text, purge_unused_blobs
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 200
+
+def compress_history_text():
+    """
+    행에 그대로 저장된 긴 원문을 압축 blob 테이블로 옮기고, 비워진 공간을 VACUUM으로 돌려받습니다.
+    """
+    init_db()
+
+    db = SessionLocal()
+    compressed = 0
+    saved_chars = 0
+    last_id = 0
+    try:
+        while True:
+            items = db.query(SummaryHistory).options(undefer(SummaryHistory.inline_original_text)).filter(
+                SummaryHistory.id > last_id,
+                SummaryHistory.original_blob_hash.is_(None),
+                func.length(SummaryHistory.inline_original_text) >= MIN_COMPRESS_LENGTH
+            ).order_by(SummaryHistory.id.asc()).limit(BATCH_SIZE).all()
+            if not items:
+                break
+
+            for item in items:
+                original_text = item.inline_original_text
+                set_original_text(db, item, original_text)
+                saved_chars += len(original_text)
+                compressed += 1
+
+            last_id = items[-1].id
+            db.commit()
+            logger.info(f"{compressed}개 히스토리 원문 압축 (마지막 ID: {last_id})")
+
+        purge_unused_blobs(db)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"원문 압축 중 오류: {str(e)}")
+        raise
+    finally:
+        db.close()
+
+    logger.info(f"원문 압축 완료: {compressed}개 ({saved_chars}자), VACUUM 실행")
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("VACUUM"))
+
+if __name__ == "__main__":
+    compress_history_text()
@@ -0,0 +1,48 @@
+import sys
+import os
+import argparse
+import logging
+from datetime import datetime
+
+# 프로젝트 루트 디렉토리를 PYTHONPATH에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.history_export_service import HistoryExportService, EXPORT_FORMATS
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def export_history(args):
+    """
+    요약 히스토리를 파일로 내보냅니다. 파일 이름이 .gz로 끝나면 gzip으로 압축합니다.
+    """
+    use_gzip = args.gzip or args.output.endswith(".gz")
+    chunks = HistoryExportService().export(
+        format=args.format,
+        gzip=use_gzip,
+        summary_type=args.type,
+        start_date=datetime.fromisoformat(args.start) if args.start else None,
+        end_date=datetime.fromisoformat(args.end) if args.end else None,
+        model=args.model,
+        include_original=args.include_original
+    )
+
+    written = 0
+    with open(args.output, "wb") as output:
+        for chunk in chunks:
+            output.write(chunk)
+            written += len(chunk)
+    logger.info(f"히스토리 내보내기 완료: {written} 바이트")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="요약 히스토리 내보내기")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="ndjson")
+    # 로그가 표준 출력으로 나가므로 파일로만 내보냄
+    parser.add_argument("--output", "-o", required=True, help="출력 파일 경로")
+    parser.add_argument("--gzip", action="store_true", help="gzip으로 압축")
+    parser.add_argument("--type", help="요약 종류 (text, youtube, document)")
+    parser.add_argument("--start", help="시작 시각 (ISO 형식, 예: 2024-01-01)")
+    parser.add_argument("--end", help="종료 시각 (ISO 형식)")
+    parser.add_argument("--model", help="사용한 모델")
+    parser.add_argument("--include-original", action="store_true", help="원문 포함")
+    export_history(parser.parse_args())
@@ -0,0 +1,62 @@
+import sys
+import os
+import logging
+
+# 프로젝트 루트 디렉토리를 PYTHONPATH에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.database import SessionLocal
+from app.models.models import Video
+from app.services.job_queue import job_queue
+from app.services.near_duplicate_index import transcript_index
+from app.services.transcript_store import TranscriptStore
+from app.services.worker_service import JOB_SUMMARIZE_VIDEO
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+
+def purge_fallback_transcripts():
+    """
+    제목/설명으로 만든 가짜 자막이 저장되었을 수 있는 pytube 대체 자막을 삭제하고,
+    그 자막으로 계산한 자막 지문과 미리 만든 요약을 지운 뒤 요약 작업을 다시 등록합니다.
+    """
+    video_ids = TranscriptStore().purge_fallback()
+    logger.info(f"대체 자막 {len(video_ids)}개 비디오 삭제")
+
+    db = SessionLocal()
+    reset = 0
+    try:
+        for start in range(0, len(video_ids), BATCH_SIZE):
+            videos = db.query(Video).filter(Video.video_id.in_(video_ids[start:start + BATCH_SIZE])).all()
+            for video in videos:
+                if video.transcript_minhash is None:
+                    continue
+                transcript_index.remove(db, video.id)
+                video.transcript_minhash = None
+                video.is_duplicate = False
+                video.duplicate_of_id = None
+                video.summary = None
+                video.key_phrases = None
+                video.is_summarized = False
+                # 이전 작업과 중복 키가 겹치지 않도록 별도 키로 다시 등록
+                job_queue.enqueue(
+                    db,
+                    JOB_SUMMARIZE_VIDEO,
+                    {"video_id": video.id},
+                    dedupe_key=f"{JOB_SUMMARIZE_VIDEO}:{video.video_id}:transcript-repair"
+                )
+                reset += 1
+            db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"자막 지문 초기화 중 오류: {str(e)}")
+        raise
+    finally:
+        db.close()
+
+    logger.info(f"자막 지문과 요약을 다시 계산할 비디오: {reset}개")
+
+if __name__ == "__main__":
+    purge_fallback_transcripts()
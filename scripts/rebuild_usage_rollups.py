@@ -0,0 +1,38 @@
+import sys
+import os
+import argparse
+import logging
+
+# 프로젝트 루트 디렉토리를 PYTHONPATH에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.database import SessionLocal, init_db
+from app.db.usage_rollups import rebuild_usage_rollups
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def rebuild(args):
+    """
+    사용량 집계를 요약 히스토리에서 다시 계산합니다. 집계가 히스토리와 어긋났을 때 사용합니다.
+    """
+    init_db()
+
+    db = SessionLocal()
+    try:
+        rebuild_usage_rollups(db, args.since)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"사용량 집계 재계산 중 오류: {str(e)}")
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="사용량 집계 재계산")
+    parser.add_argument(
+        "--since",
+        help="이 날짜(YYYY-MM-DD, UTC)부터만 다시 계산. 보존 정책으로 삭제된 기간은 제외하는 것이 안전함"
+    )
+    rebuild(parser.parse_args())
@@ -0,0 +1,47 @@
+import sys
+import os
+import argparse
+import logging
+import signal
+
+# 프로젝트 루트 디렉토리를 PYTHONPATH에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.database import engine
+from app.models.models import Base, Job
+from app.services.worker_service import WorkerService, DEFAULT_HANDLERS
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def run_worker():
+    """
+    작업 큐를 처리하는 작업자 프로세스를 실행합니다.
+    같은 데이터베이스 파일에 대해 여러 프로세스를 동시에 실행할 수 있습니다.
+    """
+    parser = argparse.ArgumentParser(description="작업 큐 작업자 실행")
+    parser.add_argument("--concurrency", type=int, default=None, help="동시에 처리할 작업 수")
+    parser.add_argument(
+        "--types", nargs="*", choices=sorted(DEFAULT_HANDLERS), default=None,
+        help="처리할 작업 유형 (기본값: 전체)"
+    )
+    args = parser.parse_args()
+
+    # 작업 테이블이 없으면 생성
+    Base.metadata.create_all(bind=engine, tables=[Job.__table__])
+
+    worker = WorkerService(job_types=args.types, concurrency=args.concurrency)
+
+    def handle_signal(signum, frame):
+        logger.info("종료 신호를 받았습니다. 처리 중인 작업을 마치고 종료합니다.")
+        worker.stop()
+
+    signal.signal(signal.SIGINT, handle_signal)
+    signal.signal(signal.SIGTERM, handle_signal)
+
+    worker.start()
+    worker.wait()
+    logger.info("작업자 종료")
+
+if __name__ == "__main__":
+    run_worker()
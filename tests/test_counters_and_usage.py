@@ -0,0 +1,122 @@
+import sys
+import os
+from datetime import datetime
+
+# 프로젝트 루트 디렉토리를 PYTHONPATH에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base, create_db_engine
+from app.db.models import SummaryHistory, TextBlob, UsageRollup
+from app.db.counters import ensure_counters, get_row_count
+from app.db.usage_rollups import ensure_usage_rollups, rebuild_usage_rollups, record_usage
+from app.services.history_service import HistoryService
+from app.services.usage_stats_service import UsageStatsService
+
+
+@pytest.fixture
+def engine():
+    engine = create_db_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[TextBlob.__table__, SummaryHistory.__table__, UsageRollup.__table__])
+    return engine
+
+
+@pytest.fixture
+def db(engine):
+    ensure_counters(engine)
+    ensure_usage_rollups(engine)
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def add_history(db, summary_type="text", user_id=1, model="gpt", tokens=10):
+    item = SummaryHistory(summary_type=summary_type, summary_text="요약", user_id=user_id,
+                          model_used=model, tokens_used=tokens)
+    db.add(item)
+    db.commit()
+    return item
+
+
+def today():
+    return datetime.utcnow().date()
+
+
+def test_counters_seeded_from_existing_rows(engine):
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO summary_history (summary_type) VALUES ('text'), ('text'), ('youtube')"))
+    ensure_counters(engine)
+    session = sessionmaker(bind=engine)()
+    try:
+        assert get_row_count(session, "summary_history") == 3
+        assert get_row_count(session, "summary_history", "text") == 2
+        assert get_row_count(session, "summary_history", "document") == 0
+    finally:
+        session.close()
+
+
+def test_counters_follow_insert_update_delete(db):
+    first = add_history(db, "text")
+    add_history(db, "youtube")
+    assert get_row_count(db, "summary_history") == 2
+    assert get_row_count(db, "summary_history", "text") == 1
+
+    first.summary_type = "document"
+    db.commit()
+    assert get_row_count(db, "summary_history", "text") == 0
+    assert get_row_count(db, "summary_history", "document") == 1
+
+    db.delete(first)
+    db.commit()
+    assert get_row_count(db, "summary_history") == 1
+    assert get_row_count(db, "summary_history", "document") == 0
+    # 카운터가 없는 테이블
+    assert get_row_count(db, "videos") is None
+
+
+def test_usage_rollups_follow_history_inserts(db):
+    add_history(db, user_id=1, tokens=10)
+    add_history(db, user_id=1, tokens=5)
+    add_history(db, user_id=None, tokens=None)
+
+    stats = UsageStatsService(db)
+    assert stats.count_summaries(1, today()) == 2
+    rollup = db.query(UsageRollup).filter(UsageRollup.user_id == 1).one()
+    assert (rollup.summary_count, rollup.tokens_total) == (2, 15)
+    # 로그인하지 않은 요청은 user_id 0으로 집계
+    assert stats.count_summaries(0, today()) == 1
+
+    # 보존 정책으로 히스토리를 삭제해도 사용량은 줄지 않음
+    db.query(SummaryHistory).delete()
+    db.commit()
+    assert stats.count_summaries(1, today()) == 2
+
+    rebuild_usage_rollups(db)
+    db.commit()
+    assert stats.count_summaries(1, today()) == 0
+
+
+def test_record_usage_uses_trigger_key(db):
+    add_history(db, user_id=2, model="gpt", tokens=3)
+    record_usage(db, "text", "gpt", user_id=2, tokens_used=4)
+    db.commit()
+
+    rollup = db.query(UsageRollup).filter(UsageRollup.user_id == 2).one()
+    assert rollup.day == today().isoformat()
+    assert (rollup.summary_count, rollup.tokens_total) == (2, 7)
+
+
+def test_deduplicated_summary_still_counts_usage(db):
+    service = HistoryService(db)
+    params = {"style": "brief", "max_length": 100}
+    first = service.save_text_summary("같은 원문", "요약", model_used="gpt", params=params, user_id=3, tokens_used=8)
+    second = service.save_text_summary("같은 원문", "요약", model_used="gpt", params=params, user_id=3, tokens_used=8)
+
+    assert second.id == first.id
+    assert get_row_count(db, "summary_history") == 1
+    assert UsageStatsService(db).count_summaries(3, today()) == 2
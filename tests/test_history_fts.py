@@ -0,0 +1,107 @@
+import sys
+import os
+import sqlite3
+
+# 프로젝트 루트 디렉토리를 PYTHONPATH에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base, create_db_engine
+from app.db.fts import BLOB_FTS_TABLE, ensure_fts
+from app.db.models import SummaryHistory, TextBlob
+from app.db.text_blobs import MIN_COMPRESS_LENGTH, purge_unused_blobs
+from app.services.history_service import HistoryService
+
+# 압축 저장되는 긴 원문 (앞부분은 미리보기로도 색인되므로 검색어는 뒤쪽에 둠)
+LONG_TEXT = "filler " * (MIN_COMPRESS_LENGTH // 7 + 50) + "narwhal"
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "app.db")
+
+
+@pytest.fixture
+def engine(db_path):
+    engine = create_db_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(engine, tables=[TextBlob.__table__, SummaryHistory.__table__])
+    if ensure_fts(engine) is None:
+        pytest.skip("FTS5를 사용할 수 없는 SQLite")
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def search_ids(db, query):
+    return [item["id"] for item in HistoryService(db).search_history(query)]
+
+
+def test_triggers_follow_insert_update_delete(db):
+    service = HistoryService(db)
+    item = service.save_text_summary("the pelican flew home", "a short summary about walrus", model_used="gpt")
+    other = service.save_text_summary("completely different", "nothing here", model_used="gpt")
+
+    assert search_ids(db, "pelican") == [item.id]
+    assert search_ids(db, "walrus") == [item.id]
+
+    item.summary_text = "a short summary about penguins"
+    db.commit()
+    assert search_ids(db, "walrus") == []
+    assert search_ids(db, "penguins") == [item.id]
+
+    # 색인과 무관한 컬럼만 바꿔도 인덱스는 그대로
+    item.quality_score = 5
+    db.commit()
+    assert search_ids(db, "penguins") == [item.id]
+
+    db.delete(item)
+    db.commit()
+    assert search_ids(db, "penguins") == []
+    assert search_ids(db, "different") == [other.id]
+
+
+def test_compressed_original_is_searchable_until_purged(db):
+    item = HistoryService(db).save_text_summary(LONG_TEXT, "long summary", model_used="gpt")
+    assert item.original_blob_hash is not None
+    assert search_ids(db, "narwhal") == [item.id]
+
+    # VACUUM으로 text_blobs의 rowid가 바뀌어도 fts_id로 연결되므로 결과가 같음
+    db.close()
+    with db.get_bind().connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("VACUUM"))
+    assert search_ids(db, "narwhal") == [item.id]
+
+    blob_hash = item.original_blob_hash
+    db.query(SummaryHistory).filter(SummaryHistory.id == item.id).delete(synchronize_session=False)
+    assert purge_unused_blobs(db, [blob_hash]) == 1
+    db.commit()
+    assert search_ids(db, "narwhal") == []
+    assert db.execute(text(f"SELECT count(*) FROM {BLOB_FTS_TABLE} WHERE {BLOB_FTS_TABLE} MATCH 'narwhal'")).scalar() == 0
+
+
+def test_triggers_work_without_app_sql_functions(db, db_path):
+    item = HistoryService(db).save_text_summary("the pelican flew home", "summary", model_used="gpt")
+    db.close()
+
+    # 앱이 등록하는 SQL 함수가 없는 연결(sqlite3 CLI 등)에서도 히스토리를 수정할 수 있어야 함
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute("UPDATE summary_history SET summary_text = 'summary about walrus' WHERE id = ?", (item.id,))
+        conn.execute("INSERT INTO summary_history (summary_type, summary_text) VALUES ('text', 'ostrich notes')")
+        conn.commit()
+    finally:
+        conn.close()
+
+    assert search_ids(db, "walrus") == [item.id]
+    assert len(search_ids(db, "ostrich")) == 1
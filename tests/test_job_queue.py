@@ -0,0 +1,137 @@
+import sys
+import os
+from datetime import datetime, timedelta
+
+# 프로젝트 루트 디렉토리를 PYTHONPATH에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.models.models import Job
+from app.services import job_queue as job_queue_module
+from app.services.job_queue import JobQueue, PRIORITY_HIGH, PRIORITY_LOW, STATUS_DEAD, STATUS_DONE, STATUS_QUEUED
+
+
+@pytest.fixture
+def queue(monkeypatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Job.__table__.create(engine)
+    # 후보 중 무작위 선택을 고정해 순서를 확인
+    monkeypatch.setattr(job_queue_module.random, "choice", lambda candidates: candidates[0])
+    return JobQueue(session_factory=sessionmaker(bind=engine))
+
+
+def enqueue(queue, job_type="test", payload=None, **kwargs):
+    db = queue.session_factory()
+    try:
+        queue.enqueue(db, job_type, payload or {}, **kwargs)
+        db.commit()
+    finally:
+        db.close()
+
+
+def expire_lease(queue, job_id):
+    db = queue.session_factory()
+    try:
+        db.query(Job).filter(Job.id == job_id).update({Job.leased_until: datetime.utcnow() - timedelta(seconds=1)})
+        db.commit()
+    finally:
+        db.close()
+
+
+def get_job(queue, job_id):
+    db = queue.session_factory()
+    try:
+        return db.query(Job).filter(Job.id == job_id).one()
+    finally:
+        db.close()
+
+
+def test_enqueue_skips_duplicate_dedupe_key(queue):
+    enqueue(queue, payload={"n": 1}, dedupe_key="same")
+    enqueue(queue, payload={"n": 2}, dedupe_key="same")
+    enqueue(queue, payload={"n": 3})
+
+    db = queue.session_factory()
+    try:
+        assert db.query(Job).count() == 2
+    finally:
+        db.close()
+
+
+def test_claim_by_priority_and_single_owner(queue):
+    enqueue(queue, payload={"name": "low"}, priority=PRIORITY_LOW)
+    enqueue(queue, payload={"name": "high"}, priority=PRIORITY_HIGH)
+    enqueue(queue, job_type="other", payload={"name": "other"}, priority=PRIORITY_HIGH)
+
+    first = queue.claim("worker-1", ["test"])
+    assert first["payload"] == {"name": "high"}
+    assert first["attempts"] == 1
+    second = queue.claim("worker-2", ["test"])
+    assert second["payload"] == {"name": "low"}
+    assert queue.claim("worker-3", ["test"]) is None
+
+    # 임대를 가진 작업자만 완료할 수 있음
+    assert not queue.complete(first["id"], "worker-2")
+    assert queue.complete(first["id"], "worker-1")
+    assert get_job(queue, first["id"]).status == STATUS_DONE
+
+
+def test_delayed_job_not_claimable_until_available(queue):
+    enqueue(queue, delay_seconds=3600)
+    assert queue.claim("worker-1") is None
+
+
+def test_expired_lease_reclaimed_by_another_worker(queue):
+    enqueue(queue, max_attempts=3)
+    job = queue.claim("worker-1")
+    assert queue.claim("worker-2") is None
+
+    expire_lease(queue, job["id"])
+    reclaimed = queue.claim("worker-2")
+    assert reclaimed["id"] == job["id"]
+    assert reclaimed["attempts"] == 2
+
+    # 임대를 잃은 작업자는 연장하거나 완료할 수 없음
+    assert not queue.extend_lease(job["id"], "worker-1")
+    assert not queue.complete(job["id"], "worker-1")
+    assert queue.complete(job["id"], "worker-2")
+
+
+def test_expired_lease_without_attempts_left_is_dead(queue):
+    enqueue(queue, max_attempts=1)
+    job = queue.claim("worker-1")
+    expire_lease(queue, job["id"])
+
+    assert queue.claim("worker-2") is None
+    dead = get_job(queue, job["id"])
+    assert dead.status == STATUS_DEAD
+    assert dead.last_error == "lease expired"
+
+    assert queue.retry_dead() == 1
+    assert queue.claim("worker-2")["id"] == job["id"]
+
+
+def test_fail_requeues_with_backoff_then_dead(queue):
+    enqueue(queue, max_attempts=2)
+    job = queue.claim("worker-1")
+    assert queue.fail(job["id"], "worker-1", "boom", job["attempts"], job["max_attempts"])
+
+    requeued = get_job(queue, job["id"])
+    assert requeued.status == STATUS_QUEUED
+    assert requeued.last_error == "boom"
+    assert requeued.available_at > datetime.utcnow()
+    assert queue.claim("worker-1") is None
+
+    db = queue.session_factory()
+    try:
+        db.query(Job).filter(Job.id == job["id"]).update({Job.available_at: datetime.utcnow()})
+        db.commit()
+    finally:
+        db.close()
+    job = queue.claim("worker-1")
+    assert queue.fail(job["id"], "worker-1", "boom again", job["attempts"], job["max_attempts"])
+    assert get_job(queue, job["id"]).status == STATUS_DEAD
@@ -0,0 +1,114 @@
+import sys
+import os
+import itertools
+
+# 프로젝트 루트 디렉토리를 PYTHONPATH에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.models.models import Video, VideoLshBucket
+from app.services.duplicate_checker import DuplicateChecker
+from app.services.near_duplicate_index import (
+    BANDS, NUM_PERM, NearDuplicateIndex, band_keys, estimate_similarity, jaccard,
+    minhash_signature, shingles, signature_from_bytes, signature_to_bytes
+)
+
+ORIGINAL = " ".join(f"alpha{i}" for i in range(80))
+REUPLOAD = ORIGINAL + " extra"
+UNRELATED = " ".join(f"zulu{i}" for i in range(80))
+_video_ids = itertools.count()
+
+
+def signature(text):
+    return minhash_signature(shingles(text))
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Video.__table__.create(engine)
+    VideoLshBucket.__table__.create(engine)
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def add_videos(db, *descriptions):
+    videos = [Video(video_id=f"video{next(_video_ids)}", description=description) for description in descriptions]
+    db.add_all(videos)
+    db.flush()
+    return videos
+
+
+def test_shingles_and_signature():
+    assert shingles(None) == set()
+    assert shingles("  A  b ") == {"a b"}
+    assert shingles("Hello  World") == shingles("hello world")
+    assert minhash_signature(set()) is None
+
+    original = signature(ORIGINAL)
+    assert original.shape == (NUM_PERM,)
+    assert np.array_equal(signature_from_bytes(signature_to_bytes(original)), original)
+    assert signature_from_bytes(None) is None
+    assert len(band_keys(original)) == BANDS
+
+
+def test_estimate_tracks_jaccard():
+    similar = jaccard(shingles(ORIGINAL), shingles(REUPLOAD))
+    assert similar > 0.9
+    assert abs(estimate_similarity(signature(ORIGINAL), signature(REUPLOAD)) - similar) < 0.2
+    assert jaccard(shingles(ORIGINAL), shingles(UNRELATED)) == 0.0
+    assert estimate_similarity(signature(ORIGINAL), signature(UNRELATED)) < 0.2
+
+
+def test_index_candidates_share_a_bucket(db):
+    index = NearDuplicateIndex()
+    other_index = NearDuplicateIndex(band_offset=BANDS)
+    original, unrelated = add_videos(db, ORIGINAL, UNRELATED)
+    index.add_many(db, {original.id: signature(ORIGINAL), unrelated.id: signature(UNRELATED)})
+
+    assert index.candidates(db, signature(REUPLOAD)) == {original.id}
+    assert index.candidates(db, signature(ORIGINAL), exclude_id=original.id) == set()
+    # 다른 밴드 범위(자막 인덱스)의 행은 후보가 되지 않음
+    assert other_index.candidates(db, signature(REUPLOAD)) == set()
+
+    results = index.candidates_many(db, {100: signature(REUPLOAD), 101: signature(UNRELATED)})
+    assert results == {100: {original.id}, 101: {unrelated.id}}
+
+    index.remove(db, original.id)
+    assert index.candidates(db, signature(REUPLOAD)) == set()
+
+
+def test_check_batch_marks_near_duplicates(db):
+    checker = DuplicateChecker(index=NearDuplicateIndex(), transcript_index=NearDuplicateIndex(band_offset=BANDS))
+
+    # 배치 안에서 앞선 비디오와 비교
+    assert checker.check_batch(add_videos(db, ORIGINAL, REUPLOAD, UNRELATED), db) == [False, True, False]
+    db.flush()
+
+    # 이전 배치의 비디오는 인덱스 후보로 찾음
+    later = add_videos(db, REUPLOAD + " again", "")
+    assert checker.check_batch(later, db) == [True, False]
+    assert later[0].similarity_score > 0.8
+
+
+def test_check_transcript_links_reupload_to_original(db):
+    checker = DuplicateChecker(index=NearDuplicateIndex(), transcript_index=NearDuplicateIndex(band_offset=BANDS))
+    original, reupload, unrelated = add_videos(db, "a", "b", "c")
+
+    assert checker.check_transcript(original, ORIGINAL, db) is None
+    db.flush()
+    assert checker.check_transcript(reupload, REUPLOAD, db) == original.id
+    assert reupload.is_duplicate and reupload.duplicate_of_id == original.id
+    db.flush()
+    assert checker.check_transcript(unrelated, UNRELATED, db) is None
+    assert not unrelated.is_duplicate
@@ -0,0 +1,84 @@
+import sys
+import os
+from datetime import datetime, timedelta
+
+# 프로젝트 루트 디렉토리를 PYTHONPATH에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from sqlalchemy import Column, DateTime, Integer, create_engine
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.utils.pagination import encode_cursor, decode_cursor, keyset_page
+
+Base = declarative_base()
+START = datetime(2024, 1, 1)
+
+
+class Item(Base):
+    __tablename__ = "items"
+
+    id = Column(Integer, primary_key=True)
+    published_at = Column(DateTime, nullable=True)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    # 같은 시간(동점)과 NULL 구간이 페이지 경계에 걸치도록 구성
+    offsets = [0, 1, 1, None, 2, None, 1, None, 3]
+    session.add_all([
+        Item(id=index + 1, published_at=None if offset is None else START + timedelta(days=offset))
+        for index, offset in enumerate(offsets)
+    ])
+    session.commit()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def expected_ids(db, descending):
+    # SQLite는 NULL을 가장 작은 값으로 정렬
+    items = db.query(Item).all()
+    ordered = sorted(items, key=lambda item: (item.published_at is not None, item.published_at or START, item.id))
+    ids = [item.id for item in ordered]
+    return list(reversed(ids)) if descending else ids
+
+
+def walk(db, descending, limit):
+    ids, cursor, pages = [], None, 0
+    while True:
+        items, cursor = keyset_page(
+            db.query(Item), Item.published_at, Item.id, limit, cursor=cursor, descending=descending
+        )
+        ids += [item.id for item in items]
+        pages += 1
+        if cursor is None:
+            return ids, pages
+
+
+@pytest.mark.parametrize("descending", [True, False])
+@pytest.mark.parametrize("limit", [1, 2, 4, 20])
+def test_pages_cover_all_rows_in_order(db, descending, limit):
+    ids, pages = walk(db, descending, limit)
+    assert ids == expected_ids(db, descending)
+    assert pages == max(1, -(-len(ids) // limit))
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor("published_at", START, 7)
+    assert decode_cursor(cursor, "published_at") == (START, 7)
+    assert decode_cursor(encode_cursor("published_at", None, 3), "published_at") == (None, 3)
+    assert decode_cursor(encode_cursor("title", "제목", 5), "title") == ("제목", 5)
+
+
+def test_invalid_cursor_rejected():
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor", "published_at")
+    with pytest.raises(ValueError):
+        decode_cursor(encode_cursor("title", "a", 1), "published_at")
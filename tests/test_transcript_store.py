@@ -0,0 +1,78 @@
+import sys
+import os
+from datetime import datetime, timedelta
+
+# 프로젝트 루트 디렉토리를 PYTHONPATH에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.models import TranscriptCache
+from app.services.transcript_store import (
+    TranscriptStore, encode_segments, decode_segments, KIND_AUTO, KIND_MANUAL
+)
+
+SEGMENTS = [
+    {"text": "안녕하세요", "start": 0.0, "duration": 1.5},
+    {"text": "", "start": 1.5, "duration": 0.25},
+    {"text": "second line", "start": 1.75, "duration": 2.125},
+]
+
+
+@pytest.fixture
+def store():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    TranscriptCache.__table__.create(engine)
+    return TranscriptStore(session_factory=sessionmaker(bind=engine), missing_ttl_hours=1)
+
+
+def test_encode_decode_round_trip():
+    assert decode_segments(encode_segments(SEGMENTS)) == SEGMENTS
+    assert decode_segments(encode_segments([])) == []
+
+    # 구분자로 쓰는 NUL은 텍스트에서 제거되고, 빠진 값은 기본값으로 채워짐
+    decoded = decode_segments(encode_segments([{"text": "a\x00b"}, {"start": 2}]))
+    assert decoded == [
+        {"text": "ab", "start": 0.0, "duration": 0.0},
+        {"text": "", "start": 2.0, "duration": 0.0},
+    ]
+
+
+def test_manual_transcript_preferred_over_auto(store):
+    store.put("video1", "ko", KIND_AUTO, SEGMENTS[:1], track_language="ko")
+    store.put("video1", "ko", KIND_MANUAL, SEGMENTS, track_language="ko")
+
+    stored = store.get("video1", "ko")
+    assert stored.kind == KIND_MANUAL
+    assert len(stored) == len(SEGMENTS)
+    assert stored.segments == SEGMENTS
+    assert store.get("video1", "en") is None
+
+
+def test_missing_record_expires_and_is_replaced(store):
+    store.put("video1", "ko", KIND_AUTO, [])
+    assert store.get("video1", "ko").is_missing
+
+    db = store.session_factory()
+    db.query(TranscriptCache).update({TranscriptCache.created_at: datetime.utcnow() - timedelta(hours=2)})
+    db.commit()
+    db.close()
+    assert store.get("video1", "ko") is None
+
+    # 자막을 찾으면 '자막 없음' 기록은 제거
+    store.put("video1", "ko", KIND_AUTO, SEGMENTS, track_language="ko")
+    stored = store.get("video1", "ko")
+    assert not stored.is_missing
+    assert stored.segments == SEGMENTS
+
+
+def test_purge_fallback_removes_only_untracked_auto_transcripts(store):
+    store.put("fallback", "ko", KIND_AUTO, SEGMENTS)
+    store.put("real", "ko", KIND_AUTO, SEGMENTS, track_language="ko")
+
+    assert store.purge_fallback() == ["fallback"]
+    assert store.get("fallback", "ko") is None
+    assert store.get("real", "ko").segments == SEGMENTS
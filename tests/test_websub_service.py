@@ -0,0 +1,107 @@
+import sys
+import os
+import hashlib
+import hmac
+
+# 프로젝트 루트 디렉토리를 PYTHONPATH에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.models.models import WebSubSubscription
+from app.services.websub_service import WebSubService
+
+CHANNEL_ID = "UC_test_channel"
+CALLBACK_URL = "https://example.com/api/v1/websub/callback"
+
+NOTIFICATION = f"""<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns:yt="http://www.youtube.com/xml/schemas/2015" xmlns="http://www.w3.org/2005/Atom">
+  <entry>
+    <yt:videoId>video123</yt:videoId>
+    <yt:channelId>{CHANNEL_ID}</yt:channelId>
+  </entry>
+</feed>""".encode("utf-8")
+
+
+class FakeResponse:
+    def __init__(self, status_code: int):
+        self.status_code = status_code
+        self.text = ""
+
+
+class LocalHub:
+    """구독 요청을 기록하고 202로 응답하는 허브 대역."""
+    def __init__(self):
+        self.requests = []
+
+    def post(self, url, data=None, timeout=None):
+        self.requests.append(data)
+        return FakeResponse(202)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    WebSubSubscription.__table__.create(engine)
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def hub(monkeypatch):
+    httpx = pytest.importorskip("httpx")
+    local_hub = LocalHub()
+    monkeypatch.setattr(httpx, "post", local_hub.post)
+    return local_hub
+
+
+def make_service(secret: str = "test-secret") -> WebSubService:
+    return WebSubService(hub_url="http://hub.local/subscribe", callback_url=CALLBACK_URL, secret=secret)
+
+
+def test_verify_intent_activates_requested_subscription(db, hub):
+    service = make_service()
+    assert service.subscribe(CHANNEL_ID, db)
+
+    topic = service.topic_for(CHANNEL_ID)
+    request = hub.requests[0]
+    assert request["hub.topic"] == topic
+    assert request["hub.secret"]
+
+    assert service.verify_intent("subscribe", topic, "challenge-1", 3600, db) == "challenge-1"
+    subscription = db.query(WebSubSubscription).filter(WebSubSubscription.channel_id == CHANNEL_ID).one()
+    assert subscription.status == "active"
+    assert subscription.lease_seconds == 3600
+
+    # 요청하지 않은 토픽의 확인 요청은 거부
+    assert service.verify_intent("subscribe", service.topic_for("UC_other"), "challenge-2", None, db) is None
+
+
+def test_notification_signature(db, hub):
+    service = make_service()
+    service.subscribe(CHANNEL_ID, db)
+    topic = service.topic_for(CHANNEL_ID)
+    hub_secret = hub.requests[0]["hub.secret"]
+
+    # 허브가 구독 시 받은 비밀 값으로 서명한 알림만 통과
+    signature = hmac.new(hub_secret.encode("utf-8"), NOTIFICATION, hashlib.sha1).hexdigest()
+    assert service.verify_signature(NOTIFICATION, f"sha1={signature}", topic)
+    assert service.parse_notification(NOTIFICATION) == [(CHANNEL_ID, "video123")]
+
+    assert not service.verify_signature(NOTIFICATION, None, topic)
+    assert not service.verify_signature(NOTIFICATION, "sha1=" + "0" * 40, topic)
+    forged = hmac.new(b"wrong-secret", NOTIFICATION, hashlib.sha1).hexdigest()
+    assert not service.verify_signature(NOTIFICATION, f"sha1={forged}", topic)
+
+
+def test_no_secret_refuses_subscription_and_notifications(db, hub):
+    service = make_service(secret="")
+    assert not service.subscribe(CHANNEL_ID, db)
+    assert hub.requests == []
+    assert not service.verify_signature(NOTIFICATION, None, service.topic_for(CHANNEL_ID))